@@ -0,0 +1,780 @@
+#!/usr/bin/env python3
+"""
+WhoisUser Benchmark - Reproducible performance measurements against a local stub server
+Author: Anubhav
+Description: Serves synthetic responses for every platform in the registry and
+             measures the scan engines without touching live sites
+
+Usage:
+    python3 benchmark.py engines [--concurrency 15,100,500] [--latency-ms 50-300] [--latency-dist uniform]
+                                 [--scenario clean] [--output FILE] [--compare FILE]
+    python3 benchmark.py matcher [--pages DIR] [--repeat N] [--output FILE]
+    python3 benchmark.py dedup [--profiles 100000] [--legacy-limit 2000] [--output FILE]
+    python3 benchmark.py micro [--repeat 5] [--only NAME,...] [--output FILE] [--compare FILE]
+"""
+
+import hashlib
+import json
+import math
+import os
+import platform
+import random
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import tracemalloc
+from contextlib import redirect_stdout
+from datetime import datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from statistics import NormalDist
+from urllib.parse import urlparse, quote
+
+REPO_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# Positive signatures for every platform-specific validator in is_valid_profile
+PROFILE_MARKERS = (
+    'profilePage_ "username":"stub" data-hovercard-type="user" <meta name="user-login" '
+    '"screen_name" profile-view data-author= channelId "author": "uniqueId":"stub" '
+    'profile_id "login":"stub" channel-header profile-header'
+)
+
+LOGIN_PAGE = '<html><head><title>Log in</title></head><body><form action="/session">Log in to continue</form></body></html>'
+
+# Stub behaviour: every outcome is picked per URL from a hash, so runs are reproducible
+STUB_DEFAULTS = {
+    'latency_ms': (50, 300),
+    'latency_dist': 'uniform',
+    'slow_ratio': 0.1,
+    'found_ratio': 0.1,
+    'login_ratio': 0.0,
+    'large_ratio': 0.0,
+    'throttle_ratio': 0.0,
+    'timeout_ratio': 0.0,
+    'body_kb': 64,
+    'large_kb': 2048,
+    'retry_after': 1,
+    'hang_seconds': 12,
+}
+
+SCENARIOS = {
+    'clean': {},
+    'mixed': {'login_ratio': 0.05, 'large_ratio': 0.05, 'throttle_ratio': 0.05, 'timeout_ratio': 0.01},
+    'hostile': {'latency_dist': 'lognormal', 'login_ratio': 0.1, 'large_ratio': 0.1, 'throttle_ratio': 0.2,
+                'timeout_ratio': 0.03},
+}
+
+# Compared against a baseline run: (result key, percentile, higher is better)
+COMPARED_METRICS = (
+    ('checks_per_second', None, True),
+    ('latency_ms', 'p95', False),
+    ('cpu_seconds', None, False),
+    ('peak_rss_kb', None, False),
+)
+
+# Compared per microbenchmark case against a baseline run: (result key, higher is better)
+MICRO_METRICS = (
+    ('ops_per_second', True),
+    ('peak_kb', False),
+)
+
+
+def url_fraction(url, salt=''):
+    """Deterministic value in [0, 1) derived from a URL"""
+    digest = hashlib.sha1(f"{salt}{url}".encode()).digest()
+    return int.from_bytes(digest[:8], 'big') / 2 ** 64
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    """Proxy-style handler: the request line carries the absolute platform URL"""
+    protocol_version = 'HTTP/1.1'
+
+    def log_message(self, format, *args):
+        pass
+
+    def send_body(self, status, body, content_type='text/html; charset=utf-8'):
+        payload = body.encode('utf-8')
+        total = len(payload)
+        byte_range = self.headers.get('Range', '')
+        if status == 200 and byte_range.startswith('bytes=0-'):
+            payload = payload[:int(byte_range[len('bytes=0-'):]) + 1]
+            status = 206
+        self.send_response(status)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(len(payload)))
+        if getattr(self, 'etag', None):
+            self.send_header('ETag', self.etag)
+        if status == 206:
+            self.send_header('Content-Range', f'bytes 0-{len(payload) - 1}/{total}')
+        self.end_headers()
+        if self.command != 'HEAD':
+            self.wfile.write(payload)
+
+    def do_HEAD(self):
+        self.do_GET()
+
+    def do_POST(self):
+        # Email checks post the address; the verdict only depends on the URL
+        self.rfile.read(int(self.headers.get('Content-Length') or 0))
+        self.do_GET()
+
+    def do_GET(self):
+        config = self.server.config
+        parsed = urlparse(self.path)
+        url = parsed._replace(path=parsed.path or '/').geturl()
+        time.sleep(stub_latency(url, config))
+
+        if parsed.path == '/login':
+            self.send_body(200, LOGIN_PAGE)
+            return
+
+        if url_fraction(url, 'timeout') < config['timeout_ratio']:
+            # Outlast the scanner's 10 s read timeout
+            time.sleep(config['hang_seconds'])
+            self.send_body(404, '<html><body>Page not found</body></html>')
+            return
+
+        if url_fraction(url, 'throttle') < config['throttle_ratio'] and self.server.first_request(url):
+            self.send_response(429)
+            self.send_header('Retry-After', str(config['retry_after']))
+            self.send_header('Content-Length', '0')
+            self.end_headers()
+            return
+
+        if url_fraction(url, 'login') < config['login_ratio']:
+            self.send_response(302)
+            self.send_header('Location', f"{parsed.scheme}://{parsed.netloc}/login?next={quote(parsed.path)}")
+            self.send_header('Content-Length', '0')
+            self.end_headers()
+            return
+
+        body_kb = config['large_kb'] if url_fraction(url, 'large') < config['large_ratio'] else config['body_kb']
+        found = url_fraction(url, 'found') < config['found_ratio']
+        etag = f'"{hashlib.sha1(url.encode()).hexdigest()[:16]}"'
+        if found and self.headers.get('If-None-Match') == etag:
+            self.send_response(304)
+            self.send_header('ETag', etag)
+            self.send_header('Content-Length', '0')
+            self.end_headers()
+            return
+        self.etag = etag if found else None
+        if urlparse(url).path.endswith('.json'):
+            if found:
+                self.send_body(200, json.dumps({'kind': 't2', 'data': {'name': 'stub'}}), 'application/json')
+            else:
+                self.send_body(404, json.dumps({'error': 404}), 'application/json')
+            return
+
+        if not found:
+            padding = '<div class="post">lorem ipsum dolor sit amet</div>\n' * (body_kb * 20 if body_kb > config['body_kb'] else 0)
+            self.send_body(404, f'<html><body>Page not found{padding}</body></html>')
+            return
+
+        filler = '<div class="post">lorem ipsum dolor sit amet</div>\n' * (body_kb * 20)
+        self.send_body(200, f'<html><head><title>stub</title></head><body>{PROFILE_MARKERS}\n{filler}</body></html>')
+
+
+class StubServer(ThreadingHTTPServer):
+    """Threaded stub server with a listen backlog large enough for 500 concurrent clients"""
+    daemon_threads = True
+    request_queue_size = 1024
+
+    def handle_error(self, request, client_address):
+        # Clients abandoning streamed bodies early reset the connection; that is expected
+        pass
+
+    def first_request(self, url):
+        """True the first time a URL is requested since the last reset"""
+        with self.seen_lock:
+            if url in self.seen:
+                return False
+            self.seen.add(url)
+            return True
+
+    def reset(self):
+        """Forget which URLs were throttled, so every run sees the same 429s"""
+        with self.seen_lock:
+            self.seen = set()
+
+
+def stub_latency(url, config):
+    """Seconds to wait before answering: uniform LOW-HIGH, lognormal (median LOW, p95 HIGH) or bimodal"""
+    low, high = config['latency_ms']
+    fraction = url_fraction(url, 'latency')
+    if config['latency_dist'] == 'lognormal':
+        sigma = math.log(max(high, low + 1) / max(low, 1)) / 1.645
+        z = NormalDist().inv_cdf(min(max(fraction, 1e-6), 1 - 1e-6))
+        milliseconds = max(low, 1) * math.exp(sigma * z)
+    elif config['latency_dist'] == 'bimodal':
+        milliseconds = high if fraction < config['slow_ratio'] else low
+    else:
+        milliseconds = low + (high - low) * fraction
+    return milliseconds / 1000
+
+
+def start_stub_server(latency_ms=(50, 300), found_ratio=0.1, body_kb=64, **options):
+    """Start the stub server on a free localhost port and return (server, proxy_url)"""
+    server = StubServer(('127.0.0.1', 0), StubHandler)
+    server.config = dict(STUB_DEFAULTS, latency_ms=latency_ms, found_ratio=found_ratio, body_kb=body_kb, **options)
+    server.seen = set()
+    server.seen_lock = threading.Lock()
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_address[1]}"
+
+
+def point_at_stub(investigator):
+    """Rewrite platform and email check URLs to plain HTTP so they are answered by the stub proxy"""
+    for data in list(investigator.platforms.values()) + list(investigator.email_checks.values()):
+        for key in ('url', 'api_url'):
+            if key in data:
+                data[key] = data[key].replace('https://', 'http://', 1)
+
+
+def run_single(engine, concurrency, proxy):
+    """Run one scan in this process and return throughput, latency, CPU, peak RSS and the verdicts"""
+    import resource
+
+    workdir = tempfile.mkdtemp(prefix='whoisuser_bench_')
+    os.chdir(workdir)
+    sys.path.insert(0, REPO_DIR)
+    from whoisuser import WhoisUser, percentiles
+
+    with open(os.devnull, 'w') as devnull, redirect_stdout(devnull):
+        investigator = WhoisUser('benchuser', max_workers=concurrency, engine=engine, proxy=proxy,
+                                 check_emails=True, context_options={'cache': False})
+        investigator.request_delay = 0
+        point_at_stub(investigator)
+
+        usage = resource.getrusage(resource.RUSAGE_SELF)
+        start = time.perf_counter()
+        investigator.scan_platforms()
+        wall = time.perf_counter() - start
+        usage_after = resource.getrusage(resource.RUSAGE_SELF)
+        investigator.cleanup()
+
+    timings = investigator.check_timings
+    cpu = (usage_after.ru_utime - usage.ru_utime) + (usage_after.ru_stime - usage.ru_stime)
+    return {
+        'engine': engine,
+        'concurrency': concurrency,
+        'platforms': len(investigator.platforms),
+        'checks': len(timings),
+        'wall_seconds': round(wall, 3),
+        'checks_per_second': round(len(timings) / wall, 1) if wall else 0,
+        'latency_ms': {key: round(value * 1000, 1) for key, value in
+                       percentiles([timing['total'] for timing in timings]).items()},
+        'ttfb_ms': {key: round(value * 1000, 1) for key, value in
+                    percentiles([timing.get('ttfb', 0) for timing in timings]).items()},
+        'cpu_seconds': round(cpu, 3),
+        'cpu_per_check_ms': round(cpu * 1000 / len(timings), 3) if timings else 0,
+        'peak_rss_kb': resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+        'failed_checks': len(investigator.failed_checks),
+        'skipped_checks': len(investigator.skipped_checks),
+        'retries': investigator.retry_stats['retries'],
+        'found': sorted(p['url'] for p in investigator.found_profiles),
+    }
+
+
+def run_isolated(engine, concurrency, proxy):
+    """Run one configuration in a fresh interpreter so peak RSS is not shared"""
+    cmd = [sys.executable, os.path.abspath(__file__), '_single', engine, str(concurrency), proxy]
+    process = subprocess.run(cmd, capture_output=True, text=True, check=True)
+    return json.loads(process.stdout.strip().splitlines()[-1])
+
+
+def synthetic_page(size_bytes, seed=0):
+    """Profile-like HTML of roughly size_bytes with no not-found markers"""
+    rng = random.Random(seed)
+    words = ['<div class="post">', 'Lorem', 'ipsum', 'Dolor', 'sit', 'amet,', '</div>', '<span>',
+             'data-id="42"', 'Followers', 'content', '<a href="/about">', 'Joined', '2019']
+    parts = ['<html><head><title>Profile</title></head><body>']
+    size = len(parts[0])
+    while size < size_bytes:
+        word = rng.choice(words)
+        parts.append(word)
+        size += len(word) + 1
+    return ' '.join(parts) + ' "username":"stub" </body></html>'
+
+
+def legacy_page_verdict(text, url):
+    """Body checks as check_url/is_valid_profile did them before the shared matcher"""
+    from whoisuser import NOT_FOUND_PATTERNS
+
+    content_lower = text.lower()
+    if any(pattern in content_lower for pattern in NOT_FOUND_PATTERNS):
+        return False
+    domain = urlparse(url).netloc.lower()
+    content_lower = text.lower()
+    if 'instagram.com' in domain:
+        return 'profilepage_' in content_lower or '"username":"' in content_lower
+    return True
+
+
+def time_per_call(func, repeat):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        func()
+    return (time.perf_counter() - start) / repeat
+
+
+def bench_matcher():
+    """Per-page CPU cost of the body checks: legacy scans vs the precompiled matcher"""
+    sys.path.insert(0, REPO_DIR)
+    from whoisuser import MATCHER, PlatformRegistry
+
+    repeat = int(parse_option('--repeat', '10'))
+    pages_dir = parse_option('--pages', None)
+    output = parse_option('--output', None)
+    url = 'https://www.instagram.com/stub/'
+
+    if pages_dir:
+        pages = []
+        for name in sorted(os.listdir(pages_dir)):
+            with open(os.path.join(pages_dir, name), 'r', encoding='utf-8', errors='replace') as f:
+                pages.append((name, f.read()))
+    else:
+        pages = [(f"synthetic_{kb}kb", synthetic_page(kb * 1024, kb)) for kb in (64, 512, 2048, 8192)]
+
+    results = []
+    print(f"{'page':<24} {'size':>10} {'legacy (ms)':>12} {'matcher (ms)':>13} {'speedup':>8}")
+    signatures = PlatformRegistry.load().lookup(url)['signatures']
+    for name, text in pages:
+        legacy = time_per_call(lambda: legacy_page_verdict(text, url), repeat)
+        matcher = time_per_call(lambda: MATCHER.scan(text, signatures), repeat)
+        results.append({'page': name, 'bytes': len(text), 'legacy_ms': round(legacy * 1000, 3),
+                        'matcher_ms': round(matcher * 1000, 3)})
+        print(f"{name:<24} {len(text):>10} {legacy * 1000:>12.2f} {matcher * 1000:>13.2f} {legacy / matcher:>7.2f}x")
+
+    if output:
+        with open(output, 'w', encoding='utf-8') as f:
+            json.dump({'benchmark': 'matcher', 'results': results}, f, indent=4)
+
+    return 0
+
+
+def synthetic_profiles(count, seed=0):
+    """Profiles as the merge sees them: ~30% repeat an earlier URL in another spelling or from another source"""
+    rng = random.Random(seed)
+    sources = ['whoisuser', 'sherlock', 'maigret', 'blackbird']
+    urls = []
+    profiles = []
+    for i in range(count):
+        if urls and rng.random() < 0.3:
+            url = rng.choice(urls)
+            variant = rng.randrange(4)
+            if variant == 0:
+                url = url.upper()
+            elif variant == 1:
+                url = url.replace('https://', 'https://www.', 1)
+            elif variant == 2:
+                url += '/'
+            else:
+                url += '?ref=search'
+        else:
+            url = f"https://site{rng.randrange(count // 10 + 1)}.example/{rng.randrange(10 ** 9)}"
+            urls.append(url)
+        profiles.append({'platform': f"Site{i}", 'url': url, 'source': rng.choice(sources), 'type': 'profile'})
+    return profiles
+
+
+def legacy_add_profile(investigator, found_profiles, profile_data):
+    """add_profile as it was before the dedup index: a normalize_url scan over every kept profile"""
+    if not investigator.is_duplicate(profile_data['url'], found_profiles):
+        found_profiles.append(profile_data)
+        return True
+    for existing in found_profiles:
+        if investigator.normalize_url(existing['url']) == investigator.normalize_url(profile_data['url']):
+            if 'found_by' not in existing:
+                existing['found_by'] = [existing['source']]
+            if profile_data['source'] not in existing['found_by']:
+                existing['found_by'].append(profile_data['source'])
+            break
+    return False
+
+
+def bench_investigator():
+    """A quiet investigator with no output directories, cache or email checks"""
+    from whoisuser import WhoisUser
+
+    with open(os.devnull, 'w') as devnull, redirect_stdout(devnull):
+        return WhoisUser('benchuser', create_dirs=False, quiet=True, check_emails=False,
+                         context_options={'cache': False, 'negative_ttl': 0})
+
+
+def merge_profiles(profiles, legacy=False):
+    """Merge profiles into a fresh investigator; returns (seconds, merged profiles)"""
+    investigator = bench_investigator()
+    profiles = [dict(profile) for profile in profiles]
+
+    start = time.perf_counter()
+    if legacy:
+        merged = []
+        for profile in profiles:
+            legacy_add_profile(investigator, merged, profile)
+    else:
+        for profile in profiles:
+            investigator.add_profile(profile)
+        merged = investigator.found_profiles
+    elapsed = time.perf_counter() - start
+    investigator.cleanup()
+    return elapsed, merged
+
+
+def bench_dedup():
+    """Merge cost of add_profile: indexed dedup vs the old quadratic scan"""
+    count = int(parse_option('--profiles', '100000'))
+    legacy_limit = min(count, int(parse_option('--legacy-limit', '2000')))
+    output = parse_option('--output', None)
+
+    workdir = tempfile.mkdtemp(prefix='whoisuser_bench_')
+    os.chdir(workdir)
+    sys.path.insert(0, REPO_DIR)
+    profiles = synthetic_profiles(count)
+
+    # The old merge is quadratic, so it runs on a prefix and is scaled up by (n / prefix)^2
+    legacy_seconds, legacy_merged = merge_profiles(profiles[:legacy_limit], legacy=True)
+    _, indexed_prefix = merge_profiles(profiles[:legacy_limit])
+    identical = [(p['url'], p.get('found_by')) for p in legacy_merged] == \
+                [(p['url'], p.get('found_by')) for p in indexed_prefix]
+    legacy_estimate = legacy_seconds * (count / legacy_limit) ** 2
+
+    indexed_seconds, merged = merge_profiles(profiles)
+
+    print(f"{'merge':<10} {'profiles':>9} {'unique':>8} {'seconds':>10} {'profiles/s':>12}")
+    print(f"{'legacy':<10} {legacy_limit:>9} {len(legacy_merged):>8} {legacy_seconds:>10.3f} "
+          f"{legacy_limit / legacy_seconds:>12.0f}")
+    print(f"{'indexed':<10} {count:>9} {len(merged):>8} {indexed_seconds:>10.3f} {count / indexed_seconds:>12.0f}")
+    print(f"\nLegacy estimate for {count} profiles: {legacy_estimate:.1f}s "
+          f"({legacy_estimate / indexed_seconds:.0f}x slower than indexed)")
+    if identical:
+        print(f"[✓] Identical merge on the first {legacy_limit} profiles")
+    else:
+        print(f"[!] Merge mismatch on the first {legacy_limit} profiles")
+
+    if output:
+        with open(output, 'w', encoding='utf-8') as f:
+            json.dump({'benchmark': 'dedup', 'profiles': count, 'unique': len(merged),
+                       'indexed_seconds': round(indexed_seconds, 4), 'legacy_profiles': legacy_limit,
+                       'legacy_seconds': round(legacy_seconds, 4), 'legacy_estimate_seconds': round(legacy_estimate, 1),
+                       'identical': identical}, f, indent=4)
+
+    return 0 if identical else 1
+
+
+def synthetic_tool_dump(tool, lines, seed=0):
+    """Console output of an external tool: colored hit lines mixed with misses and chatter"""
+    rng = random.Random(seed)
+    green, reset = '\x1b[32m', '\x1b[0m'
+    out = ["[*] Checking username benchuser on:"]
+    for i in range(lines):
+        name = f"Site{rng.randrange(lines)}"
+        url = f"https://www.{name.lower()}.example/benchuser"
+        roll = rng.random()
+        if tool == 'sherlock':
+            if roll < 0.6:
+                out.append(f"[{green}+{reset}] {name}: {url}")
+            else:
+                out.append(f"[-] {name}: Not Found!")
+        elif tool == 'maigret':
+            if roll < 0.4:
+                out.append(f"[{green}+{reset}] {name}: {url}")
+            elif roll < 0.6:
+                out.append(f"[*] Checking {name} at https://{name.lower()}.example/benchuser")
+            elif roll < 0.8:
+                out.append(f"[-] {name}: Not found!")
+            else:
+                out.append(f"        ├─links: {url}/about, {url}/posts.")
+        else:
+            if roll < 0.5:
+                out.append(f"{green}[+] - #{i} {name} account found - {url} [200 OK]{reset}")
+            else:
+                out.append(f"[-] - #{i} {name} account not found - {url} [404 Not Found]")
+    return '\n'.join(out) + '\n'
+
+
+def stream_parse(lines, parse_line):
+    """The per-line loop of stream_tool_process (parse and drop repeated URLs), minus the child process"""
+    profiles = []
+    seen = set()
+    for line in lines:
+        for profile in parse_line(line):
+            if profile['url'] not in seen:
+                seen.add(profile['url'])
+                profiles.append(profile)
+    return profiles
+
+
+def measure(run, prepare, repeat):
+    """Best wall time of run over repeat calls, then one traced call for (peak, retained) bytes"""
+    best = None
+    with open(os.devnull, 'w') as devnull, redirect_stdout(devnull):
+        for _ in range(repeat):
+            state = prepare() if prepare else None
+            start = time.perf_counter()
+            run(state)
+            elapsed = time.perf_counter() - start
+            best = elapsed if best is None else min(best, elapsed)
+
+        # Traced separately, since tracemalloc slows every allocation down
+        state = prepare() if prepare else None
+        tracemalloc.start()
+        result = run(state)
+        retained, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        del result
+    return best, peak, retained
+
+
+def micro_cases():
+    """(name, ops per run, prepare, run) for every hot path, on fixed synthetic corpora"""
+    from whoisuser import MATCHER
+
+    investigator = bench_investigator()
+    profiles = synthetic_profiles(100000)
+    urls = [profile['url'] for profile in profiles]
+    existing = profiles[:2000]
+    lookups = urls[-100:]
+    pages = {mb: synthetic_page(mb * 1024 * 1024, mb) for mb in (2, 8)}
+    instagram = 'https://www.instagram.com/benchuser/'
+
+    # Tool output is parsed as it streams from the child, one line at a time
+    dumps = {tool: synthetic_tool_dump(tool, 50000).splitlines(keepends=True)
+             for tool in ('sherlock', 'maigret', 'blackbird')}
+
+    def fresh_merge():
+        merger = bench_investigator()
+        investigators.append(merger)
+        return merger, [dict(profile) for profile in profiles]
+
+    def merge(state):
+        merger, batch = state
+        for profile in batch:
+            merger.add_profile(profile)
+        return merger.found_profiles
+
+    investigators = [investigator]
+    cases = [
+        ('normalize_url', len(urls), None, lambda _: [investigator.normalize_url(url) for url in urls]),
+        ('is_duplicate', len(lookups), None,
+         lambda _: [investigator.is_duplicate(url, existing) for url in lookups]),
+        ('add_profile', len(profiles), fresh_merge, merge),
+    ]
+    for mb, page in pages.items():
+        cases.append((f"matcher_scan_{mb}mb", 1, None, lambda _, page=page: MATCHER.scan(page)))
+        cases.append((f"is_valid_profile_{mb}mb", 1, None,
+                      lambda _, page=page: investigator.is_valid_profile(instagram, page)))
+    cases += [
+        ('parse_sherlock', 50000, None, lambda _: stream_parse(dumps['sherlock'], investigator.parse_sherlock_line)),
+        ('parse_maigret', 50000, None, lambda _: stream_parse(dumps['maigret'], investigator.parse_maigret_line)),
+        ('parse_blackbird', 50000, None, lambda _: stream_parse(dumps['blackbird'], investigator.parse_blackbird_line)),
+    ]
+    return cases, investigators
+
+
+def compare_micro(baseline_path, results, tolerance):
+    """Print per-case changes against a saved micro run; returns how many regressed past the tolerance"""
+    with open(baseline_path, 'r', encoding='utf-8') as f:
+        baseline = json.load(f)
+    previous = {r['name']: r for r in baseline.get('results', [])}
+
+    print(f"\nCompared with {baseline_path} (commit {baseline.get('commit') or 'unknown'}):")
+    print(f"{'case':<24} {'metric':<16} {'before':>12} {'after':>12} {'change':>8}")
+    regressions = 0
+    for result in results:
+        old = previous.get(result['name'])
+        if old is None:
+            continue
+        for key, higher_is_better in MICRO_METRICS:
+            before, after = old.get(key), result.get(key)
+            if not before or after is None:
+                continue
+            change = (after - before) / before
+            worse = -change if higher_is_better else change
+            flag = '  !' if worse > tolerance else ''
+            regressions += worse > tolerance
+            print(f"{result['name']:<24} {key:<16} {before:>12} {after:>12} {change * 100:>+7.1f}%{flag}")
+
+    if regressions:
+        print(f"[!] {regressions} metric(s) regressed by more than {tolerance * 100:.0f}%")
+    else:
+        print(f"[✓] No regressions beyond {tolerance * 100:.0f}%")
+    return regressions
+
+
+def bench_micro():
+    """CPU cost and allocations of the pure-Python hot paths on fixed synthetic corpora"""
+    repeat = int(parse_option('--repeat', '5'))
+    only = parse_option('--only', None)
+    output = parse_option('--output', None)
+    baseline = parse_option('--compare', None)
+    tolerance = float(parse_option('--tolerance', '0.1'))
+
+    workdir = tempfile.mkdtemp(prefix='whoisuser_bench_')
+    os.chdir(workdir)
+    sys.path.insert(0, REPO_DIR)
+    cases, investigators = micro_cases()
+    if only:
+        selected = only.split(',')
+        cases = [case for case in cases if any(case[0].startswith(name) for name in selected)]
+
+    results = []
+    print(f"{'case':<24} {'ops':>7} {'ops/s':>12} {'us/op':>10} {'peak KB':>10} {'retained KB':>12}")
+    for name, ops, prepare, run in cases:
+        best, peak, retained = measure(run, prepare, repeat)
+        result = {'name': name, 'ops': ops, 'ops_per_second': round(ops / best, 1),
+                  'us_per_op': round(best / ops * 1e6, 3), 'peak_kb': round(peak / 1024, 1),
+                  'retained_kb': round(retained / 1024, 1)}
+        results.append(result)
+        print(f"{name:<24} {ops:>7} {result['ops_per_second']:>12.1f} {result['us_per_op']:>10.3f} "
+              f"{result['peak_kb']:>10.1f} {result['retained_kb']:>12.1f}")
+
+    for investigator in investigators:
+        investigator.cleanup()
+
+    regressions = compare_micro(baseline, results, tolerance) if baseline else 0
+
+    if output:
+        with open(output, 'w', encoding='utf-8') as f:
+            json.dump({'benchmark': 'micro', 'commit': git_commit(), 'date': datetime.now().isoformat(),
+                       'python': platform.python_version(), 'cpus': os.cpu_count(), 'repeat': repeat,
+                       'results': results}, f, indent=4)
+
+    return 1 if regressions else 0
+
+
+def parse_option(flag, default):
+    if flag in sys.argv:
+        return sys.argv[sys.argv.index(flag) + 1]
+    return default
+
+
+def git_commit():
+    """Short hash of the checked-out commit (with a + when the tree is dirty), or None outside git"""
+    try:
+        commit = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=REPO_DIR, capture_output=True,
+                                text=True, check=True).stdout.strip()
+        dirty = subprocess.run(['git', 'status', '--porcelain', '--untracked-files=no'], cwd=REPO_DIR,
+                               capture_output=True, text=True, check=True).stdout.strip()
+        return commit + ('+' if dirty else '')
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def stub_options():
+    """Stub configuration from --scenario, overridden by the individual ratio flags"""
+    scenario = parse_option('--scenario', 'clean')
+    if scenario not in SCENARIOS:
+        raise SystemExit(f"Unknown scenario {scenario!r} (choose from {', '.join(SCENARIOS)})")
+
+    options = dict(STUB_DEFAULTS, **SCENARIOS[scenario])
+    low, high = (int(v) for v in parse_option('--latency-ms', '50-300').split('-'))
+    options['latency_ms'] = (low, high)
+    options['latency_dist'] = parse_option('--latency-dist', options['latency_dist'])
+    for key in ('found_ratio', 'login_ratio', 'large_ratio', 'throttle_ratio', 'timeout_ratio'):
+        options[key] = float(parse_option('--' + key.replace('_', '-'), options[key]))
+    return scenario, options
+
+
+def metric_value(result, key, percentile):
+    value = result.get(key)
+    return value.get(percentile) if percentile and isinstance(value, dict) else value
+
+
+def compare_runs(baseline_path, results, options, tolerance):
+    """Print changes against a saved run; returns how many metrics regressed past the tolerance"""
+    with open(baseline_path, 'r', encoding='utf-8') as f:
+        baseline = json.load(f)
+    previous = {(r['engine'], r['concurrency']): r for r in baseline.get('results', [])}
+
+    print(f"\nCompared with {baseline_path} (commit {baseline.get('commit') or 'unknown'}, "
+          f"scenario {baseline.get('scenario', 'clean')}):")
+    if baseline.get('stub') and baseline['stub'] != json.loads(json.dumps(options)):
+        print("[!] The baseline used a different stub configuration; changes are not like for like")
+    print(f"{'engine':<8} {'concurrency':>11} {'metric':<20} {'before':>10} {'after':>10} {'change':>8}")
+    regressions = 0
+    for result in results:
+        old = previous.get((result['engine'], result['concurrency']))
+        if old is None:
+            continue
+        for key, percentile, higher_is_better in COMPARED_METRICS:
+            before, after = metric_value(old, key, percentile), metric_value(result, key, percentile)
+            if not before or after is None:
+                continue
+            change = (after - before) / before
+            worse = -change if higher_is_better else change
+            flag = '  !' if worse > tolerance else ''
+            regressions += worse > tolerance
+            label = f"{key} {percentile}" if percentile else key
+            print(f"{result['engine']:<8} {result['concurrency']:>11} {label:<20} {before:>10} {after:>10} "
+                  f"{change * 100:>+7.1f}%{flag}")
+
+    if regressions:
+        print(f"[!] {regressions} metric(s) regressed by more than {tolerance * 100:.0f}%")
+    else:
+        print(f"[✓] No regressions beyond {tolerance * 100:.0f}%")
+    return regressions
+
+
+def bench_engines():
+    """Scan the stub with each engine and concurrency level: throughput, latency, CPU and memory"""
+    concurrency_levels = [int(c) for c in parse_option('--concurrency', '15,100,500').split(',')]
+    scenario, options = stub_options()
+    output = parse_option('--output', None)
+    baseline = parse_option('--compare', None)
+    tolerance = float(parse_option('--tolerance', '0.1'))
+
+    server, proxy = start_stub_server(**options)
+    results = []
+    try:
+        print(f"Scenario: {scenario}, latency {options['latency_dist']} {options['latency_ms'][0]}-"
+              f"{options['latency_ms'][1]} ms\n")
+        print(f"{'engine':<8} {'concurrency':>11} {'wall (s)':>9} {'checks/s':>9} {'p50 ms':>8} {'p95 ms':>8} "
+              f"{'p99 ms':>8} {'CPU (s)':>8} {'peak RSS (MB)':>14} {'found':>6}")
+        for concurrency in concurrency_levels:
+            for engine in ('threads', 'async'):
+                server.reset()
+                result = run_isolated(engine, concurrency, proxy)
+                results.append(result)
+                latency = result['latency_ms']
+                print(f"{engine:<8} {concurrency:>11} {result['wall_seconds']:>9.2f} {result['checks_per_second']:>9.1f} "
+                      f"{latency['p50']:>8.0f} {latency['p95']:>8.0f} {latency['p99']:>8.0f} "
+                      f"{result['cpu_seconds']:>8.2f} {result['peak_rss_kb'] / 1024:>14.1f} {len(result['found']):>6}")
+    finally:
+        server.shutdown()
+
+    # Both engines must agree on every verdict
+    reference = results[0]['found']
+    mismatched = [r for r in results if r['found'] != reference]
+    if mismatched:
+        print(f"\n[!] Verdict mismatch in {len(mismatched)} run(s)")
+    else:
+        print(f"\n[✓] All runs produced identical results ({len(reference)} profiles)")
+
+    regressions = compare_runs(baseline, results, options, tolerance) if baseline else 0
+
+    if output:
+        with open(output, 'w', encoding='utf-8') as f:
+            json.dump({'benchmark': 'engines', 'commit': git_commit(), 'date': datetime.now().isoformat(),
+                       'python': platform.python_version(), 'cpus': os.cpu_count(), 'scenario': scenario,
+                       'stub': options, 'results': results}, f, indent=4)
+
+    return 1 if mismatched or regressions else 0
+
+
+def main():
+    if len(sys.argv) >= 2 and sys.argv[1] == '_single':
+        engine, concurrency, proxy = sys.argv[2], int(sys.argv[3]), sys.argv[4]
+        print(json.dumps(run_single(engine, concurrency, proxy)))
+        return 0
+
+    commands = {'engines': bench_engines, 'matcher': bench_matcher, 'dedup': bench_dedup, 'micro': bench_micro}
+    if len(sys.argv) < 2 or sys.argv[1] not in commands:
+        print(__doc__)
+        return 1
+
+    return commands[sys.argv[1]]()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -42,6 +42,7 @@ SCRIPT_DIR="$( cd "$( dirname "${BASH_SOURCE[0]}" )" && pwd )"
 INSTALL_MODE=""
 INSTALL_DIR=""
 TOOLS_DIR=""
+DATA_DIR=""
 USER_BIN="$HOME/.local/bin"
 GLOBAL_BIN="/usr/local/bin"
 IS_ROOT=false
@@ -581,11 +582,15 @@ install_whoisuser() {
     
     # Create directories
     if [ "$INSTALL_MODE" = "global" ]; then
+        DATA_DIR="/usr/local/share/whoisuser"
         mkdir -p "$INSTALL_DIR" 2>/dev/null || true
         mkdir -p "$TOOLS_DIR" 2>/dev/null || true
+        mkdir -p "$DATA_DIR" 2>/dev/null || true
     else
+        DATA_DIR="$HOME/.local/share/whoisuser"
         mkdir -p "$INSTALL_DIR"
         mkdir -p "$TOOLS_DIR"
+        mkdir -p "$DATA_DIR"
     fi
     
     # Create investigations directory
@@ -606,6 +611,15 @@ install_whoisuser() {
         chmod +x "$INSTALL_DIR/whoisuser"
     fi
     
+    # Platform registry (URL templates and signatures) read at startup
+    if [ -f "$SCRIPT_DIR/platforms.json" ]; then
+        cp "$SCRIPT_DIR/platforms.json" "$DATA_DIR/platforms.json"
+        print_success "Platform registry installed: ${GRAY}$DATA_DIR/platforms.json${NC}"
+    else
+        print_error "platforms.json not found in $SCRIPT_DIR"
+        exit 1
+    fi
+    
     # Ensure proper shebang
     if ! head -n 1 "$INSTALL_DIR/whoisuser" | grep -q "^#!/"; then
         echo "#!/usr/bin/env python3" | cat - "$INSTALL_DIR/whoisuser" > "$INSTALL_DIR/whoisuser.tmp"
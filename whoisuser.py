@@ -7,6 +7,7 @@ Version: 2.7 OPTIMIZED INTEGRATED (Fully Merged Results)
 """
 
 import requests
+import urllib3
 import json
 import os
 import sys
@@ -15,12 +16,32 @@ from pathlib import Path
 import time
 from colorama import Fore, Style, init
 import concurrent.futures
+import multiprocessing
+import asyncio
 import subprocess
 import shutil
-from urllib.parse import urlparse, urlunparse
+from urllib.parse import urlparse, urlunparse, quote
 import logging
 import atexit
 import re
+import random
+import contextvars
+import cProfile
+import tracemalloc
+import codecs
+import threading
+import heapq
+import queue
+import sqlite3
+import zlib
+import hashlib
+import struct
+from array import array
+from bisect import bisect_left
+from collections import deque
+from contextlib import contextmanager, nullcontext
+from email.utils import parsedate_to_datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
 
 # Initialize colorama
 init(autoreset=True)
@@ -32,67 +53,2163 @@ logging.basicConfig(
     handlers=[logging.FileHandler('whoisuser.log')]
 )
 
+# Body markers that mean the requested profile does not exist
+NOT_FOUND_PATTERNS = [
+    "page not found", "user not found", "doesn't exist",
+    "not available", "profile not found",
+    "sorry, this page isn't available",
+    "the page you requested was not found",
+    "this account doesn't exist", "no such user",
+    "404 error", "404 not found", "account suspended",
+    "user does not exist", "profile unavailable",
+    "page doesn't exist", "couldn't find",
+    "account not found"
+]
+
+# Final URL fragments that indicate a redirect to a login/signup wall
+LOGIN_REDIRECT_MARKERS = ['login', 'signup', 'signin', 'register']
+
+# Body markers of a login wall served in place of (or on top of) the profile
+LOGIN_WALL_MARKERS = [
+    "log in to continue", "log in to see", "log in to view",
+    "login to continue", "login to view", "sign in to continue",
+    "sign in to see", "sign in to view", "sign up to see",
+    "you must be logged in", "join to see"
+]
+
+SCAN_ENGINES = ('threads', 'async')
+
+# Streaming body reads
+MIN_PROFILE_BYTES = 200
+BODY_CHUNK_SIZE = 16384
+BODY_DRAIN_LIMIT = 65536
+
+# Cheap first-tier requests; the full GET only runs when the probe cannot decide
+PROBE_METHODS = ('head', 'range', 'get')
+PROBE_RANGE_BYTES = 32768
+
+# Adaptive concurrency (--adaptive): AIMD on checks in flight, globally and per rate group
+LATENCY_SMOOTHING = 0.2
+LATENCY_TOLERANCE = 2.0
+BACKOFF_INTERVAL = 1.0
+THROTTLE_STATUSES = (429, 503)
+
+# Transient failures are retried with jittered exponential backoff (Retry-After wins when sent)
+RETRIES = 2
+RETRY_STATUSES = (429, 502, 503, 504)
+RETRY_BASE_DELAY = 0.5
+RETRY_MAX_DELAY = 8
+RETRY_AFTER_MAX = 30
+
+# A rate group failing this many requests in a row is skipped until the cooldown has passed
+BREAKER_THRESHOLD = 5
+BREAKER_COOLDOWN = 300
+
+# httpx trace steps timed for checks sent over HTTP/2
+HTTPX_TIMING_STEPS = {
+    'connection.connect_tcp': 'connect',
+    'connection.start_tls': 'tls',
+    'http11.receive_response_headers': 'ttfb',
+    'http2.receive_response_headers': 'ttfb'
+}
+
+# Per-check timing breakdown (seconds, apart from bytes) and how many slow checks FULL_REPORT.txt lists
+TIMING_PHASES = ('cache', 'queue', 'rate_wait', 'backoff', 'dns', 'connect', 'tls', 'ttfb', 'transfer', 'parse', 'total')
+TIMING_PERCENTILES = (50, 95, 99)
+TIMING_TOP_N = 10
+
+# Metrics exposition (--metrics-port serves /metrics on localhost, --metrics-file refreshes a textfile)
+METRICS_INTERVAL = 15
+METRIC_FAMILIES = {
+    'whoisuser_checks': ('counter', 'Checks sent to the network'),
+    'whoisuser_verdicts': ('counter', 'Check outcomes by reason'),
+    'whoisuser_in_flight': ('gauge', 'Checks currently in flight'),
+    'whoisuser_check_seconds': ('histogram', 'Wall time of a check including retries'),
+    'whoisuser_request_seconds': ('histogram', 'HTTP request latency by rate-limit group'),
+    'whoisuser_retries': ('counter', 'Retries of transient failures by reason'),
+    'whoisuser_breaker_opened': ('counter', 'Circuit breakers opened by rate-limit group'),
+    'whoisuser_cache': ('counter', 'Cache lookups by result'),
+    'whoisuser_tool_seconds': ('histogram', 'External tool wall time'),
+    'whoisuser_screenshots': ('counter', 'Screenshot attempts by result'),
+    'whoisuser_screenshot_seconds': ('histogram', 'Time to load, settle and capture one screenshot'),
+    'whoisuser_usernames_completed': ('counter', 'Usernames finished in batch mode')
+}
+METRIC_BUCKETS = {
+    'whoisuser_check_seconds': (0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60),
+    'whoisuser_request_seconds': (0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10),
+    'whoisuser_tool_seconds': (5, 15, 30, 60, 120, 300, 600),
+    'whoisuser_screenshot_seconds': (1, 2.5, 5, 10, 20, 40)
+}
+
+# Profiling (--profile): allocation sites listed per phase and the thread-stack sampling interval
+PROFILE_TOP_ALLOCATIONS = 25
+PROFILE_SAMPLE_MS = 10
+
+# Color codes the external tools print even when piped
+ANSI_ESCAPE = re.compile(r'\x1b\[[0-9;]*[A-Za-z]')
+
+# Pages a screenshot browser captures before it is replaced with a fresh one
+SCREENSHOT_RECYCLE_PAGES = 50
+
+# Shared screenshot store: re-encoded captures, thumbnails and near-duplicate detection
+SCREENSHOT_STORE = 'investigations/.screenshots'
+SCREENSHOT_FORMATS = ('webp', 'jpeg', 'png')
+THUMBNAIL_WIDTH = 320
+DHASH_SIZE = 16
+DHASH_DISTANCE = 6
+
+# Two hashes within DHASH_DISTANCE bits agree exactly on at least one of DHASH_DISTANCE + 1 bands
+DHASH_BANDS = DHASH_DISTANCE + 1
+
+# Screenshot readiness: poll until the page is loaded and its DOM stops changing, up to a ceiling
+SETTLE_CEILING = 10
+SETTLE_QUIET = 0.5
+SETTLE_BLANK_QUIET = 2
+SETTLE_POLL = 0.1
+SETTLE_SMOOTHING = 0.3
+SETTLE_TIMES_PATH = 'investigations/.cache/settle_times.json'
+
+# One round trip returns everything the settle check looks at
+SETTLE_PROBE_JS = """
+return {
+    ready: document.readyState === 'complete',
+    nodes: document.getElementsByTagName('*').length,
+    resources: performance.getEntriesByType('resource').length,
+    text: document.body ? document.body.innerText.length : 0,
+    selector: arguments[0] ? document.querySelector(arguments[0]) !== null : true
+};
+"""
+
+# Persistent response cache (re-runs on the same handle skip the network)
+CACHE_PATH = 'investigations/.cache/responses.db'
+CACHE_TTL = 24 * 3600
+CACHE_MAX_BYTES = 256 * 1024 * 1024
+
+# Confirmed absences, kept as 13 bytes per (platform, username)
+NEGATIVE_CACHE_PATH = 'investigations/.cache/negatives.bin'
+NEGATIVE_TTL = 7 * 24 * 3600
+NEGATIVE_REASONS = ('http_404', 'http_410', 'not_found_pattern')
+
+def format_bytes(size):
+    """Human readable byte count"""
+    for unit in ['B', 'KB', 'MB', 'GB']:
+        if abs(size) < 1024 or unit == 'GB':
+            return f"{size:.1f} {unit}" if unit != 'B' else f"{size} B"
+        size /= 1024
+
+def default_platform_files():
+    """Locations searched for the platform registry, in priority order"""
+    script_dir = os.path.dirname(os.path.realpath(__file__))
+    return [
+        os.environ.get('WHOISUSER_PLATFORMS'),
+        os.path.join(script_dir, 'platforms.json'),
+        os.path.expanduser('~/.local/share/whoisuser/platforms.json'),
+        '/usr/local/share/whoisuser/platforms.json',
+    ]
+
+class PlatformRegistry:
+    """Platform definitions loaded from data files, compiled once into URL templates and a host index"""
+
+    def __init__(self, definitions, email=None):
+        self.entries = {}
+        self.host_index = {}
+        for name, definition in definitions.items():
+            self.add(name, definition)
+        
+        # Email enumeration: provider domains, local-part variants and the services to ask
+        email = email or {}
+        self.email_domains = email.get('domains', [])
+        self.email_local_parts = email.get('local_parts') or ['{username}']
+        self.email_services = {}
+        for name, definition in email.get('services', {}).items():
+            self.add_email_service(name, definition)
+
+    @classmethod
+    def load(cls, platform_file=None, site_packs=None):
+        """Load the base registry (explicit file or first default location) plus any site packs"""
+        if not platform_file:
+            platform_file = next((path for path in default_platform_files() if path and os.path.exists(path)), None)
+        if not platform_file or not os.path.exists(platform_file):
+            raise FileNotFoundError(f"platform registry not found: {platform_file or 'platforms.json'}")
+        
+        definitions = {}
+        email = {'services': {}}
+        for path in [platform_file] + list(site_packs or []):
+            with open(path, 'r', encoding='utf-8') as f:
+                document = json.load(f)
+            definitions.update(document.get('platforms', document))
+            
+            # Packs may add email services; domain and variant lists replace the earlier ones
+            pack_email = document.get('email', {}) if 'platforms' in document else {}
+            for key in ('domains', 'local_parts'):
+                if pack_email.get(key):
+                    email[key] = pack_email[key]
+            email['services'].update(pack_email.get('services', {}))
+            logging.info(f"Loaded platform definitions from {path}")
+        
+        return cls(definitions, email)
+
+    @staticmethod
+    def template_host(url):
+        """Host of a URL template, without port, www. or username-bearing labels"""
+        host = urlparse(url).netloc.lower().split(':')[0]
+        labels = [label for label in host.split('.') if '{username}' not in label]
+        if labels and labels[0] == 'www':
+            labels = labels[1:]
+        return '.'.join(labels)
+
+    def add(self, name, definition):
+        """Compile one platform definition and index it by host"""
+        if 'url' not in definition:
+            logging.warning(f"Platform definition without url skipped: {name}")
+            return
+        
+        entry = {
+            'name': name,
+            'category': definition.get('category', 'Other'),
+            'check_type': definition.get('check_type', 'standard'),
+            'url_parts': definition['url'].split('{username}'),
+            'api_parts': definition['api_url'].split('{username}') if definition.get('api_url') else None,
+            'signatures': [sig.lower() for sig in definition.get('signatures', [])] or None,
+            'not_found': [marker.lower() for marker in definition.get('not_found', [])],
+            'status_codes': set(definition.get('status_codes', [200])),
+            'max_bytes': definition.get('max_bytes'),
+            'rate_group': definition.get('rate_group'),
+            'probe': definition.get('probe', 'get'),
+            'probe_bytes': definition.get('probe_bytes'),
+            'cache_ttl': definition.get('cache_ttl'),
+            'ready_selector': definition.get('ready_selector'),
+        }
+        if entry['probe'] not in PROBE_METHODS:
+            logging.warning(f"Unknown probe '{entry['probe']}' for {name}, using full GET")
+            entry['probe'] = 'get'
+        self.entries[name] = entry
+        
+        for host in definition.get('hosts') or [self.template_host(definition['url'])]:
+            self.host_index.setdefault(host, entry)
+
+    def add_email_service(self, name, definition):
+        """Compile one email-registration check"""
+        if 'url' not in definition:
+            logging.warning(f"Email service definition without url skipped: {name}")
+            return
+        
+        self.email_services[name] = {
+            'name': name,
+            'url': definition['url'],
+            'method': definition.get('method', 'GET').upper(),
+            'form': definition.get('form'),
+            'json': definition.get('json'),
+            'status_codes': set(definition.get('status_codes', [200])),
+            'registered': [marker.lower() for marker in definition.get('registered', [])],
+            'not_registered': [marker.lower() for marker in definition.get('not_registered', [])],
+            'rate_group': definition.get('rate_group'),
+            'host': self.template_host(definition['url']),
+        }
+
+    def email_variants(self, username, domains=None, local_parts=None):
+        """Candidate addresses for a username: every local-part variant at every provider domain"""
+        emails = []
+        for local_part in local_parts or self.email_local_parts:
+            local_part = local_part.replace('{username}', username)
+            for domain in domains or self.email_domains:
+                email = f"{local_part}@{domain}".lower()
+                if email not in emails:
+                    emails.append(email)
+        return emails
+
+    @staticmethod
+    def fill_email(template, email, quote_value=False):
+        """Fill {email} / {email_md5} in a URL template or request body (nested dicts and lists too)"""
+        if isinstance(template, dict):
+            return {key: PlatformRegistry.fill_email(value, email) for key, value in template.items()}
+        if isinstance(template, list):
+            return [PlatformRegistry.fill_email(value, email) for value in template]
+        if not isinstance(template, str):
+            return template
+        
+        value = quote(email, safe='@') if quote_value else email
+        return template.replace('{email_md5}', hashlib.md5(email.encode()).hexdigest()).replace('{email}', value)
+
+    def build_email_checks(self, emails):
+        """One check per (email, service) pair, shaped like platform data for the scan engines"""
+        checks = {}
+        for email in emails:
+            for name, service in self.email_services.items():
+                data = {
+                    'url': self.fill_email(service['url'], email, quote_value=True),
+                    'check_type': 'email',
+                    'service': name,
+                    'email': email,
+                    'method': service['method'],
+                    # Unique per pair so the merge never folds two accounts together
+                    'account_url': f"email://{service['host']}/{email}",
+                }
+                if service['form']:
+                    data['form'] = self.fill_email(service['form'], email)
+                if service['json']:
+                    data['json'] = self.fill_email(service['json'], email)
+                if service['rate_group']:
+                    data['rate_group'] = service['rate_group']
+                checks[f"{name} ({email})"] = data
+        return checks
+
+    def lookup(self, url):
+        """Entry for the host serving a URL (walking up subdomains), or None"""
+        labels = urlparse(url).netloc.lower().split(':')[0].split('.')
+        for i in range(len(labels) - 1):
+            entry = self.host_index.get('.'.join(labels[i:]))
+            if entry:
+                return entry
+        return None
+
+    def build(self, username):
+        """Fill every URL template for a username"""
+        platforms = {}
+        for name, entry in self.entries.items():
+            data = {'url': username.join(entry['url_parts']), 'check_type': entry['check_type']}
+            if entry['api_parts']:
+                data['api_url'] = username.join(entry['api_parts'])
+            if entry['max_bytes']:
+                data['max_bytes'] = entry['max_bytes']
+            if entry['rate_group']:
+                data['rate_group'] = entry['rate_group']
+            if entry['probe'] != 'get':
+                data['probe'] = entry['probe']
+            if entry['probe_bytes']:
+                data['probe_bytes'] = entry['probe_bytes']
+            if entry['cache_ttl'] is not None:
+                data['cache_ttl'] = entry['cache_ttl']
+            if entry['ready_selector']:
+                data['ready_selector'] = entry['ready_selector']
+            platforms[name] = data
+        return platforms
+
+class MatchHits:
+    """Every marker found in one body, split by category"""
+
+    def __init__(self):
+        self.not_found = set()
+        self.signatures = set()
+        self.login_wall = set()
+
+class PatternMatcher:
+    """Precompiled matcher for not-found, login-wall and profile-signature markers
+    
+    Markers sharing a common phrase (e.g. "not found") are grouped under it, so a body
+    lowercased once pays a single substring probe for a whole group when the phrase is
+    absent. CPython's substring search beats a large regex alternation by an order of
+    magnitude on multi-MB pages, which is why this is not a single compiled regex.
+    """
+
+    def __init__(self, not_found_patterns, login_wall_markers, min_key_length=6):
+        self.categories = {}
+        for marker in not_found_patterns:
+            self.categories.setdefault(marker.lower(), set()).add('not_found')
+        for marker in login_wall_markers:
+            self.categories.setdefault(marker.lower(), set()).add('login_wall')
+        
+        self.groups = self.build_groups(list(self.categories), min_key_length)
+        self.longest_marker = max(len(marker) for marker in self.categories)
+
+    @staticmethod
+    def build_groups(markers, min_key_length):
+        """Greedily group markers under the shared word n-gram covering the most of them"""
+        candidates = set()
+        for marker in markers:
+            words = marker.split()
+            for i in range(len(words)):
+                for j in range(i + 1, len(words) + 1):
+                    phrase = ' '.join(words[i:j])
+                    if len(phrase) >= min_key_length:
+                        candidates.add(phrase)
+        
+        groups = []
+        remaining = set(markers)
+        while remaining:
+            best_key, best_members = None, []
+            for key in candidates:
+                members = [m for m in remaining if key in m]
+                if len(members) > len(best_members) or (len(members) == len(best_members) and best_key and len(key) > len(best_key)):
+                    best_key, best_members = key, members
+            
+            if len(best_members) <= 1:
+                # No shared phrase left, every marker is its own probe
+                groups.extend((marker, [marker]) for marker in sorted(remaining))
+                break
+            
+            groups.append((best_key, sorted(best_members, key=len)))
+            remaining.difference_update(best_members)
+        
+        return groups
+
+    def scan_lower(self, text_lower, signatures=None, hits=None, negatives=None):
+        """Collect every hit in an already lowercased body (plus per-platform signatures/negatives)"""
+        hits = hits or MatchHits()
+        
+        for key, members in self.groups:
+            if key in text_lower:
+                for marker in members:
+                    if marker == key or marker in text_lower:
+                        for category in self.categories[marker]:
+                            getattr(hits, category).add(marker)
+        
+        for signature in signatures or ():
+            if signature in text_lower:
+                hits.signatures.add(signature)
+        
+        for marker in negatives or ():
+            if marker in text_lower:
+                hits.not_found.add(marker)
+        
+        return hits
+
+    def scan(self, text, signatures=None, hits=None, negatives=None):
+        """Lowercase a body once and collect every hit"""
+        return self.scan_lower(text.lower(), signatures, hits, negatives)
+
+# Built once at startup and shared by every check
+MATCHER = PatternMatcher(NOT_FOUND_PATTERNS, LOGIN_WALL_MARKERS)
+
+class BodyScanner:
+    """Decode a streamed response body chunk by chunk and stop once the verdict is decided"""
+    
+    def __init__(self, encoding, max_bytes, signatures=None, negatives=None):
+        self.decoder = codecs.getincrementaldecoder(encoding or 'utf-8')(errors='replace')
+        self.max_bytes = max_bytes
+        self.signatures = signatures or []
+        self.negatives = negatives or []
+        
+        # Longest marker, so matches spanning two chunks are not missed
+        self.overlap = max([MATCHER.longest_marker] + [len(marker) for marker in self.signatures + self.negatives])
+        self.hits = MatchHits()
+        self.parts = []
+        self.tail = ''
+        self.bytes_read = 0
+        self.stop_reason = None
+        self.cpu_seconds = 0.0
+
+    def feed(self, chunk):
+        """Consume one chunk; returns True when the rest of the body is not needed"""
+        started = time.thread_time()
+        self.bytes_read += len(chunk)
+        text = self.decoder.decode(chunk)
+        self.parts.append(text)
+        window = self.tail + text.lower()
+        self.tail = window[-self.overlap:]
+        MATCHER.scan_lower(window, self.signatures, self.hits, self.negatives)
+        
+        if self.hits.not_found:
+            self.stop_reason = 'not_found'
+        elif self.bytes_read >= MIN_PROFILE_BYTES and self.hits.signatures:
+            self.stop_reason = 'positive'
+        elif self.bytes_read >= self.max_bytes:
+            self.stop_reason = 'capped'
+        
+        self.cpu_seconds += time.thread_time() - started
+        return self.stop_reason is not None
+
+    @property
+    def text(self):
+        return ''.join(self.parts) + self.decoder.decode(b'', final=True)
+
+def registrable_domain(url):
+    """Last two host labels, so user subdomains (x.tumblr.com) share one rate-limit group"""
+    host = urlparse(url).netloc.split(':')[0].lower()
+    return '.'.join(host.split('.')[-2:])
+
+def rate_group(url, platform_data=None):
+    """Rate-limit group for a check: the platform's shared-infrastructure group or its domain"""
+    if isinstance(platform_data, dict) and platform_data.get('rate_group'):
+        return platform_data['rate_group']
+    return registrable_domain(url)
+
+class RetryableStatus(Exception):
+    """A throttling or gateway answer that is worth asking again"""
+
+    def __init__(self, status, retry_after=None):
+        super().__init__(f"HTTP {status}")
+        self.status = status
+        self.retry_after = retry_after
+
+class RetryLater:
+    """A scheduled check's next attempt, handed back to the scheduler instead of sleeping in a worker"""
+
+    def __init__(self, delay, tries, started):
+        self.delay = delay
+        self.tries = tries
+        self.started = started
+        self.timing = None
+
+def retry_after_seconds(value):
+    """Seconds asked for by a Retry-After header (delta-seconds or an HTTP date), None if absent or unreadable"""
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+def backoff_delay(attempt, retry_after=None):
+    """Wait before retry number attempt + 1: full-jitter exponential, or the server's Retry-After plus a little jitter"""
+    if retry_after is not None:
+        return retry_after + random.uniform(0, RETRY_BASE_DELAY)
+    return random.uniform(0, min(RETRY_MAX_DELAY, RETRY_BASE_DELAY * 2 ** attempt))
+
+class CircuitBreakers:
+    """Per rate group circuit breakers shared by every investigation in a process
+    
+    A group whose requests fail `threshold` times in a row (timeouts, connection errors,
+    retryable statuses) is opened: its remaining checks are skipped instead of each paying
+    for timeouts and retries. After `cooldown` seconds a single trial request is let through
+    (another one only if it has not answered within a further cooldown); a success closes
+    the breaker and a failure opens it again. Skipped checks are credited with the
+    average time the group's failed checks took, which the summary reports as time saved.
+    """
+
+    def __init__(self, threshold=BREAKER_THRESHOLD, cooldown=BREAKER_COOLDOWN):
+        self.threshold = threshold
+        self.cooldown = cooldown
+        self.lock = threading.Lock()
+        self.groups = {}
+
+    def group_state(self, key):
+        state = self.groups.get(key)
+        if state is None:
+            state = {'failures': 0, 'opened_at': None, 'probe_at': None, 'opened': 0, 'failed_checks': 0,
+                     'failed_seconds': 0.0, 'skipped': 0, 'saved_seconds': 0.0}
+            self.groups[key] = state
+        return state
+
+    def allow(self, key):
+        """True if the group may be sent a request; a skipped check is counted otherwise"""
+        if self.threshold <= 0:
+            return True
+        with self.lock:
+            state = self.group_state(key)
+            if state['opened_at'] is None:
+                return True
+            now = time.monotonic()
+            if now - max(state['opened_at'], state['probe_at'] or 0) >= self.cooldown:
+                # Half-open: this request alone decides, everything else stays skipped meanwhile
+                state['probe_at'] = now
+                return True
+            
+            state['skipped'] += 1
+            if state['failed_checks']:
+                state['saved_seconds'] += state['failed_seconds'] / state['failed_checks']
+            return False
+
+    def success(self, key):
+        with self.lock:
+            state = self.groups.get(key)
+            if state:
+                state['failures'] = 0
+                state['opened_at'] = None
+                state['probe_at'] = None
+
+    def failure(self, key):
+        """Count one failed request; True if it opened the breaker"""
+        if self.threshold <= 0:
+            return False
+        with self.lock:
+            state = self.group_state(key)
+            state['failures'] += 1
+            if state['probe_at'] is not None or (state['opened_at'] is None and state['failures'] >= self.threshold):
+                state['opened_at'] = time.monotonic()
+                state['probe_at'] = None
+                state['opened'] += 1
+                return True
+            return False
+
+    def gave_up(self, key, seconds):
+        """Account the wall time of a check that failed for good (all its attempts and waits)"""
+        with self.lock:
+            state = self.group_state(key)
+            state['failed_checks'] += 1
+            state['failed_seconds'] += seconds
+
+    def summary(self):
+        """Opened groups, skipped checks and the estimated time they would have cost"""
+        with self.lock:
+            opened = {key: state for key, state in self.groups.items() if state['opened']}
+            return {
+                'threshold': self.threshold,
+                'open_groups': sorted(opened),
+                'skipped_checks': sum(state['skipped'] for state in opened.values()),
+                'seconds_saved': round(sum(state['saved_seconds'] for state in opened.values()), 2)
+            }
+
+class ConcurrencyController:
+    """AIMD limits on checks in flight, globally and per rate group
+    
+    Limits creep up by about one per window of successful checks whose latency stays within
+    LATENCY_TOLERANCE of the group's best, and are halved (at most once per BACKOFF_INTERVAL)
+    on timeouts, 429/503 answers and connection errors. Every change of the global limit is
+    logged and kept in `timeline` so a slow run can be explained afterwards.
+    """
+
+    def __init__(self, initial=15, min_limit=2, max_limit=100, domain_max=4):
+        self.min_limit = max(1, min_limit)
+        self.max_limit = max(self.min_limit, max_limit)
+        self.limit = float(min(max(initial, self.min_limit), self.max_limit))
+        self.domain_max = max(1, domain_max)
+        self.lock = threading.Lock()
+        self.groups = {}
+        self.last_backoff = 0
+        self.started = time.monotonic()
+        self.timeline = [{'t': 0, 'limit': int(self.limit), 'reason': 'start'}]
+        self.stats = {'increases': 0, 'backoffs': 0, 'domain_backoffs': 0}
+
+    def global_limit(self):
+        return int(self.limit)
+
+    def domain_limit(self, key):
+        state = self.groups.get(key)
+        return int(state['limit']) if state else self.domain_max
+
+    def observe(self, key, outcome, latency=None):
+        """Account one request: 'ok' (with its latency), 'throttled', 'timeout' or 'error'"""
+        with self.lock:
+            now = time.monotonic()
+            state = self.groups.get(key)
+            if state is None:
+                state = {'limit': float(self.domain_max), 'latency': None, 'floor': None, 'last_backoff': 0}
+                self.groups[key] = state
+            before = int(self.limit)
+            reason = outcome
+            
+            if outcome == 'ok':
+                if latency is not None:
+                    if state['latency'] is None:
+                        state['latency'] = latency
+                    else:
+                        state['latency'] += LATENCY_SMOOTHING * (latency - state['latency'])
+                    state['floor'] = state['latency'] if state['floor'] is None else min(state['floor'], state['latency'])
+                
+                # A group answering much slower than its best is saturated: hold instead of growing
+                if state['latency'] is not None and state['latency'] > state['floor'] * LATENCY_TOLERANCE:
+                    return
+                self.limit = min(self.max_limit, self.limit + 1 / self.limit)
+                state['limit'] = min(self.domain_max, state['limit'] + 1 / state['limit'])
+                reason = 'healthy'
+            else:
+                if now - state['last_backoff'] >= BACKOFF_INTERVAL:
+                    state['last_backoff'] = now
+                    state['limit'] = max(1.0, state['limit'] / 2)
+                    self.stats['domain_backoffs'] += 1
+                    logging.info(f"Concurrency for {key} backed off to {int(state['limit'])} ({outcome})")
+                if now - self.last_backoff >= BACKOFF_INTERVAL:
+                    self.last_backoff = now
+                    self.limit = max(self.min_limit, self.limit / 2)
+                    self.stats['backoffs'] += 1
+            
+            after = int(self.limit)
+            if after != before:
+                if after > before:
+                    self.stats['increases'] += 1
+                self.timeline.append({'t': round(now - self.started, 2), 'limit': after, 'reason': reason})
+                logging.info(f"Concurrency {before} -> {after} ({reason})")
+
+    def summary(self):
+        """Limit range and change counts, plus the timeline, for the reports"""
+        limits = [point['limit'] for point in self.timeline]
+        return dict(self.stats, start=limits[0], final=int(self.limit), low=min(limits), high=max(limits),
+                    timeline=self.timeline)
+
+class DomainScheduler:
+    """Per-group token buckets plus a ready queue that hands out the next check allowed to fire
+    
+    Each group (a domain, or several hosts sharing infrastructure) refills `rate` tokens per
+    second up to `burst` and may have at most `max_concurrency` checks in flight. Groups with
+    pending work sit in a heap ordered by the time they next become eligible, so a worker
+    only waits when no group at all can fire. With a ConcurrencyController the global and
+    per-group in-flight limits follow the controller instead of staying fixed. Retries are
+    submitted with a delay and held aside until it has passed, so no worker sleeps on one.
+    """
+
+    def __init__(self, rate=None, burst=1, max_concurrency=4, controller=None):
+        self.rate = rate
+        self.burst = max(1, burst)
+        self.max_concurrency = max(1, max_concurrency)
+        self.controller = controller
+        self.cond = threading.Condition()
+        self.groups = {}
+        self.heap = []
+        self.delayed = []
+        self.sequence = 0
+        self.pending = 0
+        self.active = 0
+        self.closed = False
+
+    def group_state(self, key):
+        state = self.groups.get(key)
+        if state is None:
+            state = {'tokens': float(self.burst), 'updated': time.monotonic(), 'active': 0,
+                     'queue': deque(), 'in_heap': False}
+            self.groups[key] = state
+        return state
+
+    def group_limit(self, key):
+        return self.controller.domain_limit(key) if self.controller else self.max_concurrency
+
+    def push_ready(self, key, state, eligible_at):
+        """Put a group on the ready heap unless it is already there, empty or saturated"""
+        if state['in_heap'] or not state['queue'] or state['active'] >= self.group_limit(key):
+            return
+        self.sequence += 1
+        heapq.heappush(self.heap, (eligible_at, self.sequence, key))
+        state['in_heap'] = True
+
+    def refill(self, state, now):
+        if self.rate:
+            state['tokens'] = min(self.burst, state['tokens'] + (now - state['updated']) * self.rate)
+        else:
+            state['tokens'] = float(self.burst)
+        state['updated'] = now
+
+    def next_eligible(self, state, now):
+        """When the group's bucket will next hold a whole token"""
+        if not self.rate or state['tokens'] >= 1:
+            return now
+        return now + (1 - state['tokens']) / self.rate
+
+    def submit(self, key, task, delay=0):
+        """Queue a check under its rate-limit group (after `delay` seconds for a retry)"""
+        with self.cond:
+            self.pending += 1
+            if delay > 0:
+                self.sequence += 1
+                heapq.heappush(self.delayed, (time.monotonic() + delay, self.sequence, key, task))
+            else:
+                state = self.group_state(key)
+                state['queue'].append((time.monotonic(), task))
+                self.push_ready(key, state, time.monotonic())
+            self.cond.notify()
+
+    def release_delayed(self, now):
+        """Move retries whose delay has passed to the front of their group's queue"""
+        while self.delayed and self.delayed[0][0] <= now:
+            _, _, key, task = heapq.heappop(self.delayed)
+            state = self.group_state(key)
+            state['queue'].appendleft((now, task))
+            self.push_ready(key, state, now)
+
+    def poll_locked(self, now):
+        """Return (key, task, seconds queued) if some group may fire, else seconds until one may (None if none queued)"""
+        self.release_delayed(now)
+        
+        # At the adaptive global limit nothing fires until a running check is done
+        if self.controller and self.active >= self.controller.global_limit():
+            return None
+        
+        while self.heap:
+            eligible_at, _, key = self.heap[0]
+            if eligible_at > now:
+                if self.delayed:
+                    return min(eligible_at, self.delayed[0][0]) - now
+                return eligible_at - now
+            
+            heapq.heappop(self.heap)
+            state = self.groups[key]
+            state['in_heap'] = False
+            if not state['queue'] or state['active'] >= self.group_limit(key):
+                continue
+            
+            self.refill(state, now)
+            if state['tokens'] < 1:
+                self.push_ready(key, state, self.next_eligible(state, now))
+                continue
+            
+            state['tokens'] -= 1
+            state['active'] += 1
+            self.active += 1
+            self.pending -= 1
+            submitted_at, task = state['queue'].popleft()
+            self.push_ready(key, state, self.next_eligible(state, now))
+            return key, task, now - submitted_at
+        
+        return self.delayed[0][0] - now if self.delayed else None
+
+    def poll(self):
+        """Non-blocking poll for event-loop callers"""
+        with self.cond:
+            return self.poll_locked(time.monotonic())
+
+    def next_task(self):
+        """Block until a check may fire; returns None once closed and drained"""
+        with self.cond:
+            while True:
+                item = self.poll_locked(time.monotonic())
+                if isinstance(item, tuple):
+                    return item
+                # Running checks may still hand back a retry
+                if self.closed and self.pending == 0 and self.active == 0:
+                    return None
+                self.cond.wait(timeout=item)
+
+    def done(self, key):
+        """Release a group's concurrency slot after its check finished"""
+        with self.cond:
+            state = self.groups[key]
+            state['active'] -= 1
+            self.active -= 1
+            now = time.monotonic()
+            self.refill(state, now)
+            self.push_ready(key, state, self.next_eligible(state, now))
+            self.cond.notify_all()
+
+    def close(self):
+        """No more submissions; idle workers exit once the queue drains"""
+        with self.cond:
+            self.closed = True
+            self.cond.notify_all()
+
+    def charge(self, key):
+        """Take a further token for a follow-up request of a running check; returns seconds until it is covered"""
+        with self.cond:
+            state = self.group_state(key)
+            self.refill(state, time.monotonic())
+            # The bucket may go into debt, which holds back the group's next release by as much
+            state['tokens'] -= 1
+            if not self.rate or state['tokens'] >= 0:
+                return 0.0
+            return -state['tokens'] / self.rate
+
+    def drained(self):
+        with self.cond:
+            return self.pending == 0 and self.active == 0
+
+def kill_tool(process):
+    """Kill an external tool together with any children it spawned"""
+    try:
+        if os.name == 'posix':
+            os.killpg(process.pid, 9)
+            return
+    except Exception:
+        pass
+    process.kill()
+
+def scheduled_worker(scheduler, results):
+    """Worker loop: run whichever check the scheduler releases next and report it"""
+    while True:
+        item = scheduler.next_task()
+        if item is None:
+            return
+        
+        key, (investigator, platform, data, retry), queued = item
+        result = None
+        try:
+            result = investigator.check_url(platform, data, paced=True, queued=queued, retry=retry)
+        except Exception as e:
+            logging.error(f"Error in worker: {str(e)}")
+        finally:
+            # A retry goes back before the slot is released, so idle workers never see an empty scheduler
+            if isinstance(result, RetryLater):
+                scheduler.submit(key, (investigator, platform, data, result), delay=result.delay)
+            scheduler.done(key)
+            if not isinstance(result, RetryLater):
+                results.put((investigator, result))
+
+class ResponseCache:
+    """SQLite store of check responses keyed by normalized URL, evicted least-recently-used past a size bound"""
+
+    def __init__(self, path=CACHE_PATH, ttl=CACHE_TTL, max_bytes=CACHE_MAX_BYTES):
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self.lock = threading.Lock()
+        self.db = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self.db.execute('PRAGMA journal_mode=WAL')
+        self.db.execute('PRAGMA synchronous=NORMAL')
+        self.db.execute("""CREATE TABLE IF NOT EXISTS responses (
+            key TEXT PRIMARY KEY, platform TEXT, status INTEGER, final_url TEXT, etag TEXT,
+            last_modified TEXT, verdict TEXT, body BLOB, size INTEGER, fetched_at REAL, accessed_at REAL)""")
+        self.db.execute('CREATE INDEX IF NOT EXISTS responses_accessed ON responses (accessed_at)')
+        self.total_bytes = self.db.execute('SELECT COALESCE(SUM(size), 0) FROM responses').fetchone()[0]
+
+    def get(self, key):
+        """Stored entry for a key, fresh or stale, or None (the body stays compressed until it is needed)"""
+        with self.lock:
+            row = self.db.execute('SELECT status, final_url, etag, last_modified, verdict, body, fetched_at '
+                                  'FROM responses WHERE key = ?', (key,)).fetchone()
+            if row is None:
+                return None
+            self.db.execute('UPDATE responses SET accessed_at = ? WHERE key = ?', (time.time(), key))
+        
+        status, final_url, etag, last_modified, verdict, body, fetched_at = row
+        return {
+            'status': status,
+            'final_url': final_url,
+            'etag': etag,
+            'last_modified': last_modified,
+            'verdict': json.loads(verdict) if verdict else None,
+            'body': body,
+            'fetched_at': fetched_at
+        }
+
+    @staticmethod
+    def text(entry):
+        """Decompressed body of an entry, or None if none was stored"""
+        return zlib.decompress(entry['body']).decode('utf-8', errors='replace') if entry['body'] else None
+
+    def put(self, key, platform, status, final_url, headers, verdict, body):
+        """Store one response (body zlib-compressed), evicting old entries past the size bound"""
+        headers = headers or {}
+        compressed = zlib.compress(body.encode('utf-8', errors='replace')) if body else None
+        size = len(compressed or b'') + len(key) + 128
+        now = time.time()
+        
+        with self.lock:
+            old = self.db.execute('SELECT size FROM responses WHERE key = ?', (key,)).fetchone()
+            self.db.execute('INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)',
+                            (key, platform, status, final_url, headers.get('ETag'), headers.get('Last-Modified'),
+                             json.dumps(verdict) if verdict else None, compressed, size, now, now))
+            self.total_bytes += size - (old[0] if old else 0)
+            if self.total_bytes > self.max_bytes:
+                self.evict()
+
+    def evict(self):
+        """Drop least recently used entries until 90% of the bound is free (lock held)"""
+        target = self.max_bytes * 0.9
+        while self.total_bytes > target:
+            rows = self.db.execute('SELECT key, size FROM responses ORDER BY accessed_at LIMIT 256').fetchall()
+            if not rows:
+                self.total_bytes = 0
+                return
+            
+            victims = []
+            for key, size in rows:
+                if self.total_bytes <= target:
+                    break
+                victims.append((key,))
+                self.total_bytes -= size
+            self.db.executemany('DELETE FROM responses WHERE key = ?', victims)
+
+    def touch(self, key):
+        """Mark an entry fresh again after the server answered 304 Not Modified"""
+        with self.lock:
+            self.db.execute('UPDATE responses SET fetched_at = ? WHERE key = ?', (time.time(), key))
+
+    def close(self):
+        with self.lock:
+            try:
+                self.db.close()
+            except:
+                pass
+
+class NegativeCache:
+    """Compact store of (platform, username) pairs confirmed not to exist
+    
+    Each pair is reduced to a 64-bit hash held in a sorted array next to a timestamp and a
+    reason code, so millions of entries cost 13 bytes each in memory and on disk and a
+    lookup is a binary search. Entries recorded during a run are appended unsorted and
+    merged into the file on save. The three sorted arrays are swapped as one tuple, so a
+    lookup racing a save reads either the old entries or the new ones, never a mix.
+    """
+    
+    MAGIC = b'WUNC'
+
+    def __init__(self, path=NEGATIVE_CACHE_PATH, ttl=NEGATIVE_TTL):
+        self.path = path
+        self.ttl = ttl
+        self.lock = threading.Lock()
+        self.entries = self.load()
+        self.new_keys, self.new_times, self.new_reasons = array('Q'), array('I'), array('B')
+
+    @staticmethod
+    def key(platform, username):
+        digest = hashlib.blake2b(f"{platform}\0{username.lower()}".encode('utf-8'), digest_size=8).digest()
+        return int.from_bytes(digest, 'little')
+
+    def load(self):
+        """Read the sorted key, timestamp and reason arrays (empty when missing or corrupt)"""
+        keys, times, reasons = array('Q'), array('I'), array('B')
+        try:
+            with open(self.path, 'rb') as f:
+                magic, count = struct.unpack('<4sI', f.read(8))
+                if magic != self.MAGIC:
+                    raise ValueError('bad magic')
+                keys.fromfile(f, count)
+                times.fromfile(f, count)
+                reasons.fromfile(f, count)
+        except FileNotFoundError:
+            pass
+        except Exception as e:
+            logging.warning(f"Negative cache unreadable, starting empty: {str(e)}")
+            keys, times, reasons = array('Q'), array('I'), array('B')
+        return keys, times, reasons
+
+    def get(self, platform, username):
+        """Reason a pair was confirmed missing within the TTL, or None"""
+        key = self.key(platform, username)
+        keys, times, reasons = self.entries
+        index = bisect_left(keys, key)
+        if index < len(keys) and keys[index] == key and time.time() - times[index] < self.ttl:
+            return NEGATIVE_REASONS[reasons[index]]
+        return None
+
+    def add(self, platform, username, reason):
+        with self.lock:
+            self.new_keys.append(self.key(platform, username))
+            self.new_times.append(int(time.time()))
+            self.new_reasons.append(NEGATIVE_REASONS.index(reason))
+
+    def save(self):
+        """Merge this run's entries (and any another process saved meanwhile) into the file, dropping expired ones"""
+        with self.lock:
+            if not self.new_keys:
+                return
+            
+            on_disk = self.load()
+            order = sorted(range(len(self.new_keys)), key=self.new_keys.__getitem__)
+            fresh = (array('Q', (self.new_keys[i] for i in order)),
+                     array('I', (self.new_times[i] for i in order)),
+                     array('B', (self.new_reasons[i] for i in order)))
+            merged = self.merge(*self.merge(*self.entries, *on_disk), *fresh)
+            
+            Path(self.path).parent.mkdir(parents=True, exist_ok=True)
+            temp_path = f"{self.path}.tmp"
+            with open(temp_path, 'wb') as f:
+                f.write(struct.pack('<4sI', self.MAGIC, len(merged[0])))
+                for column in merged:
+                    column.tofile(f)
+            os.replace(temp_path, self.path)
+            
+            self.entries = merged
+            self.new_keys, self.new_times, self.new_reasons = array('Q'), array('I'), array('B')
+
+    def merge(self, keys_a, times_a, reasons_a, keys_b, times_b, reasons_b):
+        """Merge two sorted runs, keeping the newest entry per key and dropping expired ones"""
+        keys, times, reasons = array('Q'), array('I'), array('B')
+        cutoff = time.time() - self.ttl
+        i = j = 0
+        while i < len(keys_a) or j < len(keys_b):
+            if j >= len(keys_b) or (i < len(keys_a) and keys_a[i] < keys_b[j]):
+                key, stamp, reason = keys_a[i], times_a[i], reasons_a[i]
+                i += 1
+            elif i >= len(keys_a) or keys_b[j] < keys_a[i]:
+                key, stamp, reason = keys_b[j], times_b[j], reasons_b[j]
+                j += 1
+            else:
+                if times_a[i] >= times_b[j]:
+                    key, stamp, reason = keys_a[i], times_a[i], reasons_a[i]
+                else:
+                    key, stamp, reason = keys_b[j], times_b[j], reasons_b[j]
+                i += 1
+                j += 1
+            
+            if stamp < cutoff:
+                continue
+            
+            # A run may repeat a key (recorded twice, or a file written before this was deduplicated)
+            if keys and keys[-1] == key:
+                if stamp >= times[-1]:
+                    times[-1] = stamp
+                    reasons[-1] = reason
+                continue
+            keys.append(key)
+            times.append(stamp)
+            reasons.append(reason)
+        return keys, times, reasons
+
+    def __len__(self):
+        return len(self.entries[0]) + len(self.new_keys)
+
+# Timing breakdown of the check running in this thread or task (None outside a check)
+CHECK_TIMING = contextvars.ContextVar('check_timing', default=None)
+
+def timing_add(phase, amount):
+    """Add seconds (or bytes) to one phase of the current check's timing breakdown"""
+    timing = CHECK_TIMING.get()
+    if timing is not None:
+        timing[phase] = timing.get(phase, 0) + amount
+
+def percentiles(values, points=TIMING_PERCENTILES):
+    """Nearest-rank percentiles of a list of numbers, keyed p50, p95, ..."""
+    ordered = sorted(values)
+    if not ordered:
+        return {f"p{point}": 0 for point in points}
+    return {f"p{point}": round(ordered[min(len(ordered) - 1, max(0, -(-point * len(ordered) // 100) - 1))], 4)
+            for point in points}
+
+class ConnectionStats:
+    """Thread-safe counters for requests, new connections and TLS handshakes"""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.counts = {'requests': 0, 'connections': 0, 'tls_handshakes': 0}
+        self.local = threading.local()
+
+    def add(self, key, amount=1):
+        with self.lock:
+            self.counts[key] += amount
+
+    def trace(self, event_name, info):
+        """httpx trace hook: count connections as the transport opens them and time each step"""
+        if event_name == 'connection.connect_tcp.complete':
+            self.add('connections')
+        elif event_name == 'connection.start_tls.complete':
+            self.add('tls_handshakes')
+        
+        step, _, stage = event_name.rpartition('.')
+        phase = HTTPX_TIMING_STEPS.get(step)
+        if phase is None:
+            return
+        if stage == 'started':
+            self.local.started = time.perf_counter()
+        elif stage in ('complete', 'failed'):
+            timing_add(phase, time.perf_counter() - getattr(self.local, 'started', time.perf_counter()))
+
+    def aiohttp_trace_config(self):
+        """aiohttp TraceConfig feeding the same counters from the async engine"""
+        import aiohttp
+        
+        async def on_request_start(session, ctx, params):
+            ctx.https = params.url.scheme == 'https'
+            self.add('requests')
+        
+        async def on_dns_resolvehost_start(session, ctx, params):
+            ctx.dns_started = time.perf_counter()
+        
+        async def on_dns_resolvehost_end(session, ctx, params):
+            ctx.dns_seconds = time.perf_counter() - ctx.dns_started
+            timing_add('dns', ctx.dns_seconds)
+        
+        async def on_connection_create_start(session, ctx, params):
+            ctx.connect_started = time.perf_counter()
+            ctx.dns_seconds = 0
+        
+        async def on_connection_create_end(session, ctx, params):
+            self.add('connections')
+            if getattr(ctx, 'https', False):
+                self.add('tls_handshakes')
+            # aiohttp resolves inside connection setup and has no separate TLS event
+            timing_add('connect', time.perf_counter() - ctx.connect_started - ctx.dns_seconds)
+        
+        async def on_request_headers_sent(session, ctx, params):
+            ctx.sent = time.perf_counter()
+        
+        async def on_request_end(session, ctx, params):
+            if hasattr(ctx, 'sent'):
+                timing_add('ttfb', time.perf_counter() - ctx.sent)
+        
+        trace_config = aiohttp.TraceConfig()
+        trace_config.on_request_start.append(on_request_start)
+        trace_config.on_dns_resolvehost_start.append(on_dns_resolvehost_start)
+        trace_config.on_dns_resolvehost_end.append(on_dns_resolvehost_end)
+        trace_config.on_connection_create_start.append(on_connection_create_start)
+        trace_config.on_connection_create_end.append(on_connection_create_end)
+        trace_config.on_request_headers_sent.append(on_request_headers_sent)
+        trace_config.on_request_end.append(on_request_end)
+        return trace_config
+
+class TimedConnection:
+    """urllib3 connection mixin adding connect, TLS and time-to-first-byte to the current check's timing
+    
+    urllib3 resolves the host inside the TCP connect, so the thread engine's connect time
+    includes DNS. TLS is whatever connect() spends after the socket is up.
+    """
+
+    def _new_conn(self):
+        started = time.perf_counter()
+        try:
+            return super()._new_conn()
+        finally:
+            self.tcp_seconds = time.perf_counter() - started
+            timing_add('connect', self.tcp_seconds)
+
+    def connect(self):
+        self.tcp_seconds = 0
+        started = time.perf_counter()
+        super().connect()
+        if isinstance(self, urllib3.connection.HTTPSConnection):
+            timing_add('tls', max(0.0, time.perf_counter() - started - self.tcp_seconds))
+
+    def request(self, *args, **kwargs):
+        super().request(*args, **kwargs)
+        self.request_sent = time.perf_counter()
+
+    def getresponse(self, *args, **kwargs):
+        try:
+            return super().getresponse(*args, **kwargs)
+        finally:
+            timing_add('ttfb', time.perf_counter() - getattr(self, 'request_sent', time.perf_counter()))
+
+class TimedHTTPConnection(TimedConnection, urllib3.connection.HTTPConnection):
+    pass
+
+class TimedHTTPSConnection(TimedConnection, urllib3.connection.HTTPSConnection):
+    pass
+
+class TimedHTTPConnectionPool(urllib3.HTTPConnectionPool):
+    ConnectionCls = TimedHTTPConnection
+
+class TimedHTTPSConnectionPool(urllib3.HTTPSConnectionPool):
+    ConnectionCls = TimedHTTPSConnection
+
+class TimedHTTPAdapter(requests.adapters.HTTPAdapter):
+    """HTTPAdapter whose pools hand out TimedConnections (direct and through HTTP proxies)"""
+    
+    pool_classes = {'http': TimedHTTPConnectionPool, 'https': TimedHTTPSConnectionPool}
+
+    def init_poolmanager(self, *args, **kwargs):
+        super().init_poolmanager(*args, **kwargs)
+        self.poolmanager.pool_classes_by_scheme = self.pool_classes
+
+    def proxy_manager_for(self, proxy, **proxy_kwargs):
+        manager = super().proxy_manager_for(proxy, **proxy_kwargs)
+        if not proxy.lower().startswith('socks'):
+            manager.pool_classes_by_scheme = self.pool_classes
+        return manager
+
+class Http2Body:
+    """File-like view of a streamed httpx response, as requests expects in Response.raw"""
+
+    def __init__(self, response):
+        self.response = response
+
+    def stream(self, chunk_size, decode_content=True):
+        yield from self.response.iter_bytes(chunk_size)
+
+    def read(self, amt=None, decode_content=True):
+        return b''.join(self.response.iter_bytes())
+
+    def tell(self):
+        return self.response.num_bytes_downloaded
+
+    def close(self):
+        self.response.close()
+
+class Http2Adapter(requests.adapters.BaseAdapter):
+    """requests transport backed by an httpx HTTP/2 client, so checks to one host share a multiplexed connection"""
+
+    def __init__(self, stats, pool_size, proxy=None):
+        import httpx
+        
+        super().__init__()
+        self.stats = stats
+        self.client = httpx.Client(http2=True, proxy=proxy,
+                                   limits=httpx.Limits(max_connections=pool_size, max_keepalive_connections=pool_size))
+
+    def send(self, request, stream=False, timeout=None, verify=True, cert=None, proxies=None):
+        import httpx
+        
+        connect_timeout, read_timeout = timeout if isinstance(timeout, tuple) else (timeout, timeout)
+        http_request = self.client.build_request(
+            request.method, request.url, headers=dict(request.headers), content=request.body,
+            timeout=httpx.Timeout(read_timeout, connect=connect_timeout), extensions={'trace': self.stats.trace})
+        try:
+            http_response = self.client.send(http_request, stream=True)
+        except httpx.TimeoutException as e:
+            raise requests.exceptions.Timeout(e, request=request)
+        except httpx.TransportError as e:
+            raise requests.exceptions.ConnectionError(e, request=request)
+        self.stats.add('requests')
+        
+        response = requests.Response()
+        response.status_code = http_response.status_code
+        response.reason = http_response.reason_phrase
+        response.headers = requests.structures.CaseInsensitiveDict(http_response.headers.items())
+        response.encoding = requests.utils.get_encoding_from_headers(response.headers)
+        response.raw = Http2Body(http_response)
+        response.url = request.url
+        response.request = request
+        response.connection = self
+        if not stream:
+            response.content
+        return response
+
+    def close(self):
+        self.client.close()
+
+class SettleTimes:
+    """Learned per-platform page settle times, kept as a moving average across runs"""
+
+    def __init__(self, path=SETTLE_TIMES_PATH):
+        self.path = path
+        self.lock = threading.Lock()
+        self.times = {}
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                self.times = json.load(f)
+        except (OSError, ValueError):
+            pass
+
+    def get(self, platform_name):
+        with self.lock:
+            entry = self.times.get(platform_name)
+        return entry['seconds'] if entry else None
+
+    def record(self, platform_name, seconds):
+        with self.lock:
+            entry = self.times.get(platform_name)
+            if entry is None:
+                self.times[platform_name] = {'seconds': round(seconds, 3), 'samples': 1}
+                return
+            entry['seconds'] = round(entry['seconds'] + SETTLE_SMOOTHING * (seconds - entry['seconds']), 3)
+            entry['samples'] += 1
+
+    def save(self):
+        try:
+            Path(os.path.dirname(self.path)).mkdir(parents=True, exist_ok=True)
+            with self.lock:
+                with open(f"{self.path}.tmp", 'w', encoding='utf-8') as f:
+                    json.dump(self.times, f, indent=1, sort_keys=True)
+                os.replace(f"{self.path}.tmp", self.path)
+        except OSError as e:
+            logging.warning(f"Could not save settle times: {str(e)}")
+
+def difference_hash(image, size=DHASH_SIZE):
+    """Perceptual hash (size*size bits): brightness gradients of a small grayscale thumbnail"""
+    from PIL import Image
+    
+    pixels = image.convert('L').resize((size + 1, size), Image.Resampling.BILINEAR).tobytes()
+    value = 0
+    for row in range(size):
+        for col in range(size):
+            value = (value << 1) | (pixels[row * (size + 1) + col] > pixels[row * (size + 1) + col + 1])
+    return value
+
+def store_screenshot(path, store_dir, image_format='webp', quality=80):
+    """Process-pool stage: hash, re-encode and thumbnail one capture into the shared store"""
+    started = time.perf_counter()
+    with open(path, 'rb') as f:
+        data = f.read()
+    digest = hashlib.sha256(data).hexdigest()
+    result = {'sha256': digest, 'dhash': None, 'original_bytes': len(data), 'thumbnail': None}
+    
+    try:
+        from PIL import Image
+    except ImportError:
+        # Without Pillow the capture is stored as-is; exact duplicates are still shared
+        target = os.path.join(store_dir, f"{digest[:32]}.png")
+        if not os.path.exists(target):
+            shutil.copyfile(path, f"{target}.{os.getpid()}.tmp")
+            os.replace(f"{target}.{os.getpid()}.tmp", target)
+        result.update(file=target, stored_bytes=os.path.getsize(target), seconds=time.perf_counter() - started)
+        return result
+    
+    extension = 'jpg' if image_format == 'jpeg' else image_format
+    options = {'optimize': True} if image_format == 'png' else {'quality': quality}
+    target = os.path.join(store_dir, f"{digest[:32]}.{extension}")
+    thumbnail = os.path.join(store_dir, f"{digest[:32]}_thumb.{extension}")
+    
+    with Image.open(path) as image:
+        image = image.convert('RGB')
+        result['dhash'] = difference_hash(image)
+        
+        # Identical bytes were encoded before (this run or an earlier investigation)
+        for output, size in ((target, None), (thumbnail, (THUMBNAIL_WIDTH, THUMBNAIL_WIDTH * 2))):
+            if os.path.exists(output):
+                continue
+            encoded = image.copy() if size else image
+            if size:
+                encoded.thumbnail(size)
+            encoded.save(f"{output}.{os.getpid()}.tmp", format=image_format.upper(), **options)
+            os.replace(f"{output}.{os.getpid()}.tmp", output)
+    
+    result.update(file=target, thumbnail=thumbnail, stored_bytes=os.path.getsize(target),
+                  seconds=time.perf_counter() - started)
+    return result
+
+class ScreenshotStore:
+    """Content-addressed screenshot store shared by all investigations, fed by a process pool
+    
+    Captures are re-encoded and thumbnailed in worker processes; the main process then
+    folds byte-identical (sha256) images onto one stored file. Near-identical (dHash) images
+    are kept, since they may be a different page, and only linked to the earlier capture.
+    Near matches are found through dHash bands, so a lookup never scans the whole index.
+    """
+
+    def __init__(self, root=SCREENSHOT_STORE, image_format='webp', quality=80, workers=None):
+        self.root = root
+        self.image_format = image_format
+        self.quality = quality
+        self.workers = workers or max(1, min(4, (os.cpu_count() or 2) - 1))
+        self.executor = None
+        self.pending = []
+        self.lock = threading.Lock()
+        self.stats = {'images': 0, 'unique': 0, 'duplicates': 0, 'near_duplicates': 0,
+                      'original_bytes': 0, 'stored_bytes': 0, 'encode_seconds': 0}
+        
+        Path(root).mkdir(parents=True, exist_ok=True)
+        self.index_path = os.path.join(root, 'index.json')
+        self.index = {}
+        try:
+            with open(self.index_path, 'r', encoding='utf-8') as f:
+                self.index = json.load(f)
+        except (OSError, ValueError):
+            pass
+        
+        self.buckets = {}
+        for key, entry in self.index.items():
+            self.bucket(key, entry['dhash'])
+
+    def submit(self, profile, path):
+        """Queue one capture for encoding (safe to call from the screenshot workers)"""
+        with self.lock:
+            if self.executor is None:
+                # Spawned workers: forking a process full of browser and scan threads is not safe
+                self.executor = concurrent.futures.ProcessPoolExecutor(
+                    max_workers=self.workers, mp_context=multiprocessing.get_context('spawn'))
+            future = self.executor.submit(store_screenshot, path, self.root, self.image_format, self.quality)
+            self.pending.append((profile, path, future))
+
+    def finish(self):
+        """Wait for the encoders, dedup their output in capture order and save the index"""
+        with self.lock:
+            pending, self.pending = self.pending, []
+        
+        for profile, path, future in pending:
+            try:
+                self.add(profile, path, future.result())
+            except Exception as e:
+                logging.error(f"Screenshot storage failed for {path}: {str(e)}")
+        
+        if self.executor:
+            self.executor.shutdown()
+            self.executor = None
+        self.save()
+        self.stats['encode_seconds'] = round(self.stats['encode_seconds'], 3)
+        return self.stats
+
+    @staticmethod
+    def bands(dhash):
+        width = -(-DHASH_SIZE * DHASH_SIZE // DHASH_BANDS)
+        return [(band, (dhash >> (band * width)) & ((1 << width) - 1)) for band in range(DHASH_BANDS)]
+
+    def bucket(self, key, dhash):
+        if dhash is not None:
+            for band in self.bands(dhash):
+                self.buckets.setdefault(band, []).append(key)
+
+    def similar(self, dhash):
+        """Earliest stored image perceptually near-identical to a dHash, checked only within its bands"""
+        if dhash is None:
+            return None
+        candidates = set()
+        for band in self.bands(dhash):
+            candidates.update(self.buckets.get(band, ()))
+        matches = [key for key in candidates if bin(self.index[key]['dhash'] ^ dhash).count('1') <= DHASH_DISTANCE]
+        return min(matches, key=lambda key: self.index[key]['first_seen']) if matches else None
+
+    def add(self, profile, path, result):
+        """Reference one encoded capture from its profile, sharing the stored file when the bytes match"""
+        self.stats['images'] += 1
+        self.stats['original_bytes'] += result['original_bytes']
+        self.stats['encode_seconds'] += result['seconds']
+        
+        key = result['sha256']
+        if key in self.index:
+            self.stats['duplicates'] += 1
+        else:
+            self.index[key] = {'file': result['file'], 'thumbnail': result['thumbnail'], 'dhash': result['dhash'],
+                               'bytes': result['stored_bytes'], 'first_seen': datetime.now().isoformat()}
+            
+            # Near-duplicate (cookie banner, login wall): keep the capture, record what it resembles
+            similar = self.similar(result['dhash'])
+            if similar:
+                self.index[key]['similar_to'] = similar
+                self.stats['near_duplicates'] += 1
+            self.bucket(key, result['dhash'])
+            self.stats['unique'] += 1
+            self.stats['stored_bytes'] += result['stored_bytes']
+        
+        entry = self.index[key]
+        profile['screenshot_ref'] = {'hash': key, 'file': entry['file'], 'thumbnail': entry['thumbnail']}
+        if entry.get('similar_to'):
+            profile['screenshot_ref']['similar_to'] = entry['similar_to']
+        
+        # The investigation folder keeps a hard link to the stored image instead of the raw PNG
+        local_path = f"{os.path.splitext(path)[0]}{os.path.splitext(entry['file'])[1]}"
+        try:
+            os.remove(path)
+            os.link(entry['file'], local_path)
+            profile['screenshot'] = local_path
+        except OSError:
+            profile['screenshot'] = entry['file']
+
+    def save(self):
+        try:
+            with open(f"{self.index_path}.tmp", 'w', encoding='utf-8') as f:
+                json.dump(self.index, f)
+            os.replace(f"{self.index_path}.tmp", self.index_path)
+        except OSError as e:
+            logging.warning(f"Could not save screenshot index: {str(e)}")
+
+class ScreenshotPool:
+    """Headless browsers capturing screenshots in parallel, one driver per worker thread
+    
+    A worker launches its browser when its first job arrives, so a scan that finds nothing
+    starts no Chrome at all. Until one browser has started, launches go one at a time; if a
+    launch fails (no Chrome, a mismatched driver) no further launch is attempted and the
+    remaining jobs are counted as failed.
+    """
+
+    def __init__(self, make_driver, capture, workers=3):
+        self.make_driver = make_driver
+        self.capture = capture
+        self.workers = max(1, workers)
+        self.accepting = True
+        self.jobs = queue.Queue()
+        self.threads = []
+        self.drivers = set()
+        self.lock = threading.Lock()
+        self.launch_lock = threading.Lock()
+        self.launched = False
+        self.launch_failed = False
+        self.started = None
+        self.stats = {'submitted': 0, 'captured': 0, 'failed': 0, 'restarts': 0, 'seconds': 0}
+
+    def start(self):
+        self.started = time.time()
+        for _ in range(self.workers):
+            thread = threading.Thread(target=self.worker, daemon=True)
+            thread.start()
+            self.threads.append(thread)
+
+    def submit(self, profile):
+        with self.lock:
+            self.stats['submitted'] += 1
+        self.jobs.put(profile)
+
+    def finish(self):
+        """Wait for every queued capture, then stop the workers and quit their browsers"""
+        self.accepting = False
+        for _ in self.threads:
+            self.jobs.put(None)
+        for thread in self.threads:
+            thread.join()
+        self.threads = []
+        
+        self.stats['seconds'] = round(time.time() - self.started, 2) if self.started else 0
+        self.stats['launch_failed'] = self.launch_failed
+        return self.stats
+
+    def close(self):
+        """Quit every browser still running (interrupted run)"""
+        with self.lock:
+            drivers = list(self.drivers)
+        for driver in drivers:
+            self.quit(driver)
+
+    def new_driver(self):
+        """Launch a browser, or None for good once a launch has failed"""
+        if self.launch_failed:
+            return None
+        if self.launched:
+            driver = self.make_driver()
+        else:
+            with self.launch_lock:
+                if self.launch_failed:
+                    return None
+                driver = self.make_driver()
+        
+        if not driver:
+            self.launch_failed = True
+            return None
+        self.launched = True
+        with self.lock:
+            self.drivers.add(driver)
+        return driver
+
+    def quit(self, driver):
+        if not driver:
+            return
+        with self.lock:
+            self.drivers.discard(driver)
+        try:
+            driver.quit()
+        except:
+            pass
+
+    @staticmethod
+    def alive(driver):
+        """Whether a driver's browser still answers (a crashed tab or killed Chrome does not)"""
+        try:
+            driver.execute_script('return 1')
+            return True
+        except:
+            return False
+
+    def worker(self):
+        driver = None
+        pages = 0
+        try:
+            while True:
+                profile = self.jobs.get()
+                if profile is None:
+                    return
+                
+                # Recycle long-lived browsers so their memory does not creep up
+                if driver and pages >= SCREENSHOT_RECYCLE_PAGES:
+                    self.quit(driver)
+                    driver, pages = None, 0
+                if driver is None:
+                    driver = self.new_driver()
+                
+                path = self.capture(driver, profile) if driver else None
+                pages += 1
+                if path is None and driver and not self.alive(driver):
+                    # Browser crashed; replace it and give the page one more try
+                    self.quit(driver)
+                    driver, pages = self.new_driver(), 0
+                    with self.lock:
+                        self.stats['restarts'] += 1
+                    path = self.capture(driver, profile) if driver else None
+                
+                with self.lock:
+                    self.stats['captured' if path else 'failed'] += 1
+        finally:
+            self.quit(driver)
+
+class Metrics:
+    """Counters, gauges and histograms kept in-process and rendered as OpenMetrics text
+    
+    An update is one dict operation under a lock, so the scan pays next to nothing whether
+    or not anything scrapes it. Families and help text come from METRIC_FAMILIES; label
+    sets appear on first use. Exposition is optional: an HTTP /metrics endpoint bound to
+    localhost, a textfile rewritten every METRICS_INTERVAL seconds (for node_exporter's
+    textfile collector), or both.
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.samples = {}
+        self.server = None
+        self.textfile = None
+        self.stopped = threading.Event()
+
+    def inc(self, name, amount=1, **labels):
+        key = (name, tuple(sorted(labels.items())))
+        with self.lock:
+            self.samples[key] = self.samples.get(key, 0) + amount
+
+    def observe(self, name, value, **labels):
+        """Add one observation to a histogram"""
+        buckets = METRIC_BUCKETS[name]
+        key = (name, tuple(sorted(labels.items())))
+        with self.lock:
+            histogram = self.samples.get(key)
+            if histogram is None:
+                # One count per bucket plus +Inf, then the running sum
+                histogram = self.samples[key] = [0] * (len(buckets) + 1) + [0.0]
+            histogram[bisect_left(buckets, value)] += 1
+            histogram[-1] += value
+
+    @staticmethod
+    def format_labels(labels):
+        if not labels:
+            return ''
+        parts = []
+        for name, value in labels:
+            value = str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+            parts.append(f'{name}="{value}"')
+        return '{' + ','.join(parts) + '}'
+
+    def render(self, openmetrics=True):
+        """Exposition text: OpenMetrics for scrapes, the classic Prometheus format for textfiles"""
+        with self.lock:
+            snapshot = {key: list(value) if isinstance(value, list) else value for key, value in self.samples.items()}
+        
+        lines = []
+        for name, (kind, help_text) in METRIC_FAMILIES.items():
+            series = sorted(((labels, value) for (family, labels), value in snapshot.items() if family == name),
+                            key=lambda item: item[0])
+            if not series:
+                continue
+            
+            family = f"{name}_total" if kind == 'counter' and not openmetrics else name
+            lines.append(f"# HELP {family} {help_text}")
+            lines.append(f"# TYPE {family} {kind}")
+            for labels, value in series:
+                if kind == 'counter':
+                    lines.append(f"{name}_total{self.format_labels(labels)} {value}")
+                elif kind == 'gauge':
+                    lines.append(f"{name}{self.format_labels(labels)} {value}")
+                else:
+                    cumulative = 0
+                    for bound, count in zip(METRIC_BUCKETS[name] + ('+Inf',), value[:-1]):
+                        cumulative += count
+                        bound = bound if bound == '+Inf' else float(bound)
+                        lines.append(f"{name}_bucket{self.format_labels(labels + (('le', bound),))} {cumulative}")
+                    lines.append(f"{name}_count{self.format_labels(labels)} {cumulative}")
+                    lines.append(f"{name}_sum{self.format_labels(labels)} {round(value[-1], 6)}")
+        
+        if openmetrics:
+            lines.append('# EOF')
+        return '\n'.join(lines) + '\n'
+
+    def start(self, port=None, textfile=None, interval=METRICS_INTERVAL):
+        """Start whichever exporters were asked for"""
+        if port:
+            self.server = ThreadingHTTPServer(('127.0.0.1', port), MetricsHandler)
+            self.server.daemon_threads = True
+            self.server.metrics = self
+            threading.Thread(target=self.server.serve_forever, daemon=True).start()
+            print(f"{Fore.CYAN}[*] Metrics: http://127.0.0.1:{self.server.server_port}/metrics{Style.RESET_ALL}")
+        
+        if textfile:
+            self.textfile = textfile
+            Path(textfile).parent.mkdir(parents=True, exist_ok=True)
+            threading.Thread(target=self.refresh_textfile, args=(interval,), daemon=True).start()
+
+    def write_textfile(self):
+        """Replace the textfile atomically so a collector never reads half of it"""
+        temp_path = f"{self.textfile}.{os.getpid()}.tmp"
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            f.write(self.render(openmetrics=False))
+        os.replace(temp_path, self.textfile)
+
+    def refresh_textfile(self, interval):
+        while True:
+            try:
+                self.write_textfile()
+            except OSError as e:
+                logging.warning(f"Metrics textfile not written: {str(e)}")
+            if self.stopped.wait(interval):
+                return
+
+    def close(self):
+        """Stop the exporters, leaving the final numbers in the textfile"""
+        self.stopped.set()
+        if self.server:
+            self.server.shutdown()
+            self.server.server_close()
+            self.server = None
+        if self.textfile:
+            try:
+                self.write_textfile()
+            except OSError as e:
+                logging.warning(f"Metrics textfile not written: {str(e)}")
+
+class MetricsHandler(BaseHTTPRequestHandler):
+    """Serves the owning server's Metrics at /metrics"""
+
+    def do_GET(self):
+        if self.path.split('?')[0] != '/metrics':
+            self.send_error(404)
+            return
+        body = self.server.metrics.render().encode('utf-8')
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/openmetrics-text; version=1.0.0; charset=utf-8')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+class PhaseProfiler:
+    """cProfile, tracemalloc and optional thread-stack sampling, kept separately per pipeline phase
+    
+    cProfile follows the main thread only, so work done in the scan's worker threads shows
+    up through the stack sampler instead. Wall and CPU time (all threads) and the traced
+    peak are added up per phase; a phase entered twice (tools start before the scan and
+    are collected after it) accumulates into one record.
+    """
+
+    def __init__(self, output_dir, sample_ms=0):
+        self.output_dir = output_dir
+        self.sample_interval = sample_ms / 1000 if sample_ms else 0
+        self.phases = {}
+        self.current = None
+        self.stopped = threading.Event()
+        self.sampler = None
+        self.files = []
+
+    def start(self):
+        tracemalloc.start()
+        if self.sample_interval:
+            self.sampler = threading.Thread(target=self.sample_stacks, daemon=True)
+            self.sampler.start()
+
+    def snapshot(self):
+        return tracemalloc.take_snapshot().filter_traces((
+            tracemalloc.Filter(False, tracemalloc.__file__),
+            tracemalloc.Filter(False, '<frozen importlib._bootstrap*>'),
+            tracemalloc.Filter(False, '<unknown>')
+        ))
+
+    @contextmanager
+    def phase(self, name):
+        """Profile the enclosed block as (part of) a phase"""
+        record = self.phases.setdefault(name, {
+            'profile': cProfile.Profile(), 'wall': 0.0, 'cpu': 0.0, 'peak': 0, 'growth': 0,
+            'allocations': {}, 'stacks': {}, 'samples': 0
+        })
+        before = self.snapshot()
+        # reset_peak is Python 3.9+; on 3.8 a phase's peak is the run's peak so far
+        if hasattr(tracemalloc, 'reset_peak'):
+            tracemalloc.reset_peak()
+        traced_before = tracemalloc.get_traced_memory()[0]
+        wall_started = time.perf_counter()
+        cpu_started = time.process_time()
+        self.current = record
+        record['profile'].enable()
+        try:
+            yield record
+        finally:
+            record['profile'].disable()
+            self.current = None
+            record['wall'] += time.perf_counter() - wall_started
+            record['cpu'] += time.process_time() - cpu_started
+            traced, peak = tracemalloc.get_traced_memory()
+            record['peak'] = max(record['peak'], peak)
+            record['growth'] += traced - traced_before
+            
+            for stat in self.snapshot().compare_to(before, 'lineno'):
+                site = str(stat.traceback[0])
+                size, count = record['allocations'].get(site, (0, 0))
+                record['allocations'][site] = (size + stat.size_diff, count + stat.count_diff)
+
+    def sample_stacks(self):
+        """Record every thread's stack each interval under the phase running at the time"""
+        own = threading.get_ident()
+        while not self.stopped.wait(self.sample_interval):
+            record = self.current
+            if record is None:
+                continue
+            names = {thread.ident: thread.name.rstrip('0123456789_-') for thread in threading.enumerate()}
+            for ident, frame in sys._current_frames().items():
+                if ident == own:
+                    continue
+                stack = []
+                while frame is not None:
+                    stack.append(f"{os.path.basename(frame.f_code.co_filename)}:{frame.f_code.co_name}")
+                    frame = frame.f_back
+                stack.append(names.get(ident, 'thread'))
+                key = ';'.join(reversed(stack))
+                record['stacks'][key] = record['stacks'].get(key, 0) + 1
+            record['samples'] += 1
+
+    def summary(self):
+        """Per-phase wall, CPU and memory figures in the order the phases first ran"""
+        return [{
+            'phase': name,
+            'wall_seconds': round(record['wall'], 3),
+            'cpu_seconds': round(record['cpu'], 3),
+            'peak_bytes': record['peak'],
+            'growth_bytes': record['growth'],
+            'samples': record['samples']
+        } for name, record in self.phases.items()]
+
+    def write(self):
+        """Stop profiling and write <phase>.prof, <phase>.allocations.txt and <phase>.stacks.txt"""
+        self.stopped.set()
+        if self.sampler:
+            self.sampler.join()
+        tracemalloc.stop()
+        
+        Path(self.output_dir).mkdir(parents=True, exist_ok=True)
+        for name, record in self.phases.items():
+            path = os.path.join(self.output_dir, f"{name}.prof")
+            record['profile'].dump_stats(path)
+            self.files.append(path)
+            
+            path = os.path.join(self.output_dir, f"{name}.allocations.txt")
+            top = sorted(record['allocations'].items(), key=lambda item: item[1][0], reverse=True)
+            with open(path, 'w', encoding='utf-8') as f:
+                f.write(f"Top {PROFILE_TOP_ALLOCATIONS} allocation sites still held at the end of the {name} phase\n\n")
+                for site, (size, count) in top[:PROFILE_TOP_ALLOCATIONS]:
+                    f.write(f"{format_bytes(size):>12} {count:>+9} blocks  {site}\n")
+            self.files.append(path)
+            
+            # Collapsed stacks, one "frame;frame;frame count" line each (flamegraph.pl / speedscope)
+            if record['stacks']:
+                path = os.path.join(self.output_dir, f"{name}.stacks.txt")
+                with open(path, 'w', encoding='utf-8') as f:
+                    for stack, count in sorted(record['stacks'].items()):
+                        f.write(f"{stack} {count}\n")
+                self.files.append(path)
+        
+        path = os.path.join(self.output_dir, 'phases.json')
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(self.summary(), f, indent=4)
+        self.files.append(path)
+
+class ScanContext:
+    """Resources shared by every investigation in a process (HTTP session, tool probe, rate-limit state)"""
+
+    def __init__(self, proxy=None, platform_file=None, site_packs=None, request_delay=0.3, domain_burst=1,
+                 domain_concurrency=4, pool_size=10, session_per_thread=False, http2=False, cache=True,
+                 cache_ttl=CACHE_TTL, cache_max_bytes=CACHE_MAX_BYTES, negative_ttl=NEGATIVE_TTL, adaptive=False,
+                 min_workers=2, max_workers=100, initial_workers=None, retries=RETRIES,
+                 breaker_threshold=BREAKER_THRESHOLD, metrics_port=None, metrics_file=None):
+        self.proxy = proxy
+        self.pool_size = max(10, pool_size)
+        self.session_per_thread = session_per_thread
+        self.request_delay = request_delay
+        self.domain_burst = domain_burst
+        self.domain_concurrency = domain_concurrency
+        
+        # Platform definitions compiled once for every username
+        self.registry = PlatformRegistry.load(platform_file, site_packs)
+        
+        # Use session for connection pooling
+        self.stats = ConnectionStats()
+        self.http2 = http2 and self.http2_available()
+        self.sessions = []
+        self.sessions_lock = threading.Lock()
+        self.local = threading.local()
+        self.session = self.make_session(self.pool_size)
+        
+        # Probed lazily by the first investigation that needs it
+        self.available_tools = None
+        
+        # Response cache shared by every username in the process
+        self.cache = None
+        self.negatives = None
+        if cache:
+            try:
+                self.cache = ResponseCache(CACHE_PATH, cache_ttl, cache_max_bytes)
+            except sqlite3.Error as e:
+                logging.warning(f"Response cache disabled: {str(e)}")
+            if negative_ttl > 0:
+                self.negatives = NegativeCache(NEGATIVE_CACHE_PATH, negative_ttl)
+        
+        # Per-domain rate limiting state
+        self.last_request_time = {}
+        self.rate_lock = threading.Lock()
+        self.scheduler = None
+        
+        # Adaptive concurrency starts at the configured worker count and moves within the bounds
+        self.controller = None
+        if adaptive:
+            self.controller = ConcurrencyController(initial=initial_workers or pool_size, min_limit=min_workers,
+                                                    max_limit=max_workers, domain_max=domain_concurrency)
+        
+        # Transient failures are retried; a group failing over and over is cut off for everyone
+        self.retries = max(0, retries)
+        self.breakers = CircuitBreakers(threshold=breaker_threshold)
+        
+        # Always counted; only exposed when a port or textfile is given
+        self.metrics = Metrics()
+        self.metrics.start(port=metrics_port, textfile=metrics_file)
+
+    @staticmethod
+    def http2_available():
+        try:
+            import httpx
+            import h2
+            return True
+        except ImportError:
+            print(f"{Fore.YELLOW}[!] httpx[http2] not installed, using HTTP/1.1{Style.RESET_ALL}")
+            return False
+
+    def make_session(self, pool_size):
+        """Session with one keep-alive pool per host, each sized for pool_size concurrent requests"""
+        session = requests.Session()
+        session.headers.update({
+            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
+            'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8',
+            'Accept-Language': 'en-US,en;q=0.5',
+            'DNT': '1',
+            'Connection': 'keep-alive',
+            'Upgrade-Insecure-Requests': '1'
+        })
+        if self.proxy:
+            session.proxies.update({'http': self.proxy, 'https': self.proxy})
+        
+        # Keep a pool for every registry host so none is evicted (and its connections dropped) mid-scan
+        adapter = TimedHTTPAdapter(pool_connections=len(self.registry.host_index) + 16, pool_maxsize=pool_size)
+        session.mount('http://', adapter)
+        session.mount('https://', adapter)
+        if self.http2:
+            session.mount('https://', Http2Adapter(self.stats, pool_size, self.proxy))
+        
+        with self.sessions_lock:
+            self.sessions.append(session)
+        return session
+
+    def get_session(self):
+        """The shared session, or this thread's own session with --session-per-thread"""
+        if not self.session_per_thread:
+            return self.session
+        
+        session = getattr(self.local, 'session', None)
+        if session is None:
+            # A thread only ever has one request in flight per host
+            session = self.make_session(1)
+            self.local.session = session
+        return session
+
+    def connection_stats(self):
+        """Requests, new connections and TLS handshakes across every session so far"""
+        stats = dict(self.stats.counts)
+        for session in list(self.sessions):
+            for adapter in set(session.adapters.values()):
+                if not isinstance(adapter, requests.adapters.HTTPAdapter):
+                    continue
+                managers = [adapter.poolmanager] + list(adapter.proxy_manager.values())
+                for manager in managers:
+                    for key in list(manager.pools.keys()):
+                        pool = manager.pools.get(key)
+                        if pool is None:
+                            continue
+                        stats['requests'] += pool.num_requests
+                        stats['connections'] += pool.num_connections
+                        if pool.scheme == 'https':
+                            stats['tls_handshakes'] += pool.num_connections
+        
+        stats['reused'] = max(0, stats['requests'] - stats['connections'])
+        stats['reuse_rate'] = round(stats['reused'] / stats['requests'], 3) if stats['requests'] else 0
+        stats['http2'] = self.http2
+        stats['pool_size'] = self.pool_size
+        return stats
+
+    def make_scheduler(self, request_delay):
+        """Scheduler allowing one request per request_delay seconds per group (burst permitting)"""
+        rate = 1 / request_delay if request_delay > 0 else None
+        self.scheduler = DomainScheduler(rate=rate, burst=self.domain_burst, max_concurrency=self.domain_concurrency,
+                                         controller=self.controller)
+        return self.scheduler
+
+    def close(self):
+        """Release pooled connections, the caches and the metrics exporters"""
+        self.metrics.close()
+        if self.cache:
+            self.cache.close()
+        if self.negatives is not None:
+            try:
+                self.negatives.save()
+            except OSError as e:
+                logging.warning(f"Negative cache not saved: {str(e)}")
+        for session in list(self.sessions):
+            try:
+                session.close()
+            except:
+                pass
+
 class WhoisUser:
-    def __init__(self, username, max_workers=15):
+    def __init__(self, username, max_workers=15, engine='threads', max_per_host=8, proxy=None,
+                 context=None, create_dirs=True, quiet=False, stream_bodies=True, max_body_bytes=512 * 1024,
+                 platform_file=None, site_packs=None, context_options=None, tool_workers=4, tool_timeout=300,
+                 check_emails=False, email_domains=None, email_variants=None, screenshot_workers=3,
+                 screenshot_memory_mb=512, pipeline_screenshots=True, screenshot_format='webp', screenshot_quality=80,
+                 profile=False, profile_sample_ms=0):
         self.username = username
         self.max_workers = max_workers
+        self.tool_workers = max(1, tool_workers)
+        self.tool_timeout = tool_timeout
+        self.screenshot_workers = max(1, screenshot_workers)
+        self.screenshot_memory_mb = screenshot_memory_mb
+        self.pipeline_screenshots = pipeline_screenshots
+        self.screenshot_format = screenshot_format
+        self.screenshot_quality = screenshot_quality
+        self.engine = engine
+        self.max_per_host = max_per_host
+        self.quiet = quiet
+        self.stream_bodies = stream_bodies
+        self.max_body_bytes = max_body_bytes
         self.timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
         self.output_dir = f"investigations/{username}_{self.timestamp}"
         self.images_dir = f"{self.output_dir}/screenshots"
         self.osint_dir = f"{self.output_dir}/osint_results"
         self.found_profiles = []
+        self.profile_index = {}
         self.failed_checks = []
         
+        # External tools merge from their own threads while the scan runs
+        self._profiles_lock = threading.RLock()
+        self.tool_processes = []
+        self.tool_futures = {}
+        self.tool_executor = None
+        self.tool_timings = {}
+        self.phase_timings = {}
+        
         # Create output directories
-        Path(self.output_dir).mkdir(parents=True, exist_ok=True)
-        Path(self.images_dir).mkdir(parents=True, exist_ok=True)
-        Path(self.osint_dir).mkdir(parents=True, exist_ok=True)
+        if create_dirs:
+            Path(self.output_dir).mkdir(parents=True, exist_ok=True)
+            Path(self.images_dir).mkdir(parents=True, exist_ok=True)
+            Path(self.osint_dir).mkdir(parents=True, exist_ok=True)
+        
+        # Shared session and rate-limit state (batch mode passes one context to every username)
+        self.owns_context = context is None
+        self.context = context or ScanContext(proxy=proxy, platform_file=platform_file, site_packs=site_packs,
+                                              pool_size=max_workers, **(context_options or {}))
+        self.proxy = self.context.proxy
+        self.session = self.context.session
+        self.registry = self.context.registry
         
         # Check for available OSINT tools
-        self.available_tools = self.check_osint_tools()
+        if self.context.available_tools is None:
+            self.context.available_tools = self.check_osint_tools()
+        self.available_tools = self.context.available_tools
         
         # Comprehensive platform list
         self.platforms = self.get_all_platforms()
         
-        # Use session for connection pooling
-        self.session = requests.Session()
-        self.session.headers.update({
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
-            'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8',
-            'Accept-Language': 'en-US,en;q=0.5',
-            'DNT': '1',
-            'Connection': 'keep-alive',
-            'Upgrade-Insecure-Requests': '1'
-        })
+        # Email accounts are checked in-process alongside the platforms
+        self.emails = self.registry.email_variants(username, email_domains, email_variants) if check_emails else []
+        self.email_checks = self.registry.build_email_checks(self.emails)
         
         # Rate limiting
-        self.request_delay = 0.3
-        self.last_request_time = {}
+        self.request_delay = self.context.request_delay
+        self.last_request_time = self.context.last_request_time
+        
+        # Streaming read statistics
+        self._stats_lock = threading.Lock()
+        self.body_stats = {'bytes_read': 0, 'bytes_saved': 0, 'early_verdicts': 0, 'capped': 0}
+        self.probe_stats = {'probes': 0, 'decided': 0, 'full_downloads': 0}
+        self.cache = self.context.cache
+        self.negatives = self.context.negatives
+        self.cache_stats = {'hits': 0, 'misses': 0, 'revalidated': 0, 'negative_hits': 0, 'negatives_recorded': 0}
+        self.stale_entries = {}
+        
+        # Retries of transient failures and checks skipped behind an open circuit breaker
+        self.retry_stats = {'retries': 0, 'retry_wait': 0.0, 'recovered': 0, 'gave_up': 0}
+        self.skipped_checks = []
+        
+        # Timing breakdown of every check that went to the network
+        self.check_timings = []
+        self.metrics = self.context.metrics
         
-        # Selenium driver cache
-        self.driver = None
+        # Screenshot browsers (located once, one driver per pool worker)
+        self.browser_paths = None
+        self._browser_lock = threading.Lock()
+        self.screenshot_pool = None
+        self.screenshot_stats = {}
+        self.screenshot_store = None
+        self.settle_times = None
+        self.settle_stats = {'settled': 0, 'ceiling_hits': 0, 'settle_seconds': 0}
         
-        # Register cleanup
-        atexit.register(self.cleanup)
+        # Per-phase profiles written to <output_dir>/profile (--profile)
+        self.profiler = PhaseProfiler(f"{self.output_dir}/profile", profile_sample_ms) if profile else None
+        
+        # Register cleanup (shared contexts are cleaned up by their owner)
+        if self.owns_context:
+            atexit.register(self.cleanup)
 
     def cleanup(self):
         """Cleanup resources on exit"""
-        try:
-            if self.driver:
-                self.driver.quit()
-                self.driver = None
-        except:
-            pass
+        # Kill external tools still running (interrupted run)
+        for process in self.tool_processes:
+            try:
+                if process.poll() is None:
+                    kill_tool(process)
+            except:
+                pass
+        if self.tool_executor:
+            # Cancel the queued tools by hand: shutdown(cancel_futures=True) needs Python 3.9
+            for future in self.tool_futures:
+                future.cancel()
+            self.tool_executor.shutdown(wait=False)
         
-        try:
-            if self.session:
-                self.session.close()
-        except:
-            pass
+        if self.screenshot_pool:
+            self.screenshot_pool.close()
+        
+        if self.owns_context:
+            self.context.close()
 
     def check_osint_tools(self):
         """Check which OSINT tools are available on the system"""
-        tools_to_check = ['sherlock', 'maigret', 'holehe', 'blackbird']
+        tools_to_check = ['sherlock', 'maigret', 'blackbird']
         tools = {}
         
         for tool in tools_to_check:
@@ -152,608 +2269,467 @@ class WhoisUser:
         return False
 
     def add_profile(self, profile_data):
-        """Add profile with duplicate checking"""
-        if not self.is_duplicate(profile_data['url'], self.found_profiles):
-            self.found_profiles.append(profile_data)
-            return True
-        else:
+        """Add profile with duplicate checking (safe to call from tool threads)"""
+        # Normalized once per insert; the index maps it straight to the profile already kept
+        key = self.normalize_url(profile_data['url'])
+        
+        with self._profiles_lock:
+            existing = self.profile_index.get(key)
+            if existing is None:
+                self.profile_index[key] = profile_data
+                self.found_profiles.append(profile_data)
+                
+                # Pipeline mode: confirmed direct hits go to the screenshot browsers right away
+                pool = self.screenshot_pool
+                if pool and pool.accepting and profile_data.get('source') == 'whoisuser' and profile_data.get('type') == 'profile':
+                    pool.submit(profile_data)
+                return True
+            
             # Update existing profile to show multiple sources
-            for existing in self.found_profiles:
-                if self.normalize_url(existing['url']) == self.normalize_url(profile_data['url']):
-                    # Add source if not already present
-                    if 'found_by' not in existing:
-                        existing['found_by'] = [existing['source']]
-                    if profile_data['source'] not in existing['found_by']:
-                        existing['found_by'].append(profile_data['source'])
-                    break
+            if 'found_by' not in existing:
+                existing['found_by'] = [existing['source']]
+            if profile_data['source'] not in existing['found_by']:
+                existing['found_by'].append(profile_data['source'])
             return False
 
     def get_all_platforms(self):
-        """Returns dictionary of all 100+ platforms to check"""
-        username = self.username
-        
-        platforms = {
-            # === MAJOR SOCIAL MEDIA ===
-            "Instagram": {
-                "url": f"https://www.instagram.com/{username}/",
-                "check_type": "standard"
-            },
-            "Twitter/X": {
-                "url": f"https://twitter.com/{username}",
-                "check_type": "standard"
-            },
-            "Facebook": {
-                "url": f"https://www.facebook.com/{username}",
-                "check_type": "redirect"
-            },
-            "LinkedIn": {
-                "url": f"https://www.linkedin.com/in/{username}",
-                "check_type": "standard"
-            },
-            "TikTok": {
-                "url": f"https://www.tiktok.com/@{username}",
-                "check_type": "standard"
-            },
-            "Snapchat": {
-                "url": f"https://www.snapchat.com/add/{username}",
-                "check_type": "standard"
-            },
-            "Reddit": {
-                "url": f"https://www.reddit.com/user/{username}",
-                "check_type": "json",
-                "api_url": f"https://www.reddit.com/user/{username}/about.json"
-            },
-            "Pinterest": {
-                "url": f"https://www.pinterest.com/{username}",
-                "check_type": "standard"
-            },
-            "Tumblr": {
-                "url": f"https://{username}.tumblr.com",
-                "check_type": "standard"
-            },
-            "Mastodon": {
-                "url": f"https://mastodon.social/@{username}",
-                "check_type": "standard"
-            },
-            
-            # === VIDEO PLATFORMS ===
-            "YouTube": {
-                "url": f"https://www.youtube.com/@{username}",
-                "check_type": "standard"
-            },
-            "Vimeo": {
-                "url": f"https://vimeo.com/{username}",
-                "check_type": "standard"
-            },
-            "Dailymotion": {
-                "url": f"https://www.dailymotion.com/{username}",
-                "check_type": "standard"
-            },
-            "Twitch": {
-                "url": f"https://www.twitch.tv/{username}",
-                "check_type": "standard"
-            },
-            "Rumble": {
-                "url": f"https://rumble.com/user/{username}",
-                "check_type": "standard"
-            },
-            "BitChute": {
-                "url": f"https://www.bitchute.com/channel/{username}",
-                "check_type": "standard"
-            },
-            
-            # === DEVELOPER PLATFORMS ===
-            "GitHub": {
-                "url": f"https://github.com/{username}",
-                "check_type": "standard",
-                "api_url": f"https://api.github.com/users/{username}"
-            },
-            "GitLab": {
-                "url": f"https://gitlab.com/{username}",
-                "check_type": "standard"
-            },
-            "Bitbucket": {
-                "url": f"https://bitbucket.org/{username}",
-                "check_type": "standard"
-            },
-            "StackOverflow": {
-                "url": f"https://stackoverflow.com/users/{username}",
-                "check_type": "search"
-            },
-            "HackerRank": {
-                "url": f"https://www.hackerrank.com/{username}",
-                "check_type": "standard"
-            },
-            "LeetCode": {
-                "url": f"https://leetcode.com/{username}",
-                "check_type": "standard"
-            },
-            "CodePen": {
-                "url": f"https://codepen.io/{username}",
-                "check_type": "standard"
-            },
-            "Repl.it": {
-                "url": f"https://replit.com/@{username}",
-                "check_type": "standard"
-            },
-            "Dev.to": {
-                "url": f"https://dev.to/{username}",
-                "check_type": "standard"
-            },
-            "Kaggle": {
-                "url": f"https://www.kaggle.com/{username}",
-                "check_type": "standard"
-            },
-            "HackerOne": {
-                "url": f"https://hackerone.com/{username}",
-                "check_type": "standard"
-            },
-            "CodeChef": {
-                "url": f"https://www.codechef.com/users/{username}",
-                "check_type": "standard"
-            },
-            
-            # === GAMING PLATFORMS ===
-            "Steam": {
-                "url": f"https://steamcommunity.com/id/{username}",
-                "check_type": "standard"
-            },
-            "Xbox": {
-                "url": f"https://xboxgamertag.com/search/{username}",
-                "check_type": "standard"
-            },
-            "PlayStation": {
-                "url": f"https://psnprofiles.com/{username}",
-                "check_type": "standard"
-            },
-            "Discord": {
-                "url": f"https://discord.com/users/{username}",
-                "check_type": "standard"
-            },
-            "Roblox": {
-                "url": f"https://www.roblox.com/users/profile?username={username}",
-                "check_type": "standard"
-            },
-            "Epic Games": {
-                "url": f"https://www.epicgames.com/site/en-US/profile/{username}",
-                "check_type": "standard"
-            },
-            "Fortnite": {
-                "url": f"https://fortnitetracker.com/profile/all/{username}",
-                "check_type": "standard"
-            },
-            "Minecraft": {
-                "url": f"https://namemc.com/profile/{username}",
-                "check_type": "standard"
-            },
-            
-            # === PROFESSIONAL NETWORKS ===
-            "AngelList": {
-                "url": f"https://angel.co/{username}",
-                "check_type": "standard"
-            },
-            "Behance": {
-                "url": f"https://www.behance.net/{username}",
-                "check_type": "standard"
-            },
-            "Dribbble": {
-                "url": f"https://dribbble.com/{username}",
-                "check_type": "standard"
-            },
-            "About.me": {
-                "url": f"https://about.me/{username}",
-                "check_type": "standard"
-            },
-            "Gravatar": {
-                "url": f"https://gravatar.com/{username}",
-                "check_type": "standard"
-            },
-            "ResearchGate": {
-                "url": f"https://www.researchgate.net/profile/{username}",
-                "check_type": "standard"
-            },
-            "Academia": {
-                "url": f"https://{username}.academia.edu/",
-                "check_type": "standard"
-            },
-            
-            # === MUSIC PLATFORMS ===
-            "Spotify": {
-                "url": f"https://open.spotify.com/user/{username}",
-                "check_type": "standard"
-            },
-            "SoundCloud": {
-                "url": f"https://soundcloud.com/{username}",
-                "check_type": "standard"
-            },
-            "Bandcamp": {
-                "url": f"https://{username}.bandcamp.com",
-                "check_type": "standard"
-            },
-            "Last.fm": {
-                "url": f"https://www.last.fm/user/{username}",
-                "check_type": "standard"
-            },
-            "Mixcloud": {
-                "url": f"https://www.mixcloud.com/{username}",
-                "check_type": "standard"
-            },
-            "Audiomack": {
-                "url": f"https://audiomack.com/{username}",
-                "check_type": "standard"
-            },
-            
-            # === FORUMS & COMMUNITIES ===
-            "HackerNews": {
-                "url": f"https://news.ycombinator.com/user?id={username}",
-                "check_type": "standard"
-            },
-            "ProductHunt": {
-                "url": f"https://www.producthunt.com/@{username}",
-                "check_type": "standard"
-            },
-            "Keybase": {
-                "url": f"https://keybase.io/{username}",
-                "check_type": "standard"
-            },
-            "Patreon": {
-                "url": f"https://www.patreon.com/{username}",
-                "check_type": "standard"
-            },
-            "Ko-fi": {
-                "url": f"https://ko-fi.com/{username}",
-                "check_type": "standard"
-            },
-            "BuyMeACoffee": {
-                "url": f"https://www.buymeacoffee.com/{username}",
-                "check_type": "standard"
-            },
-            
-            # === INTERNATIONAL SOCIAL MEDIA ===
-            "VK": {
-                "url": f"https://vk.com/{username}",
-                "check_type": "standard"
-            },
-            "OK.ru": {
-                "url": f"https://ok.ru/{username}",
-                "check_type": "standard"
-            },
-            "Weibo": {
-                "url": f"https://weibo.com/{username}",
-                "check_type": "standard"
-            },
-            "QQ": {
-                "url": f"https://user.qzone.qq.com/{username}",
-                "check_type": "standard"
-            },
-            "Douban": {
-                "url": f"https://www.douban.com/people/{username}",
-                "check_type": "standard"
-            },
-            
-            # === BUSINESS & E-COMMERCE ===
-            "Etsy": {
-                "url": f"https://www.etsy.com/shop/{username}",
-                "check_type": "standard"
-            },
-            "eBay": {
-                "url": f"https://www.ebay.com/usr/{username}",
-                "check_type": "standard"
-            },
-            "Fiverr": {
-                "url": f"https://www.fiverr.com/{username}",
-                "check_type": "standard"
-            },
-            "Upwork": {
-                "url": f"https://www.upwork.com/freelancers/~{username}",
-                "check_type": "standard"
-            },
-            "Freelancer": {
-                "url": f"https://www.freelancer.com/u/{username}",
-                "check_type": "standard"
-            },
-            "PeoplePerHour": {
-                "url": f"https://www.peopleperhour.com/freelancer/{username}",
-                "check_type": "standard"
-            },
-            
-            # === BLOGGING PLATFORMS ===
-            "WordPress": {
-                "url": f"https://{username}.wordpress.com",
-                "check_type": "standard"
-            },
-            "Blogger": {
-                "url": f"https://{username}.blogspot.com",
-                "check_type": "standard"
-            },
-            "Medium": {
-                "url": f"https://medium.com/@{username}",
-                "check_type": "standard"
-            },
-            "Ghost": {
-                "url": f"https://{username}.ghost.io",
-                "check_type": "standard"
-            },
-            "Substack": {
-                "url": f"https://{username}.substack.com",
-                "check_type": "standard"
-            },
-            
-            # === PHOTOGRAPHY ===
-            "Flickr": {
-                "url": f"https://www.flickr.com/people/{username}",
-                "check_type": "standard"
-            },
-            "500px": {
-                "url": f"https://500px.com/p/{username}",
-                "check_type": "standard"
-            },
-            "Unsplash": {
-                "url": f"https://unsplash.com/@{username}",
-                "check_type": "standard"
-            },
-            "VSCO": {
-                "url": f"https://vsco.co/{username}",
-                "check_type": "standard"
-            },
-            "DeviantArt": {
-                "url": f"https://www.deviantart.com/{username}",
-                "check_type": "standard"
-            },
-            "ArtStation": {
-                "url": f"https://www.artstation.com/{username}",
-                "check_type": "standard"
-            },
-            
-            # === MESSAGING & CHAT ===
-            "Telegram": {
-                "url": f"https://t.me/{username}",
-                "check_type": "standard"
-            },
-            "Signal": {
-                "url": f"https://signal.me/#p/{username}",
-                "check_type": "standard"
-            },
-            "Viber": {
-                "url": f"https://viber.com/{username}",
-                "check_type": "standard"
-            },
-            "Line": {
-                "url": f"https://line.me/ti/p/~{username}",
-                "check_type": "standard"
-            },
-            "Kik": {
-                "url": f"https://kik.me/{username}",
-                "check_type": "standard"
-            },
-            
-            # === DATING & ADULT PLATFORMS ===
-            "OnlyFans": {
-                "url": f"https://onlyfans.com/{username}",
-                "check_type": "standard"
-            },
-            "Pornhub": {
-                "url": f"https://www.pornhub.com/users/{username}",
-                "check_type": "standard"
-            },
-            "Chaturbate": {
-                "url": f"https://chaturbate.com/{username}",
-                "check_type": "standard"
-            },
-            "Fansly": {
-                "url": f"https://fansly.com/{username}",
-                "check_type": "standard"
-            },
-            "ManyVids": {
-                "url": f"https://www.manyvids.com/Profile/{username}",
-                "check_type": "standard"
-            },
-            "Clips4Sale": {
-                "url": f"https://www.clips4sale.com/studio/{username}",
-                "check_type": "standard"
-            },
-            "Tinder": {
-                "url": f"https://tinder.com/@{username}",
-                "check_type": "standard"
-            },
-            "Bumble": {
-                "url": f"https://bumble.com/{username}",
-                "check_type": "standard"
-            },
-            "Badoo": {
-                "url": f"https://badoo.com/{username}",
-                "check_type": "standard"
-            },
-            "Match": {
-                "url": f"https://www.match.com/profile/{username}",
-                "check_type": "standard"
-            },
-            "OkCupid": {
-                "url": f"https://www.okcupid.com/profile/{username}",
-                "check_type": "standard"
-            },
-            "Plenty of Fish": {
-                "url": f"https://www.pof.com/{username}",
-                "check_type": "standard"
-            },
-            "Adult Friend Finder": {
-                "url": f"https://adultfriendfinder.com/profile/{username}",
-                "check_type": "standard"
-            },
-            
-            # === MONEY & PAYMENT ===
-            "Linktree": {
-                "url": f"https://linktr.ee/{username}",
-                "check_type": "standard"
-            },
-            "Cash App": {
-                "url": f"https://cash.app/${username}",
-                "check_type": "standard"
-            },
-            "Venmo": {
-                "url": f"https://venmo.com/{username}",
-                "check_type": "standard"
-            },
-            "PayPal": {
-                "url": f"https://www.paypal.me/{username}",
-                "check_type": "standard"
-            },
-            "Bitcoin": {
-                "url": f"https://www.blockchain.com/btc/address/{username}",
-                "check_type": "standard"
-            },
-            
-            # === KNOWLEDGE & LEARNING ===
-            "Quora": {
-                "url": f"https://www.quora.com/profile/{username}",
-                "check_type": "standard"
-            },
-            "Duolingo": {
-                "url": f"https://www.duolingo.com/profile/{username}",
-                "check_type": "standard"
-            },
-            "Coursera": {
-                "url": f"https://www.coursera.org/user/{username}",
-                "check_type": "standard"
-            },
-            "Udemy": {
-                "url": f"https://www.udemy.com/user/{username}",
-                "check_type": "standard"
-            },
-            
-            # === ENTERTAINMENT & MEDIA ===
-            "Goodreads": {
-                "url": f"https://www.goodreads.com/{username}",
-                "check_type": "standard"
-            },
-            "Letterboxd": {
-                "url": f"https://letterboxd.com/{username}",
-                "check_type": "standard"
-            },
-            "MyAnimeList": {
-                "url": f"https://myanimelist.net/profile/{username}",
-                "check_type": "standard"
-            },
-            "AniList": {
-                "url": f"https://anilist.co/user/{username}",
-                "check_type": "standard"
-            },
-            "Crunchyroll": {
-                "url": f"https://www.crunchyroll.com/user/{username}",
-                "check_type": "standard"
-            },
-            "Wattpad": {
-                "url": f"https://www.wattpad.com/user/{username}",
-                "check_type": "standard"
-            },
-            "Archive of Our Own": {
-                "url": f"https://archiveofourown.org/users/{username}",
-                "check_type": "standard"
-            },
-            
-            # === SPORTS & FITNESS ===
-            "Strava": {
-                "url": f"https://www.strava.com/athletes/{username}",
-                "check_type": "standard"
-            },
-            "Chess.com": {
-                "url": f"https://www.chess.com/member/{username}",
-                "check_type": "standard"
-            },
-            "Lichess": {
-                "url": f"https://lichess.org/@/{username}",
-                "check_type": "standard"
-            },
-            "Untappd": {
-                "url": f"https://untappd.com/user/{username}",
-                "check_type": "standard"
-            },
-            "MyFitnessPal": {
-                "url": f"https://www.myfitnesspal.com/profile/{username}",
-                "check_type": "standard"
-            },
-        }
-        
-        return platforms
+        """Returns dictionary of all platforms to check, filled from the compiled registry"""
+        return self.registry.build(self.username)
 
     def rate_limit_domain(self, url):
-        """Implement per-domain rate limiting"""
+        """Per-domain rate limiting for requests not released by the scheduler (thread-safe)"""
         domain = urlparse(url).netloc
-        current_time = time.time()
         
-        if domain in self.last_request_time:
-            time_since_last = current_time - self.last_request_time[domain]
-            if time_since_last < self.request_delay:
-                time.sleep(self.request_delay - time_since_last)
+        # Reserve the next slot under the lock, then wait outside it
+        with self.context.rate_lock:
+            current_time = time.time()
+            next_slot = max(current_time, self.last_request_time.get(domain, 0) + self.request_delay)
+            self.last_request_time[domain] = next_slot
+        
+        if next_slot > current_time:
+            timing_add('rate_wait', next_slot - current_time)
+            time.sleep(next_slot - current_time)
+
+    def rate_limit_followup(self, url, platform_data, paced):
+        """Pace a further request of one check: a paced check pays another scheduler token for it"""
+        scheduler = self.context.scheduler
+        if not paced or scheduler is None:
+            self.rate_limit_domain(url)
+            return
+        wait = scheduler.charge(rate_group(url, platform_data))
+        if wait > 0:
+            timing_add('rate_wait', wait)
+            time.sleep(wait)
+
+    def observe(self, url, platform_data, outcome, latency=None):
+        """Report one request to the metrics and the adaptive concurrency controller (status code or failure kind)"""
+        group = rate_group(url, platform_data if isinstance(platform_data, dict) else None)
+        if latency is not None:
+            self.metrics.observe('whoisuser_request_seconds', latency, group=group)
+        
+        controller = self.context.controller
+        if controller is None:
+            return
         
-        self.last_request_time[domain] = time.time()
+        if isinstance(outcome, int):
+            outcome = 'throttled' if outcome in THROTTLE_STATUSES else 'ok'
+        controller.observe(group, outcome, latency)
 
-    def check_json_api(self, platform_name, platform_data):
+    def check_json_api(self, platform_name, platform_data, paced=False):
         """Check platforms with JSON API endpoints"""
         try:
             api_url = platform_data.get("api_url")
-            self.rate_limit_domain(api_url)
-            response = self.session.get(api_url, timeout=10)
-            
-            if response.status_code == 200:
-                data = response.json()
-                if data and 'error' not in data:
-                    print(f"{Fore.GREEN}[✓] {Fore.WHITE}{platform_name:<25} {Fore.CYAN}→ {platform_data['url']}{Style.RESET_ALL}")
-                    return {
-                        'platform': platform_name,
-                        'url': platform_data['url'],
-                        'api_url': api_url,
-                        'found_at': datetime.now().isoformat(),
-                        'source': 'whoisuser',
-                        'verified': True,
-                        'type': 'profile'
-                    }
+            if not paced:
+                self.rate_limit_domain(api_url)
+            response = self.context.get_session().get(api_url, timeout=10)
+            
+            data = response.json() if response.status_code == 200 else None
+            return self.evaluate_json_api(platform_name, platform_data, response.status_code, data)
         except Exception as e:
             logging.debug(f"API check failed for {platform_name}: {str(e)}")
         
         return None
 
+    def evaluate_json_api(self, platform_name, platform_data, status_code, data):
+        """Turn a JSON API response into a verified profile (shared by all engines)"""
+        if status_code == 200 and data and 'error' not in data:
+            if not self.quiet:
+                print(f"{Fore.GREEN}[✓] {Fore.WHITE}{platform_name:<25} {Fore.CYAN}→ {platform_data['url']}{Style.RESET_ALL}")
+            return {
+                'platform': platform_name,
+                'url': platform_data['url'],
+                'api_url': platform_data.get("api_url"),
+                'found_at': datetime.now().isoformat(),
+                'source': 'whoisuser',
+                'verified': True,
+                'type': 'profile'
+            }
+        
+        return None
+
     def is_valid_profile(self, url, content):
         """Enhanced platform-specific validation to reduce false positives"""
-        domain = urlparse(url).netloc.lower()
-        content_lower = content.lower()
+        entry = self.registry.lookup(url)
+        signatures = entry['signatures'] if entry else None
+        
+        # Default: assume valid if no specific check exists
+        if signatures is None:
+            return True
         
         # Platform-specific validation
-        if 'instagram.com' in domain:
-            return 'profilepage_' in content_lower or '"username":"' in content_lower
+        return bool(MATCHER.scan(content, signatures).signatures)
+
+    def platform_rules(self, platform_name, final_url):
+        """Allowed statuses and negatives of the checked platform, signatures of the host that answered"""
+        entry = self.registry.entries.get(platform_name)
+        host_entry = self.registry.lookup(final_url)
+        status_codes = entry['status_codes'] if entry else {200}
+        negatives = entry['not_found'] if entry else []
+        signatures = host_entry['signatures'] if host_entry else None
+        return status_codes, signatures, negatives
+
+    def needs_body(self, platform_name, status_code, final_url):
+        """Only an accepted status that did not land on a login wall needs its body inspected"""
+        status_codes, _, _ = self.platform_rules(platform_name, final_url)
+        return status_code in status_codes and not any(x in final_url.lower() for x in LOGIN_REDIRECT_MARKERS)
+
+    def body_limit(self, platform_data):
+        """Per-platform max bytes to read, falling back to the global cap"""
+        if isinstance(platform_data, dict) and platform_data.get('max_bytes'):
+            return platform_data['max_bytes']
+        return self.max_body_bytes
+
+    def record_body_read(self, scanner, wire_bytes, content_length):
+        """Track bytes read and bytes skipped thanks to early verdicts"""
+        timing_add('bytes', wire_bytes)
+        timing_add('parse', scanner.cpu_seconds)
+        with self._stats_lock:
+            self.body_stats['bytes_read'] += wire_bytes
+            if scanner.stop_reason:
+                self.body_stats['early_verdicts'] += 1
+            if scanner.stop_reason == 'capped':
+                self.body_stats['capped'] += 1
+            if content_length and str(content_length).isdigit():
+                self.body_stats['bytes_saved'] += max(0, int(content_length) - wire_bytes)
+
+    def read_body(self, response, platform_name, platform_data):
+        """Read just enough of a streamed requests response to reach a verdict; returns (text, hits)"""
+        if not self.stream_bodies:
+            timing_add('bytes', len(response.content))
+            return response.text, None
+        
+        if not self.needs_body(platform_name, response.status_code, response.url):
+            # Small error pages are drained so the connection goes back to the pool
+            content_length = int(response.headers.get('Content-Length') or BODY_DRAIN_LIMIT + 1)
+            if content_length <= BODY_DRAIN_LIMIT:
+                timing_add('bytes', len(response.content))
+            elif 'Content-Length' in response.headers:
+                with self._stats_lock:
+                    self.body_stats['bytes_saved'] += content_length
+            return '', None
         
-        elif 'github.com' in domain:
-            return 'data-hovercard-type="user"' in content_lower or '<meta name="user-login"' in content_lower
+        _, signatures, negatives = self.platform_rules(platform_name, response.url)
+        scanner = BodyScanner(response.encoding, self.body_limit(platform_data), signatures, negatives)
+        for chunk in response.iter_content(chunk_size=BODY_CHUNK_SIZE):
+            if scanner.feed(chunk):
+                break
         
-        elif 'twitter.com' in domain or 'x.com' in domain:
-            return '"screen_name"' in content_lower or 'data-testid="username"' in content_lower
+        self.record_body_read(scanner, response.raw.tell(), response.headers.get('Content-Length'))
+        return scanner.text, scanner.hits
+
+    async def read_body_async(self, response, platform_name, platform_data):
+        """Async counterpart of read_body for aiohttp responses"""
+        if not self.stream_bodies:
+            text = await response.text(errors='replace')
+            timing_add('bytes', len(await response.read()))
+            return text, None
         
-        elif 'linkedin.com' in domain:
-            return 'profile-view' in content_lower or 'com.linkedin.voyager' in content_lower
+        if not self.needs_body(platform_name, response.status, str(response.url)):
+            return '', None
         
-        elif 'reddit.com' in domain:
-            return 'data-author=' in content_lower or 'user-name' in content_lower
+        _, signatures, negatives = self.platform_rules(platform_name, str(response.url))
+        scanner = BodyScanner(response.charset, self.body_limit(platform_data), signatures, negatives)
+        async for chunk in response.content.iter_chunked(BODY_CHUNK_SIZE):
+            if scanner.feed(chunk):
+                break
         
-        elif 'youtube.com' in domain:
-            return 'channelid' in content_lower or '"author":' in content_lower
+        # aiohttp only exposes decoded bytes, so savings are only known for uncompressed bodies
+        content_length = None if response.headers.get('Content-Encoding') else response.headers.get('Content-Length')
+        self.record_body_read(scanner, scanner.bytes_read, content_length)
+        return scanner.text, scanner.hits
+
+    def cache_key(self, url):
+        """Normalized URL that keeps the query and fragment (some platforms carry the username there)"""
+        parsed = urlparse(url.strip())
+        key = self.normalize_url(url)
+        if parsed.query:
+            key += f"?{parsed.query}"
+        if parsed.fragment:
+            key += f"#{parsed.fragment}"
+        return key
+
+    def cache_ttl(self, platform_data):
+        """Per-platform cache lifetime, falling back to --cache-ttl"""
+        if isinstance(platform_data, dict) and platform_data.get('cache_ttl') is not None:
+            return platform_data['cache_ttl']
+        return self.cache.ttl
+
+    def cached_result(self, platform_name, platform_data):
+        """Answer a check from a fresh cache entry without touching the network; returns (hit, result)"""
+        started = time.perf_counter()
+        if self.negatives is not None and self.negatives.get(platform_name, self.username):
+            with self._stats_lock:
+                self.cache_stats['negative_hits'] += 1
+            self.metrics.inc('whoisuser_cache', result='negative_hit')
+            self.cache_timing(platform_name, started)
+            return True, None
         
-        elif 'tiktok.com' in domain:
-            return '"uniqueid":"' in content_lower or 'user-profile' in content_lower
+        # Email checks share one endpoint per service (often a POST), so only absences are cached
+        if not self.cache or not isinstance(platform_data, dict) or platform_data.get('check_type') == 'email':
+            return False, None
         
-        elif 'facebook.com' in domain:
-            return 'profile_id' in content_lower or 'entity_id' in content_lower
+        url = platform_data['url']
+        entry = self.cache.get(self.cache_key(url))
+        if entry is None or time.time() - entry['fetched_at'] >= self.cache_ttl(platform_data):
+            # An expired entry with validators is kept for the conditional request, so the check needs no second lookup
+            if entry and (entry['etag'] or entry['last_modified']):
+                self.stale_entries[url] = entry
+            with self._stats_lock:
+                self.cache_stats['misses'] += 1
+            self.metrics.inc('whoisuser_cache', result='miss')
+            return False, None
         
-        elif 'twitch.tv' in domain:
-            return '"login":"' in content_lower or 'channel-header' in content_lower
+        with self._stats_lock:
+            self.cache_stats['hits'] += 1
+        self.metrics.inc('whoisuser_cache', result='hit')
+        result = self.replay_cached(platform_name, entry)
+        self.cache_timing(platform_name, started)
+        return True, result
+
+    def cache_timing(self, platform_name, started):
+        """Timing record of a check answered by the response or negative cache"""
+        elapsed = time.perf_counter() - started
+        self.check_timings.append({'platform': platform_name, 'cache': elapsed, 'total': elapsed})
+
+    def replay_cached(self, platform_name, entry):
+        """Stored verdict of a cache entry, flagged as cached"""
+        result = entry['verdict']
+        if result:
+            result['cached'] = True
+            if not self.quiet:
+                print(f"{Fore.GREEN}[✓] {Fore.WHITE}{platform_name:<25} {Fore.CYAN}→ {result['url']} {Fore.WHITE}(cached){Style.RESET_ALL}")
+        return result
+
+    def stale_entry(self, url):
+        """Expired cache entry whose validators allow a conditional request, as found by cached_result, or None"""
+        return self.stale_entries.get(url)
+
+    def conditional_headers(self, entry):
+        """If-None-Match / If-Modified-Since headers for revalidating a cache entry"""
+        headers = {}
+        if entry and entry['etag']:
+            headers['If-None-Match'] = entry['etag']
+        if entry and entry['last_modified']:
+            headers['If-Modified-Since'] = entry['last_modified']
+        return headers
+
+    def revalidated(self, platform_name, url, entry):
+        """Server answered 304 Not Modified: refresh the entry and judge its stored body again"""
+        self.cache.touch(self.cache_key(url))
+        with self._stats_lock:
+            self.cache_stats['revalidated'] += 1
+        self.metrics.inc('whoisuser_cache', result='revalidated')
         
-        elif 'medium.com' in domain:
-            return '"username":"' in content_lower or 'profile-header' in content_lower
+        if entry['body'] is None:
+            return self.replay_cached(platform_name, entry)
+        return self.evaluate_response(platform_name, url, entry['status'], entry['final_url'], ResponseCache.text(entry))
+
+    def record_negative(self, platform_name, reason):
+        """Note a confirmed absence so later scans skip this platform for this username"""
+        self.metrics.inc('whoisuser_verdicts', reason=reason)
+        if self.negatives is None:
+            return
         
-        # Default: assume valid if no specific check exists
-        return True
+        self.negatives.add(platform_name, self.username, reason)
+        with self._stats_lock:
+            self.cache_stats['negatives_recorded'] += 1
+
+    def remember(self, platform_name, url, status_code, final_url, headers, text, result):
+        """Cache a decided check (never throttling, server errors or other transient answers)"""
+        if not self.cache:
+            return
+        
+        status_codes, _, _ = self.platform_rules(platform_name, final_url)
+        if status_code not in (404, 410) and status_code not in status_codes:
+            return
+        
+        try:
+            self.cache.put(self.cache_key(url), platform_name, status_code, final_url, headers, result, text)
+        except sqlite3.Error as e:
+            logging.warning(f"Cache write failed for {platform_name}: {str(e)}")
+
+    def probe_range(self, platform_data):
+        """Bytes requested by a ranged probe"""
+        if isinstance(platform_data, dict) and platform_data.get('probe_bytes'):
+            return platform_data['probe_bytes']
+        return PROBE_RANGE_BYTES
+
+    def probe_verdict(self, platform_name, url, status_code, final_url, scanner=None):
+        """Decide a check from a HEAD or ranged probe; returns (decided, result)"""
+        status_codes, _, _ = self.platform_rules(platform_name, final_url)
+        decided, result = False, None
+        
+        if status_code in (404, 410):
+            decided = True
+            self.record_negative(platform_name, f"http_{status_code}")
+        elif status_code in status_codes and any(x in final_url.lower() for x in LOGIN_REDIRECT_MARKERS):
+            decided = True
+        elif scanner is not None and (status_code == 206 or status_code in status_codes):
+            # A verdict inside the range (or the whole page fitting in it) needs no full download
+            if scanner.stop_reason != 'capped':
+                decided = True
+                status_code = 200 if status_code == 206 else status_code
+                result = self.evaluate_response(platform_name, url, status_code, final_url, scanner.text, scanner.hits)
+        
+        if decided:
+            self.remember(platform_name, url, status_code, final_url, None, scanner.text if scanner else None, result)
+        
+        with self._stats_lock:
+            self.probe_stats['probes'] += 1
+            if decided:
+                self.probe_stats['decided'] += 1
+            else:
+                self.probe_stats['full_downloads'] += 1
+        return decided, result
+
+    def probe_url(self, platform_name, platform_data, url, probe):
+        """HEAD or ranged GET first tier of check_url"""
+        session = self.context.get_session()
+        if probe == 'head':
+            response = session.head(url, timeout=10, allow_redirects=True)
+            response.close()
+            self.observe(url, platform_data, response.status_code, response.elapsed.total_seconds())
+            if response.status_code in RETRY_STATUSES:
+                raise RetryableStatus(response.status_code, retry_after_seconds(response.headers.get('Retry-After')))
+            return self.probe_verdict(platform_name, url, response.status_code, response.url)
+        
+        limit = self.probe_range(platform_data)
+        response = session.get(url, timeout=10, allow_redirects=True, stream=True,
+                               headers={'Range': f'bytes=0-{limit - 1}'})
+        self.observe(url, platform_data, response.status_code, response.elapsed.total_seconds())
+        if response.status_code in RETRY_STATUSES:
+            response.close()
+            raise RetryableStatus(response.status_code, retry_after_seconds(response.headers.get('Retry-After')))
+        started = time.perf_counter()
+        try:
+            # Read the whole (small) range so the connection goes back to the pool
+            _, signatures, negatives = self.platform_rules(platform_name, response.url)
+            scanner = BodyScanner(response.encoding, limit, signatures, negatives)
+            for chunk in response.iter_content(chunk_size=BODY_CHUNK_SIZE):
+                if scanner.feed(chunk) and scanner.stop_reason == 'capped':
+                    break
+        finally:
+            response.close()
+        
+        timing_add('transfer', time.perf_counter() - started)
+        timing_add('bytes', response.raw.tell())
+        timing_add('parse', scanner.cpu_seconds)
+        with self._stats_lock:
+            self.body_stats['bytes_read'] += response.raw.tell()
+        return self.probe_verdict(platform_name, url, response.status_code, response.url, scanner)
+
+    async def probe_url_async(self, http, platform_name, platform_data, url, probe):
+        """Async counterpart of probe_url"""
+        started = time.monotonic()
+        if probe == 'head':
+            async with http.head(url, allow_redirects=True, proxy=self.proxy) as response:
+                self.observe(url, platform_data, response.status, time.monotonic() - started)
+                if response.status in RETRY_STATUSES:
+                    raise RetryableStatus(response.status, retry_after_seconds(response.headers.get('Retry-After')))
+                return self.probe_verdict(platform_name, url, response.status, str(response.url))
+        
+        limit = self.probe_range(platform_data)
+        async with http.get(url, allow_redirects=True, proxy=self.proxy,
+                            headers={'Range': f'bytes=0-{limit - 1}'}) as response:
+            self.observe(url, platform_data, response.status, time.monotonic() - started)
+            if response.status in RETRY_STATUSES:
+                raise RetryableStatus(response.status, retry_after_seconds(response.headers.get('Retry-After')))
+            _, signatures, negatives = self.platform_rules(platform_name, str(response.url))
+            scanner = BodyScanner(response.charset, limit, signatures, negatives)
+            read_started = time.perf_counter()
+            async for chunk in response.content.iter_chunked(BODY_CHUNK_SIZE):
+                if scanner.feed(chunk) and scanner.stop_reason == 'capped':
+                    break
+            
+            timing_add('transfer', time.perf_counter() - read_started)
+            timing_add('bytes', scanner.bytes_read)
+            timing_add('parse', scanner.cpu_seconds)
+            with self._stats_lock:
+                self.body_stats['bytes_read'] += scanner.bytes_read
+            return self.probe_verdict(platform_name, url, response.status, str(response.url), scanner)
+
+    def evaluate_response(self, platform_name, url, status_code, final_url, text, hits=None):
+        """Decide whether a fetched page is a real profile (shared by all engines)"""
+        status_codes, signatures, negatives = self.platform_rules(platform_name, final_url)
+        
+        # Check status code (404 and 410 are definite absences, as in the probe and email checks)
+        if status_code in (404, 410):
+            self.record_negative(platform_name, f"http_{status_code}")
+            return None
+        
+        if status_code not in status_codes:
+            self.record_failure({
+                'platform': platform_name,
+                'url': url,
+                'status': status_code,
+                'reason': 'non-200 status'
+            })
+            return None
+        
+        # Check if redirected to login
+        if any(x in final_url.lower() for x in LOGIN_REDIRECT_MARKERS):
+            return None
+        
+        # One pass over the body for every marker (streamed reads arrive already scanned)
+        if hits is None:
+            hits = MATCHER.scan(text, signatures, negatives=negatives)
+        
+        # Check for not found patterns
+        if hits.not_found:
+            self.record_negative(platform_name, 'not_found_pattern')
+            return None
+        
+        # Check content length
+        if len(text.strip()) < MIN_PROFILE_BYTES:
+            return None
+        
+        # Platform-specific validation
+        if signatures is not None and not hits.signatures:
+            self.record_failure({
+                'platform': platform_name,
+                'url': url,
+                'reason': 'validation_failed'
+            })
+            return None
+        
+        # Profile found and validated
+        if not self.quiet:
+            print(f"{Fore.GREEN}[✓] {Fore.WHITE}{platform_name:<25} {Fore.CYAN}→ {url}{Style.RESET_ALL}")
+        profile = {
+            'platform': platform_name,
+            'url': url,
+            'status_code': status_code,
+            'found_at': datetime.now().isoformat(),
+            'source': 'whoisuser',
+            'content_length': len(text),
+            'type': 'profile'
+        }
+        if hits.login_wall:
+            profile['login_wall'] = sorted(hits.login_wall)
+        return profile
 
-    def check_url(self, platform_name, platform_data):
-        """Check if profile exists on platform with improved detection"""
+    def check_url(self, platform_name, platform_data, paced=False, queued=0, retry=None):
+        """Check if profile exists on platform (paced=True when the scheduler already spent a token)"""
         if isinstance(platform_data, str):
             url = platform_data
             check_type = "standard"
@@ -761,246 +2737,499 @@ class WhoisUser:
             url = platform_data.get("url")
             check_type = platform_data.get("check_type", "standard")
         
+        if check_type == "email":
+            attempt = lambda paced: self.check_email(platform_name, platform_data, paced=paced)
+        else:
+            attempt = lambda paced: self.fetch_url(platform_name, platform_data, url, check_type, paced=paced)
+        
+        timing, token = self.start_timing(platform_name, queued, retry)
+        result = None
         try:
-            # Check JSON API if available
-            if check_type == "json" and isinstance(platform_data, dict) and "api_url" in platform_data:
-                result = self.check_json_api(platform_name, platform_data)
-                if result:
-                    return result
-            
-            # Rate limiting
+            result = self.with_retries(platform_name, platform_data, url, attempt, paced=paced, retry=retry)
+            return result
+        finally:
+            self.finish_timing(timing, token, result)
+
+    def start_timing(self, platform_name, queued, retry=None):
+        """Make a timing record the current thread or task reports into (a retry resumes its own)"""
+        if retry is not None:
+            retry.timing['queue'] += queued
+            return retry.timing, CHECK_TIMING.set(retry.timing)
+        
+        self.metrics.inc('whoisuser_in_flight')
+        timing = {'platform': platform_name, 'queue': queued, 'started': time.perf_counter()}
+        return timing, CHECK_TIMING.set(timing)
+
+    def finish_timing(self, timing, token, result=None):
+        CHECK_TIMING.reset(token)
+        if isinstance(result, RetryLater):
+            # Still running: the record travels with the retry
+            result.timing = timing
+            return
+        
+        timing['total'] = time.perf_counter() - timing.pop('started')
+        self.check_timings.append(timing)
+        
+        self.metrics.inc('whoisuser_in_flight', -1)
+        self.metrics.inc('whoisuser_checks', engine=self.engine)
+        self.metrics.observe('whoisuser_check_seconds', timing['total'])
+        if result:
+            self.metrics.inc('whoisuser_verdicts', reason='found')
+
+    def timing_summary(self):
+        """Percentiles per phase and per platform, plus the slowest checks, for the reports"""
+        timings = list(self.check_timings)
+        phases = {}
+        for phase in TIMING_PHASES + ('bytes',):
+            values = [timing.get(phase, 0) for timing in timings]
+            phases[phase] = dict(percentiles(values), total=round(sum(values), 4))
+        
+        by_platform = {}
+        for timing in timings:
+            by_platform.setdefault(timing['platform'], []).append(timing['total'])
+        platforms = {platform: dict(percentiles(values), checks=len(values)) for platform, values in by_platform.items()}
+        
+        slowest = sorted(timings, key=lambda timing: timing['total'], reverse=True)[:TIMING_TOP_N]
+        return {
+            'checks': len(timings),
+            'phases': phases,
+            'platforms': platforms,
+            'slowest': [{key: round(value, 4) if isinstance(value, float) else value for key, value in timing.items()}
+                        for timing in slowest]
+        }
+
+    def fetch_url(self, platform_name, platform_data, url, check_type, paced=False):
+        """One attempt at a platform check; transient failures raise for with_retries"""
+        # Check JSON API if available
+        api_tried = check_type == "json" and isinstance(platform_data, dict) and "api_url" in platform_data
+        if api_tried:
+            result = self.check_json_api(platform_name, platform_data, paced=paced)
+            if result:
+                self.remember(platform_name, url, 200, url, None, None, result)
+                return result
+        
+        # Rate limiting (checks released by the scheduler already hold a token for their first request)
+        if not paced:
             self.rate_limit_domain(url)
-            
-            # Make request
-            response = self.session.get(url, timeout=10, allow_redirects=True)
-            
-            # Check status code
-            if response.status_code == 404:
-                return None
-            
-            if response.status_code != 200:
-                self.failed_checks.append({
-                    'platform': platform_name,
-                    'url': url,
-                    'status': response.status_code,
-                    'reason': 'non-200 status'
-                })
-                return None
-            
-            # Check if redirected to login
-            if any(x in response.url.lower() for x in ['login', 'signup', 'signin', 'register']):
-                return None
-            
-            # Check for not found patterns
-            content_lower = response.text.lower()
-            
-            not_found_patterns = [
-                "page not found", "user not found", "doesn't exist",
-                "not available", "profile not found",
-                "sorry, this page isn't available",
-                "the page you requested was not found",
-                "this account doesn't exist", "no such user",
-                "404 error", "404 not found", "account suspended",
-                "user does not exist", "profile unavailable",
-                "page doesn't exist", "couldn't find",
-                "account not found"
-            ]
-            
-            if any(pattern in content_lower for pattern in not_found_patterns):
-                return None
-            
-            # Check content length
-            if len(response.text.strip()) < 200:
+        elif api_tried:
+            self.rate_limit_followup(url, platform_data, paced)
+        
+        # A stale cache entry with validators turns the GET into a cheap conditional request
+        entry = self.stale_entry(url)
+        
+        # Cheap probe first; the full GET only runs when it cannot decide
+        probe = platform_data.get('probe', 'get') if isinstance(platform_data, dict) else 'get'
+        if probe != 'get' and entry is None:
+            decided, result = self.probe_url(platform_name, platform_data, url, probe)
+            if decided:
+                return result
+            self.rate_limit_followup(url, platform_data, paced)
+        
+        # Make request (streamed so the body can be abandoned once the verdict is known)
+        response = self.context.get_session().get(url, timeout=10, allow_redirects=True, stream=self.stream_bodies,
+                                                  headers=self.conditional_headers(entry))
+        self.observe(url, platform_data, response.status_code, response.elapsed.total_seconds())
+        try:
+            if response.status_code in RETRY_STATUSES:
+                raise RetryableStatus(response.status_code, retry_after_seconds(response.headers.get('Retry-After')))
+            # Only a retry would have needed the stale entry again
+            self.stale_entries.pop(url, None)
+            if response.status_code == 304 and entry:
+                return self.revalidated(platform_name, url, entry)
+            started = time.perf_counter()
+            text, hits = self.read_body(response, platform_name, platform_data)
+            timing_add('transfer', time.perf_counter() - started)
+        finally:
+            response.close()
+        
+        started = time.thread_time()
+        result = self.evaluate_response(platform_name, url, response.status_code, response.url, text, hits)
+        timing_add('parse', time.thread_time() - started)
+        self.remember(platform_name, url, response.status_code, response.url, response.headers, text, result)
+        return result
+
+    def breaker_allows(self, platform_name, url, key):
+        """False (and the check recorded as skipped) while the group's circuit breaker is open"""
+        if self.context.breakers.allow(key):
+            return True
+        self.metrics.inc('whoisuser_verdicts', reason='circuit_open')
+        self.skipped_checks.append({
+            'platform': platform_name,
+            'url': url,
+            'group': key,
+            'reason': 'circuit_open'
+        })
+        return False
+
+    def transient_failure(self, platform_name, platform_data, url, key, attempt, failure):
+        """Account one failed attempt; returns seconds to wait before retrying, or None to give up"""
+        if 'status' not in failure:
+            self.observe(url, platform_data, 'timeout' if failure['reason'] == 'timeout' else 'error')
+        
+        if self.context.breakers.failure(key):
+            self.metrics.inc('whoisuser_breaker_opened', group=key)
+            logging.warning(f"Circuit breaker opened for {key} after {self.context.breakers.threshold} failures in a row")
+            if not self.quiet:
+                print(f"{Fore.YELLOW}[!] {key} keeps failing, skipping its remaining checks{Style.RESET_ALL}")
+            return None
+        
+        # Waits longer than a whole check would take are not worth holding on to
+        retry_after = failure.get('retry_after')
+        if attempt >= self.context.retries or (retry_after is not None and retry_after > RETRY_AFTER_MAX):
+            return None
+        
+        delay = backoff_delay(attempt, retry_after)
+        with self._stats_lock:
+            self.retry_stats['retries'] += 1
+            self.retry_stats['retry_wait'] += delay
+        self.metrics.inc('whoisuser_retries', reason=failure['reason'])
+        logging.info(f"Retrying {platform_name} in {delay:.1f}s ({failure['reason']})")
+        return delay
+
+    def give_up(self, platform_name, url, key, failure, attempts, started):
+        """Record a check whose every attempt failed"""
+        self.context.breakers.gave_up(key, time.monotonic() - started)
+        with self._stats_lock:
+            self.retry_stats['gave_up'] += 1
+        
+        record = {'platform': platform_name, 'url': url, 'reason': failure['reason'], 'attempts': attempts}
+        if 'status' in failure:
+            record['status'] = failure['status']
+        self.record_failure(record)
+
+    def record_failure(self, record):
+        """Keep a failed check for the reports and count its reason"""
+        self.failed_checks.append(record)
+        self.metrics.inc('whoisuser_verdicts', reason=record['reason'])
+
+    def retry_summary(self):
+        """Retries spent and what the circuit breakers cut off, for the reports"""
+        breakers = self.context.breakers.summary()
+        return dict(self.retry_stats, retry_wait=round(self.retry_stats['retry_wait'], 2),
+                    skipped_checks=len(self.skipped_checks), open_groups=breakers['open_groups'],
+                    seconds_saved=breakers['seconds_saved'])
+
+    def recovered(self, key, attempt):
+        """A request got an answer: reset the group's breaker and count a successful retry"""
+        self.context.breakers.success(key)
+        if attempt:
+            with self._stats_lock:
+                self.retry_stats['recovered'] += 1
+
+    def with_retries(self, platform_name, platform_data, url, attempt, paced=False, retry=None):
+        """Run attempt(paced) behind the group's circuit breaker, retrying timeouts, connection errors and 429/5xx"""
+        key = rate_group(url, platform_data)
+        
+        # A retry handed back to the scheduler asks again, since the breaker may have opened meanwhile
+        if not self.breaker_allows(platform_name, url, key):
+            return None
+        tries, started = (retry.tries, retry.started) if retry is not None else (0, time.monotonic())
+        
+        while True:
+            try:
+                result = attempt(paced)
+            except requests.exceptions.Timeout:
+                logging.warning(f"Timeout checking {platform_name}")
+                failure = {'reason': 'timeout'}
+            except requests.exceptions.ConnectionError:
+                logging.warning(f"Connection error checking {platform_name}")
+                failure = {'reason': 'connection_error'}
+            except RetryableStatus as e:
+                failure = {'reason': 'non-200 status', 'status': e.status, 'retry_after': e.retry_after}
+            except Exception as e:
+                logging.error(f"Error checking {platform_name}: {str(e)}")
                 return None
+            else:
+                self.recovered(key, tries)
+                return result
             
-            # Platform-specific validation
-            if not self.is_valid_profile(response.url, response.text):
-                self.failed_checks.append({
-                    'platform': platform_name,
-                    'url': url,
-                    'reason': 'validation_failed'
-                })
-                return None
+            delay = self.transient_failure(platform_name, platform_data, url, key, tries, failure)
+            if delay is None:
+                break
+            timing_add('backoff', delay)
+            tries += 1
             
-            # Profile found and validated
-            print(f"{Fore.GREEN}[✓] {Fore.WHITE}{platform_name:<25} {Fore.CYAN}→ {url}{Style.RESET_ALL}")
-            return {
-                'platform': platform_name,
-                'url': url,
-                'status_code': response.status_code,
-                'found_at': datetime.now().isoformat(),
-                'source': 'whoisuser',
-                'content_length': len(response.text),
-                'type': 'profile'
-            }
+            # Scheduled checks wait in the scheduler and come back with a fresh rate-limit token
+            if paced:
+                return RetryLater(delay, tries, started)
+            time.sleep(delay)
+        
+        self.give_up(platform_name, url, key, failure, tries + 1, started)
+        return None
+
+    def check_email(self, check_name, check_data, paced=False):
+        """Ask one service whether an email address is registered (one attempt)"""
+        if not paced:
+            self.rate_limit_domain(check_data['url'])
+        response = self.context.get_session().request(check_data['method'], check_data['url'], data=check_data.get('form'),
+                                                      json=check_data.get('json'), timeout=10, allow_redirects=False)
+        self.observe(check_data['url'], check_data, response.status_code, response.elapsed.total_seconds())
+        if response.status_code in RETRY_STATUSES:
+            raise RetryableStatus(response.status_code, retry_after_seconds(response.headers.get('Retry-After')))
+        timing_add('bytes', len(response.content))
+        
+        started = time.thread_time()
+        result = self.evaluate_email(check_name, check_data, response.status_code, response.text)
+        timing_add('parse', time.thread_time() - started)
+        return result
+
+    async def check_email_async(self, http, check_name, check_data, paced=False):
+        """Async counterpart of check_email"""
+        if not paced:
+            await self.rate_limit_domain_async(check_data['url'])
+        started = time.monotonic()
+        async with http.request(check_data['method'], check_data['url'], data=check_data.get('form'),
+                                json=check_data.get('json'), allow_redirects=False, proxy=self.proxy) as response:
+            self.observe(check_data['url'], check_data, response.status, time.monotonic() - started)
+            if response.status in RETRY_STATUSES:
+                raise RetryableStatus(response.status, retry_after_seconds(response.headers.get('Retry-After')))
+            read_started = time.perf_counter()
+            text = await response.text(errors='ignore')
+            timing_add('transfer', time.perf_counter() - read_started)
+            timing_add('bytes', len(await response.read()))
             
-        except requests.exceptions.Timeout:
-            logging.warning(f"Timeout checking {platform_name}")
-            self.failed_checks.append({
-                'platform': platform_name,
-                'url': url,
-                'reason': 'timeout'
-            })
-        except requests.exceptions.ConnectionError:
-            logging.warning(f"Connection error checking {platform_name}")
+            started = time.thread_time()
+            result = self.evaluate_email(check_name, check_data, response.status, text)
+            timing_add('parse', time.thread_time() - started)
+            return result
+
+    def evaluate_email(self, check_name, check_data, status_code, text):
+        """Turn a service's answer into an email account record (shared by all engines)"""
+        service = self.registry.email_services[check_data['service']]
+        content = text.lower()
+        
+        answered = status_code in service['status_codes']
+        denied = any(marker in content for marker in service['not_registered'])
+        registered = answered and not denied and (not service['registered'] or
+                                                  any(marker in content for marker in service['registered']))
+        
+        if not registered:
+            # Only a definite answer is remembered; throttling and errors are retried next scan
+            if status_code in (404, 410):
+                self.record_negative(check_name, f"http_{status_code}")
+            elif answered or denied:
+                self.record_negative(check_name, 'not_found_pattern')
+            return None
+        
+        if not self.quiet:
+            print(f"{Fore.GREEN}[✓] {Fore.WHITE}{check_name:<25} {Fore.CYAN}→ registered{Style.RESET_ALL}")
+        return {
+            'platform': f"{service['name']} (Email)",
+            'url': check_data['account_url'],
+            'email': check_data['email'],
+            'service': service['name'],
+            'found_at': datetime.now().isoformat(),
+            'source': 'email',
+            'verified': True,
+            'type': 'email'
+        }
+
+    async def rate_limit_domain_async(self, url):
+        """Per-domain rate limiting for the async engine (awaits instead of blocking)"""
+        domain = urlparse(url).netloc
+        with self.context.rate_lock:
+            current_time = time.time()
+            next_slot = max(current_time, self.last_request_time.get(domain, 0) + self.request_delay)
+            self.last_request_time[domain] = next_slot
+        
+        if next_slot > current_time:
+            timing_add('rate_wait', next_slot - current_time)
+            await asyncio.sleep(next_slot - current_time)
+
+    async def rate_limit_followup_async(self, url, platform_data, paced):
+        """Async counterpart of rate_limit_followup"""
+        scheduler = self.context.scheduler
+        if not paced or scheduler is None:
+            await self.rate_limit_domain_async(url)
+            return
+        wait = scheduler.charge(rate_group(url, platform_data))
+        if wait > 0:
+            timing_add('rate_wait', wait)
+            await asyncio.sleep(wait)
+
+    async def check_json_api_async(self, http, platform_name, platform_data, paced=False):
+        """Async counterpart of check_json_api"""
+        try:
+            api_url = platform_data.get("api_url")
+            if not paced:
+                await self.rate_limit_domain_async(api_url)
+            async with http.get(api_url, proxy=self.proxy) as response:
+                data = await response.json(content_type=None) if response.status == 200 else None
+                return self.evaluate_json_api(platform_name, platform_data, response.status, data)
+        except asyncio.CancelledError:
+            raise
         except Exception as e:
-            logging.error(f"Error checking {platform_name}: {str(e)}")
+            logging.debug(f"API check failed for {platform_name}: {str(e)}")
+        
+        return None
+
+    async def check_url_async(self, http, platform_name, platform_data, paced=False, queued=0, retry=None):
+        """Async counterpart of check_url, producing identical verdicts"""
+        if isinstance(platform_data, str):
+            url = platform_data
+            check_type = "standard"
+        else:
+            url = platform_data.get("url")
+            check_type = platform_data.get("check_type", "standard")
+        
+        if check_type == "email":
+            attempt = lambda paced: self.check_email_async(http, platform_name, platform_data, paced=paced)
+        else:
+            attempt = lambda paced: self.fetch_url_async(http, platform_name, platform_data, url, check_type, paced=paced)
         
-        return None
+        # Each task runs in its own context, so concurrent checks never share a record
+        timing, token = self.start_timing(platform_name, queued, retry)
+        result = None
+        try:
+            result = await self.with_retries_async(platform_name, platform_data, url, attempt, paced=paced, retry=retry)
+            return result
+        finally:
+            self.finish_timing(timing, token, result)
 
-    def parse_sherlock_results(self, output_file):
-        """Parse Sherlock output and extract profiles"""
-        profiles = []
+    async def fetch_url_async(self, http, platform_name, platform_data, url, check_type, paced=False):
+        """Async counterpart of fetch_url"""
+        # Check JSON API if available
+        api_tried = check_type == "json" and isinstance(platform_data, dict) and "api_url" in platform_data
+        if api_tried:
+            result = await self.check_json_api_async(http, platform_name, platform_data, paced=paced)
+            if result:
+                self.remember(platform_name, url, 200, url, None, None, result)
+                return result
         
-        try:
-            if not os.path.exists(output_file):
-                return profiles
-            
-            with open(output_file, 'r', encoding='utf-8', errors='ignore') as f:
-                content = f.read()
-                
-                # Extract URLs from Sherlock output
-                for line in content.split('\n'):
-                    if 'http' in line.lower():
-                        # Extract URL from line
-                        parts = line.split('http')
-                        if len(parts) >= 2:
-                            url = 'http' + parts[1].strip()
-                            
-                            # Clean URL (remove trailing characters)
-                            url = re.split(r'[\s\)]', url)[0]
-                            
-                            # Extract platform name
-                            domain = urlparse(url).netloc.replace('www.', '').split('.')[0].title()
-                            
-                            profiles.append({
-                                'platform': f"{domain} (Sherlock)",
-                                'url': url,
-                                'source': 'sherlock',
-                                'found_at': datetime.now().isoformat(),
-                                'type': 'profile'
-                            })
-            
-            print(f"{Fore.GREEN}[✓] Parsed Sherlock: {len(profiles)} profiles{Style.RESET_ALL}")
-        except Exception as e:
-            print(f"{Fore.RED}[✗] Sherlock parsing error: {str(e)[:50]}{Style.RESET_ALL}")
-            logging.error(f"Sherlock parsing failed: {str(e)}")
+        # Rate limiting (checks released by the scheduler already hold a token for their first request)
+        if not paced:
+            await self.rate_limit_domain_async(url)
+        elif api_tried:
+            await self.rate_limit_followup_async(url, platform_data, paced)
         
-        return profiles
+        entry = self.stale_entry(url)
+        
+        # Cheap probe first; the full GET only runs when it cannot decide
+        probe = platform_data.get('probe', 'get') if isinstance(platform_data, dict) else 'get'
+        if probe != 'get' and entry is None:
+            decided, result = await self.probe_url_async(http, platform_name, platform_data, url, probe)
+            if decided:
+                return result
+            await self.rate_limit_followup_async(url, platform_data, paced)
+        
+        # Make request
+        started = time.monotonic()
+        async with http.get(url, allow_redirects=True, proxy=self.proxy,
+                            headers=self.conditional_headers(entry)) as response:
+            self.observe(url, platform_data, response.status, time.monotonic() - started)
+            if response.status in RETRY_STATUSES:
+                raise RetryableStatus(response.status, retry_after_seconds(response.headers.get('Retry-After')))
+            self.stale_entries.pop(url, None)
+            if response.status == 304 and entry:
+                return self.revalidated(platform_name, url, entry)
+            started = time.perf_counter()
+            text, hits = await self.read_body_async(response, platform_name, platform_data)
+            timing_add('transfer', time.perf_counter() - started)
+            
+            started = time.thread_time()
+            result = self.evaluate_response(platform_name, url, response.status, str(response.url), text, hits)
+            timing_add('parse', time.thread_time() - started)
+            self.remember(platform_name, url, response.status, str(response.url), response.headers, text, result)
+            return result
 
-    def parse_maigret_results(self, output_dir):
-        """Parse Maigret output and extract profiles"""
-        profiles = []
+    async def with_retries_async(self, platform_name, platform_data, url, attempt, paced=False, retry=None):
+        """Async counterpart of with_retries"""
+        import aiohttp
         
-        try:
-            maigret_dir = os.path.join(output_dir, self.username)
-            if not os.path.exists(maigret_dir):
-                return profiles
-            
-            # Try to find and parse TXT report
-            txt_file = os.path.join(maigret_dir, 'report.txt')
-            if os.path.exists(txt_file):
-                with open(txt_file, 'r', encoding='utf-8', errors='ignore') as f:
-                    content = f.read()
-                    
-                    # Extract URLs
-                    urls = re.findall(r'https?://[^\s<>"]+', content)
-                    for url in urls:
-                        # Clean URL
-                        url = url.rstrip('.,;:)')
-                        
-                        domain = urlparse(url).netloc.replace('www.', '').split('.')[0].title()
-                        
-                        profiles.append({
-                            'platform': f"{domain} (Maigret)",
-                            'url': url,
-                            'source': 'maigret',
-                            'found_at': datetime.now().isoformat(),
-                            'type': 'profile'
-                        })
-            
-            print(f"{Fore.GREEN}[✓] Parsed Maigret: {len(profiles)} profiles{Style.RESET_ALL}")
-        except Exception as e:
-            print(f"{Fore.RED}[✗] Maigret parsing error: {str(e)[:50]}{Style.RESET_ALL}")
-            logging.error(f"Maigret parsing failed: {str(e)}")
+        key = rate_group(url, platform_data)
         
-        return profiles
+        # A retry handed back to the scheduler asks again, since the breaker may have opened meanwhile
+        if not self.breaker_allows(platform_name, url, key):
+            return None
+        tries, started = (retry.tries, retry.started) if retry is not None else (0, time.monotonic())
+        
+        while True:
+            try:
+                result = await attempt(paced)
+            except asyncio.CancelledError:
+                raise
+            except asyncio.TimeoutError:
+                logging.warning(f"Timeout checking {platform_name}")
+                failure = {'reason': 'timeout'}
+            except aiohttp.ClientError:
+                # Proxy, payload and protocol errors too, as requests reports them as ConnectionError
+                logging.warning(f"Connection error checking {platform_name}")
+                failure = {'reason': 'connection_error'}
+            except RetryableStatus as e:
+                failure = {'reason': 'non-200 status', 'status': e.status, 'retry_after': e.retry_after}
+            except Exception as e:
+                logging.error(f"Error checking {platform_name}: {str(e)}")
+                return None
+            else:
+                self.recovered(key, tries)
+                return result
+            
+            delay = self.transient_failure(platform_name, platform_data, url, key, tries, failure)
+            if delay is None:
+                break
+            timing_add('backoff', delay)
+            tries += 1
+            if paced:
+                return RetryLater(delay, tries, started)
+            await asyncio.sleep(delay)
+        
+        self.give_up(platform_name, url, key, failure, tries + 1, started)
+        return None
 
-    def parse_holehe_results(self, output_files):
-        """Parse Holehe output and extract confirmed accounts"""
-        profiles = []
+    def parse_sherlock_line(self, line):
+        """Profiles on one line of Sherlock output"""
+        line = ANSI_ESCAPE.sub('', line)
+        if 'http' not in line.lower():
+            return []
         
-        try:
-            for output_file in output_files:
-                if not os.path.exists(output_file):
-                    continue
-                
-                with open(output_file, 'r', encoding='utf-8', errors='ignore') as f:
-                    content = f.read()
-                    
-                    # Extract email from filename
-                    email = os.path.basename(output_file).replace('holehe_', '').replace('.txt', '').replace('_at_', '@')
-                    
-                    # Look for confirmed services
-                    lines = content.split('\n')
-                    for line in lines:
-                        # Holehe shows [+] for found accounts
-                        if '[+]' in line or 'found' in line.lower():
-                            # Extract service name
-                            service_match = re.search(r'(\w+).*?(?:\[|\(|found|exists)', line, re.IGNORECASE)
-                            if service_match:
-                                service = service_match.group(1).title()
-                                
-                                profiles.append({
-                                    'platform': f"{service} (Email)",
-                                    'url': f"Email account found: {email}",
-                                    'source': 'holehe',
-                                    'found_at': datetime.now().isoformat(),
-                                    'type': 'email',
-                                    'email': email
-                                })
-            
-            print(f"{Fore.GREEN}[✓] Parsed Holehe: {len(profiles)} accounts{Style.RESET_ALL}")
-        except Exception as e:
-            print(f"{Fore.RED}[✗] Holehe parsing error: {str(e)[:50]}{Style.RESET_ALL}")
-            logging.error(f"Holehe parsing failed: {str(e)}")
+        # Extract URL from line
+        parts = line.split('http')
+        if len(parts) < 2:
+            return []
+        url = 'http' + parts[1].strip()
         
-        return profiles
+        # Clean URL (remove trailing characters)
+        url = re.split(r'[\s\)]', url)[0]
+        
+        # Extract platform name
+        domain = urlparse(url).netloc.replace('www.', '').split('.')[0].title()
+        
+        return [{
+            'platform': f"{domain} (Sherlock)",
+            'url': url,
+            'source': 'sherlock',
+            'found_at': datetime.now().isoformat(),
+            'type': 'profile'
+        }]
 
-    def parse_blackbird_results(self, output_file):
-        """Parse Blackbird output and extract profiles"""
+    def parse_url_line(self, line, source, label):
+        """Profiles for every URL on one line of Maigret or Blackbird output"""
         profiles = []
-        
-        try:
-            if not os.path.exists(output_file):
-                return profiles
+        for url in re.findall(r'https?://[^\s<>"]+', ANSI_ESCAPE.sub('', line)):
+            # Clean URL
+            url = url.rstrip('.,;:)')
             
-            with open(output_file, 'r', encoding='utf-8', errors='ignore') as f:
-                content = f.read()
-                
-                # Extract URLs
-                urls = re.findall(r'https?://[^\s<>"]+', content)
-                for url in urls:
-                    # Clean URL
-                    url = url.rstrip('.,;:)')
-                    
-                    domain = urlparse(url).netloc.replace('www.', '').split('.')[0].title()
-                    
-                    profiles.append({
-                        'platform': f"{domain} (Blackbird)",
-                        'url': url,
-                        'source': 'blackbird',
-                        'found_at': datetime.now().isoformat(),
-                        'type': 'profile'
-                    })
-            
-            print(f"{Fore.GREEN}[✓] Parsed Blackbird: {len(profiles)} profiles{Style.RESET_ALL}")
-        except Exception as e:
-            print(f"{Fore.RED}[✗] Blackbird parsing error: {str(e)[:50]}{Style.RESET_ALL}")
-            logging.error(f"Blackbird parsing failed: {str(e)}")
-        
+            domain = urlparse(url).netloc.replace('www.', '').split('.')[0].title()
+            
+            profiles.append({
+                'platform': f"{domain} ({label})",
+                'url': url,
+                'source': source,
+                'found_at': datetime.now().isoformat(),
+                'type': 'profile'
+            })
         return profiles
 
+    def parse_maigret_line(self, line):
+        """Profiles on one line of Maigret's console output (only claimed '[+]' sites)"""
+        # Maigret colors the '+' when it thinks it is writing to a terminal
+        if '[+]' not in ANSI_ESCAPE.sub('', line):
+            return []
+        return self.parse_url_line(line, 'maigret', 'Maigret')
+
+    def parse_blackbird_line(self, line):
+        return self.parse_url_line(line, 'blackbird', 'Blackbird')
+
     def merge_all_results(self):
         """Merge all results from different sources and remove duplicates"""
         print(f"\n{Fore.YELLOW}[*] Merging results from all sources...{Style.RESET_ALL}\n")
@@ -1021,29 +3250,12 @@ class WhoisUser:
         print(f"    Initial WhoisUser: {initial_count}")
         print(f"    After deduplication: {len(self.found_profiles)}")
 
-    def setup_selenium_driver(self):
-        """Setup Selenium WebDriver ONCE and reuse"""
-        if self.driver:
-            return self.driver
-        
-        try:
-            from selenium import webdriver
-            from selenium.webdriver.chrome.options import Options
-            from selenium.webdriver.chrome.service import Service
-            
-            print(f"{Fore.CYAN}[*] Setting up ChromeDriver (one-time setup)...{Style.RESET_ALL}")
-            
-            chrome_options = Options()
-            chrome_options.add_argument('--headless')
-            chrome_options.add_argument('--no-sandbox')
-            chrome_options.add_argument('--disable-dev-shm-usage')
-            chrome_options.add_argument('--disable-gpu')
-            chrome_options.add_argument('--window-size=1920,1080')
-            chrome_options.add_argument('--disable-blink-features=AutomationControlled')
-            chrome_options.add_argument(f'user-agent={self.session.headers["User-Agent"]}')
-            chrome_options.add_argument('--disable-software-rasterizer')
-            chrome_options.add_argument('--log-level=3')
-            chrome_options.add_experimental_option('excludeSwitches', ['enable-logging'])
+    def find_browser(self):
+        """Locate Chrome and a ChromeDriver service once; returns (binary, driver_path) or None"""
+        with self._browser_lock:
+            if self.browser_paths is not None:
+                return self.browser_paths or None
+            self.browser_paths = ()
             
             # Find Chrome/Chromium binary
             chrome_binary_paths = [
@@ -1054,17 +3266,11 @@ class WhoisUser:
                 '/snap/bin/chromium',
             ]
             
-            chrome_found = False
-            for chrome_path in chrome_binary_paths:
-                if os.path.exists(chrome_path):
-                    chrome_options.binary_location = chrome_path
-                    chrome_found = True
-                    print(f"{Fore.GREEN}[✓] Found Chrome: {chrome_path}{Style.RESET_ALL}")
-                    break
-            
-            if not chrome_found:
+            chrome_binary = next((path for path in chrome_binary_paths if os.path.exists(path)), None)
+            if not chrome_binary:
                 print(f"{Fore.RED}[✗] Chrome/Chromium not found{Style.RESET_ALL}")
                 return None
+            print(f"{Fore.GREEN}[✓] Found Chrome: {chrome_binary}{Style.RESET_ALL}")
             
             # Find ChromeDriver
             chromedriver_paths = [
@@ -1073,31 +3279,57 @@ class WhoisUser:
                 shutil.which('chromedriver'),
             ]
             
-            driver_path = None
-            for path in chromedriver_paths:
-                if path and os.path.exists(path):
-                    driver_path = path
-                    print(f"{Fore.GREEN}[✓] Using ChromeDriver: {driver_path}{Style.RESET_ALL}")
-                    break
-            
+            driver_path = next((path for path in chromedriver_paths if path and os.path.exists(path)), None)
             if driver_path:
-                service = Service(driver_path)
+                print(f"{Fore.GREEN}[✓] Using ChromeDriver: {driver_path}{Style.RESET_ALL}")
             else:
                 print(f"{Fore.YELLOW}[!] System ChromeDriver not found, downloading...{Style.RESET_ALL}")
                 try:
                     from webdriver_manager.chrome import ChromeDriverManager
-                    service = Service(ChromeDriverManager().install())
+                    driver_path = ChromeDriverManager().install()
                 except ImportError:
                     print(f"{Fore.RED}[✗] webdriver-manager not installed{Style.RESET_ALL}")
                     return None
             
-            # Create driver with timeouts
-            self.driver = webdriver.Chrome(service=service, options=chrome_options)
-            self.driver.set_page_load_timeout(20)
-            self.driver.set_script_timeout(20)
+            self.browser_paths = (chrome_binary, driver_path)
+            return self.browser_paths
+
+    def make_driver(self):
+        """Start one headless Chrome for a screenshot worker, with its memory bounded"""
+        try:
+            from selenium import webdriver
+            from selenium.webdriver.chrome.options import Options
+            from selenium.webdriver.chrome.service import Service
+            
+            browser = self.find_browser()
+            if not browser:
+                return None
+            chrome_binary, driver_path = browser
+            
+            chrome_options = Options()
+            chrome_options.add_argument('--headless')
+            chrome_options.add_argument('--no-sandbox')
+            chrome_options.add_argument('--disable-dev-shm-usage')
+            chrome_options.add_argument('--disable-gpu')
+            chrome_options.add_argument('--window-size=1920,1080')
+            chrome_options.add_argument('--disable-blink-features=AutomationControlled')
+            chrome_options.add_argument(f'user-agent={self.session.headers["User-Agent"]}')
+            chrome_options.add_argument('--disable-software-rasterizer')
+            chrome_options.add_argument('--log-level=3')
+            chrome_options.add_experimental_option('excludeSwitches', ['enable-logging'])
             
-            print(f"{Fore.GREEN}[✓] ChromeDriver ready{Style.RESET_ALL}")
-            return self.driver
+            # Several browsers run side by side: one renderer each, a capped JS heap and a small disk cache
+            chrome_options.add_argument('--renderer-process-limit=1')
+            chrome_options.add_argument(f'--js-flags=--max-old-space-size={self.screenshot_memory_mb}')
+            chrome_options.add_argument(f'--disk-cache-size={32 * 1024 * 1024}')
+            chrome_options.add_argument('--disable-extensions')
+            chrome_options.binary_location = chrome_binary
+            
+            # Create driver with timeouts
+            driver = webdriver.Chrome(service=Service(driver_path), options=chrome_options)
+            driver.set_page_load_timeout(20)
+            driver.set_script_timeout(20)
+            return driver
             
         except ImportError:
             print(f"{Fore.RED}[✗] Selenium not installed{Style.RESET_ALL}")
@@ -1125,6 +3357,7 @@ class WhoisUser:
 {Fore.GREEN}[+] Total Platforms:{Fore.WHITE} {len(self.platforms)}
 {Fore.GREEN}[+] Available OSINT Tools:{Fore.WHITE} {len(self.available_tools)}
 {Fore.GREEN}[+] Thread Workers:{Fore.WHITE} {self.max_workers}
+{Fore.GREEN}[+] Scan Engine:{Fore.WHITE} {self.engine}
 {Style.RESET_ALL}
 """
         print(banner)
@@ -1135,6 +3368,55 @@ class WhoisUser:
                 print(f"    {Fore.GREEN}✓{Fore.WHITE} {tool}{Style.RESET_ALL}")
             print()
 
+    def stream_tool_process(self, cmd, tee_path, parse_line, timeout=None):
+        """Run an external tool, parsing its stdout line by line as it arrives
+        
+        Every line is teed to tee_path and every profile is merged immediately, so a tool
+        killed at its timeout still contributes what it found. Returns (profiles, timed_out).
+        """
+        timeout = timeout or self.tool_timeout
+        env = dict(os.environ, PYTHONUNBUFFERED='1')
+        # Own process group so a kill also reaches helpers that inherited the stdout pipe
+        process = subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, text=True,
+                                   errors='ignore', bufsize=1, env=env, start_new_session=(os.name == 'posix'))
+        self.tool_processes.append(process)
+        
+        # Kill the child at its wall-time limit; reading then hits EOF and keeps what was parsed
+        expired = threading.Event()
+        
+        def expire():
+            expired.set()
+            kill_tool(process)
+        
+        timer = threading.Timer(timeout, expire)
+        timer.daemon = True
+        timer.start()
+        
+        profiles = []
+        seen = set()
+        try:
+            with open(tee_path, 'w', encoding='utf-8') as tee:
+                for line in process.stdout:
+                    tee.write(line)
+                    for profile in parse_line(line):
+                        if profile['url'] not in seen:
+                            seen.add(profile['url'])
+                            profiles.append(profile)
+                            self.add_profile(profile)
+            process.wait()
+        finally:
+            timer.cancel()
+            if process.poll() is None:
+                kill_tool(process)
+        
+        return profiles, expired.is_set()
+
+    def report_tool(self, name, profiles, timed_out):
+        if timed_out:
+            print(f"{Fore.RED}[✗] {name} timed out, kept {len(profiles)} partial results{Style.RESET_ALL}")
+        else:
+            print(f"{Fore.GREEN}[✓] {name} completed: {len(profiles)} results{Style.RESET_ALL}")
+
     def run_sherlock(self):
         """Run Sherlock tool for username enumeration"""
         if 'sherlock' not in self.available_tools:
@@ -1144,18 +3426,13 @@ class WhoisUser:
         
         try:
             output_file = f"{self.osint_dir}/sherlock_results.txt"
-            cmd = [self.available_tools['sherlock'], self.username, '--output', output_file, '--timeout', '10']
-            
-            process = subprocess.run(cmd, capture_output=True, text=True, timeout=300)
-            
-            # Parse results
-            profiles = self.parse_sherlock_results(output_file)
+            report_file = f"{self.osint_dir}/sherlock_report.txt"
+            cmd = [self.available_tools['sherlock'], self.username, '--output', report_file, '--timeout', '10']
             
-            print(f"{Fore.GREEN}[✓] Sherlock completed{Style.RESET_ALL}")
+            profiles, timed_out = self.stream_tool_process(cmd, output_file, self.parse_sherlock_line)
+            self.report_tool('Sherlock', profiles, timed_out)
             return profiles
             
-        except subprocess.TimeoutExpired:
-            print(f"{Fore.RED}[✗] Sherlock timed out{Style.RESET_ALL}")
         except Exception as e:
             print(f"{Fore.RED}[✗] Sherlock error: {str(e)[:60]}{Style.RESET_ALL}")
         
@@ -1169,61 +3446,19 @@ class WhoisUser:
         print(f"\n{Fore.YELLOW}[*] Running Maigret for deep OSINT search...{Style.RESET_ALL}\n")
         
         try:
+            output_file = f"{self.osint_dir}/maigret_results.txt"
             output_dir = f"{self.osint_dir}/maigret"
             cmd = [self.available_tools['maigret'], self.username, '--folderoutput', output_dir, '--timeout', '10']
             
-            process = subprocess.run(cmd, capture_output=True, text=True, timeout=300)
-            
-            # Parse results
-            profiles = self.parse_maigret_results(output_dir)
-            
-            print(f"{Fore.GREEN}[✓] Maigret completed{Style.RESET_ALL}")
+            profiles, timed_out = self.stream_tool_process(cmd, output_file, self.parse_maigret_line)
+            self.report_tool('Maigret', profiles, timed_out)
             return profiles
             
-        except subprocess.TimeoutExpired:
-            print(f"{Fore.RED}[✗] Maigret timed out{Style.RESET_ALL}")
         except Exception as e:
             print(f"{Fore.RED}[✗] Maigret error{Style.RESET_ALL}")
         
         return []
 
-    def run_holehe(self):
-        """Run Holehe to check email-based accounts"""
-        if 'holehe' not in self.available_tools:
-            return []
-        
-        print(f"\n{Fore.YELLOW}[*] Running Holehe for email enumeration...{Style.RESET_ALL}\n")
-        
-        try:
-            email_variants = [
-                f"{self.username}@gmail.com",
-                f"{self.username}@yahoo.com",
-                f"{self.username}@outlook.com",
-            ]
-            
-            output_files = []
-            for email in email_variants:
-                output_file = f"{self.osint_dir}/holehe_{email.replace('@', '_at_')}.txt"
-                cmd = [self.available_tools['holehe'], email]
-                
-                process = subprocess.run(cmd, capture_output=True, text=True, timeout=60)
-                
-                with open(output_file, 'w') as f:
-                    f.write(process.stdout)
-                
-                output_files.append(output_file)
-            
-            # Parse results
-            profiles = self.parse_holehe_results(output_files)
-            
-            print(f"{Fore.GREEN}[✓] Holehe completed{Style.RESET_ALL}")
-            return profiles
-            
-        except Exception as e:
-            print(f"{Fore.RED}[✗] Holehe error{Style.RESET_ALL}")
-        
-        return []
-
     def run_blackbird(self):
         """Run Blackbird for fast username search"""
         if 'blackbird' not in self.available_tools:
@@ -1235,15 +3470,8 @@ class WhoisUser:
             output_file = f"{self.osint_dir}/blackbird_results.txt"
             cmd = [self.available_tools['blackbird'], '-u', self.username, '--dump']
             
-            process = subprocess.run(cmd, capture_output=True, text=True, timeout=300)
-            
-            with open(output_file, 'w') as f:
-                f.write(process.stdout)
-            
-            # Parse results
-            profiles = self.parse_blackbird_results(output_file)
-            
-            print(f"{Fore.GREEN}[✓] Blackbird completed{Style.RESET_ALL}")
+            profiles, timed_out = self.stream_tool_process(cmd, output_file, self.parse_blackbird_line)
+            self.report_tool('Blackbird', profiles, timed_out)
             return profiles
             
         except Exception as e:
@@ -1251,33 +3479,164 @@ class WhoisUser:
         
         return []
 
+    def start_osint_tools(self):
+        """Launch the available external tools in the background, at most tool_workers at a time"""
+        runners = {
+            'sherlock': self.run_sherlock,
+            'maigret': self.run_maigret,
+            'blackbird': self.run_blackbird,
+        }
+        tools = [tool for tool in runners if tool in self.available_tools]
+        if not tools:
+            return
+        
+        print(f"{Fore.YELLOW}[*] Starting {len(tools)} external tools ({min(self.tool_workers, len(tools))} at a time) "
+              f"alongside the platform scan...{Style.RESET_ALL}")
+        self.tool_executor = concurrent.futures.ThreadPoolExecutor(max_workers=self.tool_workers)
+        self.tool_futures = {
+            self.tool_executor.submit(self.run_timed_tool, tool, runners[tool]): tool
+            for tool in tools
+        }
+
+    def run_timed_tool(self, tool, runner):
+        """Run one tool (it merges profiles as they stream in) and record its wall time"""
+        started = time.time()
+        profiles = runner()
+        finished = time.time()
+        
+        self.metrics.observe('whoisuser_tool_seconds', finished - started, tool=tool)
+        self.tool_timings[tool] = {
+            'seconds': round(finished - started, 2),
+            'finished_after': round(finished - self.phase_timings.get('started', started), 2),
+            'profiles': len(profiles)
+        }
+        return profiles
+
+    def finish_osint_tools(self):
+        """Wait for the external tools still running; returns how many profiles they reported"""
+        external_count = 0
+        for future in concurrent.futures.as_completed(self.tool_futures):
+            try:
+                external_count += len(future.result())
+            except Exception as e:
+                logging.error(f"External tool {self.tool_futures[future]} failed: {str(e)}")
+        
+        if self.tool_executor:
+            self.tool_executor.shutdown()
+            self.tool_executor = None
+        return external_count
+
+    def critical_path(self):
+        """The phase (direct scan, screenshots or an external tool) that finished last, with its end time"""
+        candidates = {'direct scan': self.phase_timings.get('scan_finished_after', 0)}
+        if 'screenshots_finished_after' in self.phase_timings:
+            candidates['screenshots'] = self.phase_timings['screenshots_finished_after']
+        for tool, timing in self.tool_timings.items():
+            candidates[tool] = timing['finished_after']
+        name = max(candidates, key=candidates.get)
+        return name, candidates[name]
+
     def scan_platforms(self):
-        """Scan all platforms using concurrent threads"""
-        print(f"\n{Fore.YELLOW}[*] Starting scan across {len(self.platforms)} platforms...{Style.RESET_ALL}\n")
+        """Scan all platforms (and email services) using the configured engine"""
+        if self.email_checks:
+            print(f"\n{Fore.YELLOW}[*] Starting scan across {len(self.platforms)} platforms and "
+                  f"{len(self.email_checks)} email checks ({len(self.emails)} addresses)...{Style.RESET_ALL}\n")
+        else:
+            print(f"\n{Fore.YELLOW}[*] Starting scan across {len(self.platforms)} platforms...{Style.RESET_ALL}\n")
+        
+        # Fresh cache entries are answered up front so they never wait on a rate limit
+        pending = {}
+        for platform, data in dict(self.platforms, **self.email_checks).items():
+            hit, result = self.cached_result(platform, data)
+            if not hit:
+                pending[platform] = data
+            elif result:
+                self.add_profile(result)
         
+        if self.engine == 'async':
+            try:
+                import aiohttp
+            except ImportError:
+                print(f"{Fore.YELLOW}[!] aiohttp not installed, falling back to thread engine{Style.RESET_ALL}\n")
+            else:
+                asyncio.run(self.scan_platforms_async(pending))
+                return
+        
+        # Workers pull whichever check the scheduler releases next instead of sleeping on a busy domain
+        scheduler = self.context.make_scheduler(self.request_delay)
+        for platform, data in pending.items():
+            scheduler.submit(rate_group(data['url'], data), (self, platform, data, None))
+        scheduler.close()
+        
+        results = queue.Queue()
         with concurrent.futures.ThreadPoolExecutor(max_workers=self.max_workers) as executor:
-            future_to_platform = {
-                executor.submit(self.check_url, platform, data): platform 
-                for platform, data in self.platforms.items()
-            }
+            for _ in range(self.max_workers):
+                executor.submit(scheduled_worker, scheduler, results)
             
-            for future in concurrent.futures.as_completed(future_to_platform):
-                try:
-                    result = future.result()
-                    if result:
-                        self.add_profile(result)
-                except Exception as e:
-                    logging.error(f"Error in future: {str(e)}")
-
-    def take_screenshot(self, url, platform_name):
-        """Reuse existing driver for all screenshots"""
+            for _ in range(len(pending)):
+                _, result = results.get()
+                if result:
+                    self.add_profile(result)
+
+    async def scan_platforms_async(self, platforms=None):
+        """Scan all platforms on a single event loop with hundreds of requests in flight"""
+        import aiohttp
+        
+        # Total and per-host connection caps replace the thread count as the concurrency limit
+        connector = aiohttp.TCPConnector(limit=self.max_workers, limit_per_host=self.max_per_host, ttl_dns_cache=300)
+        timeout = aiohttp.ClientTimeout(total=None, sock_connect=10, sock_read=10)
+        
+        scheduler = self.context.make_scheduler(self.request_delay)
+        for platform, data in (self.platforms if platforms is None else platforms).items():
+            scheduler.submit(rate_group(data['url'], data), (platform, data, None))
+        
+        async with aiohttp.ClientSession(connector=connector, timeout=timeout, headers=dict(self.session.headers),
+                                         trace_configs=[self.context.stats.aiohttp_trace_config()]) as http:
+            running = {}
+            try:
+                while not scheduler.drained():
+                    # Launch every check the scheduler releases, up to the worker cap
+                    wait = None
+                    while len(running) < self.max_workers:
+                        wait = scheduler.poll()
+                        if not isinstance(wait, tuple):
+                            break
+                        key, (platform, data, retry), queued = wait
+                        task = asyncio.ensure_future(self.check_url_async(http, platform, data, paced=True, queued=queued,
+                                                                          retry=retry))
+                        running[task] = (key, platform, data)
+                        wait = None
+                    
+                    if not running:
+                        await asyncio.sleep(wait or 0)
+                        continue
+                    
+                    done, _ = await asyncio.wait(running, timeout=wait, return_when=asyncio.FIRST_COMPLETED)
+                    for task in done:
+                        key, platform, data = running.pop(task)
+                        try:
+                            result = task.result()
+                            if isinstance(result, RetryLater):
+                                scheduler.submit(key, (platform, data, result), delay=result.delay)
+                            elif result:
+                                self.add_profile(result)
+                        except asyncio.CancelledError:
+                            raise
+                        except Exception as e:
+                            logging.error(f"Error in task: {str(e)}")
+                        finally:
+                            scheduler.done(key)
+            finally:
+                # Cancel whatever is still in flight (interrupt or error)
+                for task in running:
+                    task.cancel()
+                await asyncio.gather(*running, return_exceptions=True)
+
+    def take_screenshot(self, driver, url, platform_name):
+        """Load a page in one of the pool's browsers and save a screenshot"""
         try:
-            driver = self.driver
-            if not driver:
-                return None
-            
             driver.get(url)
-            time.sleep(4)
+            self.wait_for_settle(driver, platform_name)
             
             screenshot_path = f"{self.images_dir}/{platform_name.replace('/', '_').replace(' ', '_')}.png"
             
@@ -1294,25 +3653,70 @@ class WhoisUser:
             logging.error(f"Screenshot failed for {platform_name}: {str(e)}")
             return None
 
-    def capture_screenshots(self):
-        """Capture screenshots using single driver instance"""
-        if not self.found_profiles:
-            return
-        
-        # Only screenshot whoisuser-found profiles
-        whoisuser_profiles = [p for p in self.found_profiles if p.get('source') == 'whoisuser' and p.get('type') == 'profile']
+    def wait_for_settle(self, driver, platform_name):
+        """Wait until a page has loaded and gone quiet (or its ready_selector shows), up to a ceiling"""
+        started = time.time()
+        selector = self.platforms.get(platform_name, {}).get('ready_selector')
         
-        if not whoisuser_profiles:
-            return
+        # A platform that settled quickly before gets a tighter ceiling than the global one
+        learned = self.settle_times.get(platform_name) if self.settle_times else None
+        ceiling = SETTLE_CEILING if learned is None else min(SETTLE_CEILING, max(SETTLE_QUIET * 4, learned * 3))
         
-        print(f"\n{Fore.YELLOW}[*] Attempting to capture screenshots of {len(whoisuser_profiles)} found profiles...{Style.RESET_ALL}\n")
+        last_shape = None
+        quiet_since = started
+        settled = None
+        while time.time() - started < ceiling:
+            try:
+                state = driver.execute_script(SETTLE_PROBE_JS, selector)
+            except Exception as e:
+                logging.debug(f"Settle probe failed for {platform_name}: {str(e)}")
+                break
+            
+            now = time.time()
+            shape = (state['nodes'], state['resources'])
+            if shape != last_shape:
+                last_shape, quiet_since = shape, now
+            
+            # Loaded, no new nodes or requests for a moment, selector present; a page without
+            # visible text (image or canvas only) must stay unchanged longer before it counts
+            quiet = SETTLE_QUIET if state['text'] else SETTLE_BLANK_QUIET
+            if state['ready'] and state['selector'] and now - quiet_since >= quiet:
+                settled = now - started
+                break
+            time.sleep(SETTLE_POLL)
         
+        seconds = time.time() - started
+        with self._stats_lock:
+            self.settle_stats['settle_seconds'] += seconds
+            self.settle_stats['settled' if settled is not None else 'ceiling_hits'] += 1
+        # A ceiling hit says nothing about how long the page takes, so only settled pages teach the default
+        if self.settle_times and settled is not None:
+            self.settle_times.record(platform_name, settled)
+        return settled
+
+    def capture_profile(self, driver, profile):
+        """Pool callback: screenshot one profile and attach the evidence path"""
+        started = time.time()
+        screenshot_path = self.take_screenshot(driver, profile['url'], profile['platform'])
+        self.metrics.inc('whoisuser_screenshots', result='captured' if screenshot_path else 'failed')
+        if screenshot_path:
+            self.metrics.observe('whoisuser_screenshot_seconds', time.time() - started)
+            profile['screenshot'] = screenshot_path
+            try:
+                self.screenshot_store.submit(profile, screenshot_path)
+            except Exception as e:
+                # The raw PNG stays in place when the storage stage is unavailable
+                logging.error(f"Screenshot storage unavailable: {str(e)}")
+            print(f"{Fore.GREEN}    ✓ {profile['platform']}: {os.path.basename(screenshot_path)}{Style.RESET_ALL}")
+        return screenshot_path
+
+    def screenshots_available(self):
+        """Whether Selenium and a Chrome binary are installed"""
         try:
             import selenium
-            from selenium import webdriver
         except ImportError:
             print(f"{Fore.YELLOW}[!] Selenium not installed. Skipping screenshots.{Style.RESET_ALL}\n")
-            return
+            return False
         
         chrome_available = False
         for chrome_path in ['/usr/bin/google-chrome', '/usr/bin/chromium', '/usr/bin/chromium-browser']:
@@ -1322,22 +3726,58 @@ class WhoisUser:
         
         if not chrome_available:
             print(f"{Fore.YELLOW}[!] Chrome/Chromium not found. Skipping screenshots.{Style.RESET_ALL}\n")
+            return False
+        return True
+
+    def start_screenshot_pool(self, workers):
+        """Start the screenshot workers (each launches Chrome on its first job)"""
+        self.settle_times = SettleTimes()
+        self.screenshot_store = ScreenshotStore(image_format=self.screenshot_format, quality=self.screenshot_quality)
+        self.screenshot_pool = ScreenshotPool(self.make_driver, self.capture_profile, workers)
+        self.screenshot_pool.start()
+
+    def finish_screenshot_pool(self, pipelined=False):
+        """Wait for the outstanding captures and record the screenshot statistics"""
+        stats = self.screenshot_pool.finish()
+        self.settle_times.save()
+        stats['storage'] = self.screenshot_store.finish()
+        self.phase_timings['screenshots_finished_after'] = round(time.time() - self.phase_timings.get('started', time.time()), 2)
+        
+        stats.update(self.settle_stats)
+        stats['settle_seconds'] = round(stats['settle_seconds'], 2)
+        stats['workers'] = self.screenshot_pool.workers
+        stats['pipelined'] = pipelined
+        stats['per_minute'] = round(stats['captured'] * 60 / stats['seconds'], 1) if stats['seconds'] else 0
+        self.screenshot_stats = stats
+        print(f"\n{Fore.GREEN}[✓] Screenshots captured: {stats['captured']}/{stats['submitted']} in {stats['seconds']:.1f}s "
+              f"({stats['per_minute']}/min, {stats['restarts']} browser restarts){Style.RESET_ALL}")
+        if stats['launch_failed']:
+            print(f"{Fore.YELLOW}[!] Chrome could not be started; the remaining screenshots were skipped{Style.RESET_ALL}")
+        storage = stats['storage']
+        if storage['images']:
+            print(f"{Fore.GREEN}[✓] Stored {storage['unique']} new images for {storage['images']} captures "
+                  f"({storage['duplicates']} identical, {storage['near_duplicates']} near-identical): "
+                  f"{format_bytes(storage['original_bytes'])} → {format_bytes(storage['stored_bytes'])}{Style.RESET_ALL}")
+
+    def capture_screenshots(self):
+        """Capture screenshots of the direct hits after the scan (non-pipelined mode)"""
+        if not self.found_profiles:
             return
         
-        if not self.setup_selenium_driver():
-            print(f"{Fore.RED}[✗] Failed to setup ChromeDriver{Style.RESET_ALL}")
+        # Only screenshot whoisuser-found profiles
+        whoisuser_profiles = [p for p in self.found_profiles if p.get('source') == 'whoisuser' and p.get('type') == 'profile']
+        
+        if not whoisuser_profiles or not self.screenshots_available():
             return
         
-        screenshot_count = 0
-        for i, profile in enumerate(whoisuser_profiles, 1):
-            print(f"{Fore.CYAN}[{i}/{len(whoisuser_profiles)}] {profile['platform']}{Style.RESET_ALL}")
-            screenshot_path = self.take_screenshot(profile['url'], profile['platform'])
-            if screenshot_path:
-                profile['screenshot'] = screenshot_path
-                screenshot_count += 1
-                print(f"{Fore.GREEN}    ✓ Saved: {os.path.basename(screenshot_path)}{Style.RESET_ALL}")
+        workers = min(self.screenshot_workers, len(whoisuser_profiles))
+        print(f"\n{Fore.YELLOW}[*] Capturing screenshots of {len(whoisuser_profiles)} found profiles "
+              f"with {workers} browsers...{Style.RESET_ALL}\n")
         
-        print(f"\n{Fore.GREEN}[✓] Screenshots captured: {screenshot_count}/{len(whoisuser_profiles)}{Style.RESET_ALL}")
+        self.start_screenshot_pool(workers)
+        for profile in whoisuser_profiles:
+            self.screenshot_pool.submit(profile)
+        self.finish_screenshot_pool()
 
     def generate_report(self):
         """Generate comprehensive investigation reports with merged results"""
@@ -1346,9 +3786,11 @@ class WhoisUser:
         whoisuser_count = len([p for p in self.found_profiles if p.get('source') == 'whoisuser'])
         sherlock_count = len([p for p in self.found_profiles if p.get('source') == 'sherlock'])
         maigret_count = len([p for p in self.found_profiles if p.get('source') == 'maigret'])
-        holehe_count = len([p for p in self.found_profiles if p.get('source') == 'holehe'])
+        email_count = len([p for p in self.found_profiles if p.get('source') == 'email'])
         blackbird_count = len([p for p in self.found_profiles if p.get('source') == 'blackbird'])
         
+        timing = self.timing_summary()
+        
         # Generate TXT report
         txt_report_path = f"{self.output_dir}/FULL_REPORT.txt"
         with open(txt_report_path, 'w', encoding='utf-8') as f:
@@ -1361,15 +3803,18 @@ class WhoisUser:
             f.write(f"Investigator: Anubhav (Cybersecurity & Cyber Forensic Researcher)\n")
             f.write(f"Tool Version: 2.7 OPTIMIZED INTEGRATED\n")
             f.write(f"Total Platforms Scanned: {len(self.platforms)}\n")
+            f.write(f"Email Addresses Checked: {', '.join(self.emails) if self.emails else 'None'}\n")
             f.write(f"Total Unique Profiles Found: {len(self.found_profiles)}\n")
             f.write(f"\n")
             f.write(f"Breakdown by Source:\n")
             f.write(f"  - WhoisUser Direct: {whoisuser_count}\n")
             f.write(f"  - Sherlock: {sherlock_count}\n")
             f.write(f"  - Maigret: {maigret_count}\n")
-            f.write(f"  - Holehe: {holehe_count}\n")
+            f.write(f"  - Email Accounts: {email_count}\n")
             f.write(f"  - Blackbird: {blackbird_count}\n")
             f.write(f"Failed Checks: {len(self.failed_checks)}\n")
+            f.write(f"Skipped Checks (circuit open): {len(self.skipped_checks)}\n")
+            f.write(f"Retries: {self.retry_stats['retries']} ({self.retry_stats['recovered']} recovered)\n")
             f.write(f"Available OSINT Tools: {', '.join(self.available_tools.keys()) if self.available_tools else 'None'}\n")
             f.write("\n" + "="*80 + "\n")
             f.write("DISCOVERED PROFILES (MERGED FROM ALL SOURCES)\n")
@@ -1407,6 +3852,21 @@ class WhoisUser:
                         f.write(f"   Status Code: {failed['status']}\n")
                     f.write("\n")
             
+            if timing['slowest']:
+                f.write("="*80 + "\n")
+                f.write(f"SLOWEST CHECKS (Top {len(timing['slowest'])} of {timing['checks']})\n")
+                f.write("="*80 + "\n\n")
+                for i, slow in enumerate(timing['slowest'], 1):
+                    f.write(f"{i}. {slow['platform']}: {slow['total']:.2f}s\n")
+                    phases = [f"{phase} {slow[phase]:.3f}s" for phase in TIMING_PHASES[:-1] if slow.get(phase)]
+                    f.write(f"   {', '.join(phases) or 'no breakdown'}, {format_bytes(slow.get('bytes', 0))}\n")
+                f.write("\n")
+                f.write("Phase percentiles (seconds):\n")
+                for phase in TIMING_PHASES:
+                    stats = timing['phases'][phase]
+                    f.write(f"  {phase:<10} p50 {stats['p50']:.3f}  p95 {stats['p95']:.3f}  p99 {stats['p99']:.3f}\n")
+                f.write("\n")
+            
             f.write("="*80 + "\n")
             f.write("END OF REPORT\n")
             f.write("="*80 + "\n")
@@ -1422,19 +3882,32 @@ class WhoisUser:
                     'investigator': 'Anubhav',
                     'tool_version': '2.7 OPTIMIZED INTEGRATED',
                     'total_platforms': len(self.platforms),
+                    'emails_checked': self.emails,
+                    'email_services': len(self.registry.email_services),
                     'total_unique_profiles': len(self.found_profiles),
                     'breakdown_by_source': {
                         'whoisuser': whoisuser_count,
                         'sherlock': sherlock_count,
                         'maigret': maigret_count,
-                        'holehe': holehe_count,
+                        'email': email_count,
                         'blackbird': blackbird_count
                     },
                     'failed_checks': len(self.failed_checks),
-                    'osint_tools_used': list(self.available_tools.keys())
+                    'osint_tools_used': list(self.available_tools.keys()),
+                    'body_stats': self.body_stats,
+                    'probe_stats': self.probe_stats,
+                    'cache_stats': self.cache_stats,
+                    'tool_timings': self.tool_timings,
+                    'critical_path': dict(zip(('phase', 'seconds'), self.critical_path())),
+                    'connection_stats': self.context.connection_stats(),
+                    'screenshot_stats': self.screenshot_stats,
+                    'concurrency': self.context.controller.summary() if self.context.controller else None,
+                    'retries': self.retry_summary(),
+                    'timing': timing
                 },
                 'profiles': self.found_profiles,
-                'failed_checks': self.failed_checks[:50]
+                'failed_checks': self.failed_checks[:50],
+                'skipped_checks': self.skipped_checks[:50]
             }, f, indent=4)
         
         # Generate URLs list
@@ -1453,7 +3926,7 @@ class WhoisUser:
         whoisuser_count = len([p for p in self.found_profiles if p.get('source') == 'whoisuser'])
         sherlock_count = len([p for p in self.found_profiles if p.get('source') == 'sherlock'])
         maigret_count = len([p for p in self.found_profiles if p.get('source') == 'maigret'])
-        holehe_count = len([p for p in self.found_profiles if p.get('source') == 'holehe'])
+        email_count = len([p for p in self.found_profiles if p.get('source') == 'email'])
         blackbird_count = len([p for p in self.found_profiles if p.get('source') == 'blackbird'])
         
         print(f"\n{Fore.CYAN}{'='*80}{Style.RESET_ALL}")
@@ -1469,8 +3942,8 @@ class WhoisUser:
             print(f"  • Sherlock: {Fore.GREEN}{sherlock_count}{Style.RESET_ALL}")
         if maigret_count > 0:
             print(f"  • Maigret: {Fore.GREEN}{maigret_count}{Style.RESET_ALL}")
-        if holehe_count > 0:
-            print(f"  • Holehe: {Fore.GREEN}{holehe_count}{Style.RESET_ALL}")
+        if email_count > 0:
+            print(f"  • Email Accounts: {Fore.GREEN}{email_count}{Style.RESET_ALL}")
         if blackbird_count > 0:
             print(f"  • Blackbird: {Fore.GREEN}{blackbird_count}{Style.RESET_ALL}")
         print(f"  • Failed Checks: {Fore.RED}{len(self.failed_checks)}{Style.RESET_ALL}")
@@ -1486,57 +3959,139 @@ class WhoisUser:
         print(f"{Fore.YELLOW}Performance:{Style.RESET_ALL}")
         success_rate = (len(self.found_profiles) / len(self.platforms)) * 100 if self.platforms else 0
         print(f"  • Detection Rate: {Fore.CYAN}{success_rate:.1f}%{Style.RESET_ALL}")
+        if self.stream_bodies:
+            print(f"  • Body Bytes Read: {Fore.WHITE}{format_bytes(self.body_stats['bytes_read'])}{Style.RESET_ALL}")
+            print(f"  • Body Bytes Saved: {Fore.GREEN}{format_bytes(self.body_stats['bytes_saved'])}{Style.RESET_ALL} "
+                  f"({self.body_stats['early_verdicts']} early verdicts, {self.body_stats['capped']} capped)")
+        if self.cache:
+            print(f"  • Cache: {Fore.GREEN}{self.cache_stats['hits']} hits{Style.RESET_ALL}, {self.cache_stats['misses']} misses "
+                  f"({self.cache_stats['revalidated']} revalidated)")
+        if self.negatives is not None:
+            print(f"  • Known Absences Skipped: {Fore.GREEN}{self.cache_stats['negative_hits']}{Style.RESET_ALL} "
+                  f"({self.cache_stats['negatives_recorded']} newly recorded)")
+        if self.tool_timings or 'screenshots_finished_after' in self.phase_timings:
+            print(f"  • Direct Scan: {Fore.WHITE}{self.phase_timings.get('scan_finished_after', 0):.1f}s{Style.RESET_ALL}")
+            for tool, timing in sorted(self.tool_timings.items(), key=lambda item: item[1]['seconds']):
+                print(f"  • {tool.title()}: {Fore.WHITE}{timing['seconds']:.1f}s{Style.RESET_ALL} ({timing['profiles']} profiles)")
+            phase, seconds = self.critical_path()
+            print(f"  • Critical Path: {Fore.CYAN}{phase} ({seconds:.1f}s){Style.RESET_ALL}")
+        if self.probe_stats['probes']:
+            print(f"  • Full Downloads Avoided: {Fore.GREEN}{self.probe_stats['decided']}{Style.RESET_ALL} "
+                  f"of {self.probe_stats['probes']} HEAD/range probes")
+        if self.screenshot_stats:
+            print(f"  • Screenshots: {Fore.WHITE}{self.screenshot_stats['captured']} in {self.screenshot_stats['seconds']:.1f}s{Style.RESET_ALL} "
+                  f"({self.screenshot_stats['per_minute']}/min on {self.screenshot_stats['workers']} browsers)")
+            storage = self.screenshot_stats['storage']
+            if storage['images']:
+                print(f"  • Screenshot Storage: {Fore.GREEN}{format_bytes(storage['stored_bytes'])}{Style.RESET_ALL} "
+                      f"for {format_bytes(storage['original_bytes'])} of captures "
+                      f"({storage['encode_seconds'] * 1000 / storage['images']:.0f} ms encode per image)")
+            settle_count = self.screenshot_stats['settled'] + self.screenshot_stats['ceiling_hits']
+            if settle_count:
+                print(f"  • Page Settle: {Fore.WHITE}{self.screenshot_stats['settle_seconds'] / settle_count:.1f}s average{Style.RESET_ALL} "
+                      f"({self.screenshot_stats['ceiling_hits']} hit the {SETTLE_CEILING}s ceiling)")
+        if self.context.controller:
+            concurrency = self.context.controller.summary()
+            print(f"  • Concurrency: {Fore.WHITE}{concurrency['start']} → {concurrency['final']}{Style.RESET_ALL} "
+                  f"(range {concurrency['low']}-{concurrency['high']}, {concurrency['backoffs']} backoffs, "
+                  f"{concurrency['domain_backoffs']} per-domain)")
+        if self.check_timings:
+            check_times = percentiles([timing['total'] for timing in self.check_timings])
+            slowest = max(self.check_timings, key=lambda timing: timing['total'])
+            print(f"  • Check Time: {Fore.WHITE}p50 {check_times['p50']:.2f}s / p95 {check_times['p95']:.2f}s / "
+                  f"p99 {check_times['p99']:.2f}s{Style.RESET_ALL} (slowest: {slowest['platform']}, {slowest['total']:.1f}s)")
+        retries = self.retry_summary()
+        if retries['retries'] or retries['gave_up']:
+            print(f"  • Retries: {Fore.WHITE}{retries['retries']} spent{Style.RESET_ALL} "
+                  f"({retries['recovered']} recovered, {retries['gave_up']} gave up, {retries['retry_wait']:.1f}s backing off)")
+        if retries['open_groups']:
+            print(f"  • Circuit Breakers: {Fore.YELLOW}{', '.join(retries['open_groups'])}{Style.RESET_ALL} "
+                  f"({retries['skipped_checks']} checks skipped, ~{retries['seconds_saved']:.0f}s saved)")
+        connection_stats = self.context.connection_stats()
+        print(f"  • Connections: {Fore.WHITE}{connection_stats['connections']} opened for {connection_stats['requests']} requests{Style.RESET_ALL} "
+              f"({connection_stats['reuse_rate'] * 100:.0f}% reused, {connection_stats['tls_handshakes']} TLS handshakes)")
         print(f"  • Investigation ID: {Fore.WHITE}{self.timestamp}{Style.RESET_ALL}\n")
+        
+        if self.profiler and self.profiler.files:
+            print(f"{Fore.YELLOW}Profile (per phase):{Style.RESET_ALL}")
+            print(f"  {'phase':<12} {'wall (s)':>9} {'CPU (s)':>9} {'peak':>10} {'retained':>10}")
+            for row in self.profiler.summary():
+                print(f"  {row['phase']:<12} {row['wall_seconds']:>9.2f} {row['cpu_seconds']:>9.2f} "
+                      f"{format_bytes(row['peak_bytes']):>10} {format_bytes(row['growth_bytes']):>10}")
+            print(f"  • Profiles: {Fore.WHITE}{self.profiler.output_dir}/{Style.RESET_ALL} "
+                  f"(.prof for pstats/snakeviz, top allocations{', sampled stacks' if self.profiler.sample_interval else ''})\n")
+
+    def profile_phase(self, name):
+        """Profile a block of run() under a phase name when --profile is on"""
+        return self.profiler.phase(name) if self.profiler else nullcontext()
+
+    def write_profile(self):
+        """Write the per-phase profiles once the last profiled phase is done"""
+        try:
+            self.profiler.write()
+        except OSError as e:
+            print(f"{Fore.RED}[✗] Profile not written: {str(e)[:50]}{Style.RESET_ALL}")
+            logging.error(f"Profile write failed: {str(e)}")
 
     def run(self, capture_screenshots=True, use_osint_tools=True):
         """Execute investigation with proper cleanup"""
         start_time = time.time()
+        self.phase_timings['started'] = start_time
+        if self.profiler:
+            self.profiler.start()
         
         try:
             self.print_banner()
             
-            # Run external OSINT tools and collect results
-            external_profiles = []
+            # Pipeline mode: browsers warm up now and capture each hit as the scan confirms it
+            if capture_screenshots and self.pipeline_screenshots and self.screenshots_available():
+                print(f"{Fore.YELLOW}[*] Screenshot pipeline: up to {self.screenshot_workers} browsers "
+                      f"capture hits as the scan confirms them{Style.RESET_ALL}")
+                with self.profile_phase('screenshots'):
+                    self.start_screenshot_pool(self.screenshot_workers)
             
+            # External OSINT tools run as child processes while the platform scan proceeds
             if use_osint_tools:
-                sherlock_profiles = self.run_sherlock()
-                external_profiles.extend(sherlock_profiles)
-                
-                maigret_profiles = self.run_maigret()
-                external_profiles.extend(maigret_profiles)
-                
-                holehe_profiles = self.run_holehe()
-                external_profiles.extend(holehe_profiles)
-                
-                blackbird_profiles = self.run_blackbird()
-                external_profiles.extend(blackbird_profiles)
+                with self.profile_phase('tools'):
+                    self.start_osint_tools()
             
             # Scan platforms with WhoisUser
-            self.scan_platforms()
-            
-            # Merge all results
-            print(f"\n{Fore.YELLOW}[*] Merging results from all sources...{Style.RESET_ALL}\n")
-            
-            initial_count = len(self.found_profiles)
+            with self.profile_phase('scan'):
+                self.scan_platforms()
+            self.phase_timings['scan_finished_after'] = round(time.time() - start_time, 2)
             
-            # Add external tool results with deduplication
-            for profile in external_profiles:
-                self.add_profile(profile)
+            # Tools merge their profiles as each finishes; wait for the stragglers
+            if self.tool_futures:
+                print(f"\n{Fore.YELLOW}[*] Waiting for external tools to finish...{Style.RESET_ALL}")
+            with self.profile_phase('tools'):
+                external_count = self.finish_osint_tools()
             
-            # Sort by platform name
-            self.found_profiles.sort(key=lambda x: x['platform'])
+            print(f"\n{Fore.YELLOW}[*] Merging results from all sources...{Style.RESET_ALL}\n")
+            with self.profile_phase('merge'):
+                initial_count = len([p for p in self.found_profiles if p.get('source') == 'whoisuser'])
+                
+                # Sort by platform name
+                self.found_profiles.sort(key=lambda x: x['platform'])
             
             print(f"{Fore.GREEN}[✓] Merge complete: {len(self.found_profiles)} unique profiles{Style.RESET_ALL}")
             print(f"    WhoisUser found: {initial_count}")
-            print(f"    External tools found: {len(external_profiles)}")
+            print(f"    Email accounts found: {len([p for p in self.found_profiles if p.get('source') == 'email'])}")
+            print(f"    External tools found: {external_count}")
             print(f"    After deduplication: {len(self.found_profiles)}")
             
-            # Capture screenshots
-            if capture_screenshots and self.found_profiles:
-                self.capture_screenshots()
+            # Capture screenshots (or wait for the pipeline to drain)
+            with self.profile_phase('screenshots'):
+                if self.screenshot_pool:
+                    print(f"\n{Fore.YELLOW}[*] Waiting for the screenshot pipeline to finish...{Style.RESET_ALL}")
+                    self.finish_screenshot_pool(pipelined=True)
+                elif capture_screenshots and self.found_profiles:
+                    self.capture_screenshots()
             
             # Generate reports
-            self.generate_report()
+            with self.profile_phase('reporting'):
+                self.generate_report()
+            if self.profiler:
+                self.write_profile()
             self.print_summary()
             
         finally:
@@ -1546,6 +4101,231 @@ class WhoisUser:
             elapsed_time = time.time() - start_time
             print(f"{Fore.CYAN}[*] Total execution time: {elapsed_time:.2f} seconds{Style.RESET_ALL}\n")
 
+class BatchInvestigation:
+    """Investigate many usernames in one process over a shared session and worker pool"""
+
+    def __init__(self, usernames, max_workers=15, proxy=None, window=25, stream_bodies=True, max_body_bytes=512 * 1024,
+                 platform_file=None, site_packs=None, context_options=None):
+        self.usernames = usernames
+        self.max_workers = max_workers
+        self.stream_bodies = stream_bodies
+        self.max_body_bytes = max_body_bytes
+        self.window = max(1, window)
+        self.timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        self.output_dir = f"investigations/batch_{self.timestamp}"
+        self.results_path = f"{self.output_dir}/results.jsonl"
+        self.summary_path = f"{self.output_dir}/summary.json"
+        Path(self.output_dir).mkdir(parents=True, exist_ok=True)
+        
+        # One session and rate-limit table for every username; batch runs the direct scan only
+        self.context = ScanContext(proxy=proxy, platform_file=platform_file, site_packs=site_packs,
+                                   pool_size=max_workers, **(context_options or {}))
+        self.context.available_tools = {}
+        
+        self.total_checks = 0
+        self.total_profiles = 0
+        self.total_failed = 0
+        self.completed = 0
+        self.body_stats = {'bytes_read': 0, 'bytes_saved': 0, 'early_verdicts': 0, 'capped': 0}
+        self.probe_stats = {'probes': 0, 'decided': 0, 'full_downloads': 0}
+        self.cache_stats = {'hits': 0, 'misses': 0, 'revalidated': 0, 'negative_hits': 0, 'negatives_recorded': 0}
+        self.retry_stats = {'retries': 0, 'retry_wait': 0.0, 'recovered': 0, 'gave_up': 0}
+        self.connection_stats = {}
+
+    @staticmethod
+    def load_usernames(source):
+        """Read usernames from a file (or stdin for '-'), skipping blanks, comments and repeats"""
+        handle = sys.stdin if source == '-' else open(source, 'r', encoding='utf-8', errors='ignore')
+        try:
+            usernames = []
+            seen = set()
+            for line in handle:
+                username = line.strip()
+                if username and not username.startswith('#') and username not in seen:
+                    seen.add(username)
+                    usernames.append(username)
+            return usernames
+        finally:
+            if handle is not sys.stdin:
+                handle.close()
+
+    def iter_windows(self):
+        """Yield investigators one window of usernames at a time"""
+        for start in range(0, len(self.usernames), self.window):
+            investigators = [
+                WhoisUser(username, max_workers=self.max_workers, context=self.context, create_dirs=False, quiet=True,
+                          stream_bodies=self.stream_bodies, max_body_bytes=self.max_body_bytes, check_emails=False)
+                for username in self.usernames[start:start + self.window]
+            ]
+            for investigator in investigators:
+                investigator.pending_checks = len(investigator.platforms)
+                investigator.started_at = time.time()
+            yield investigators
+
+    def finish_username(self, investigator, results_file):
+        """Write one result record for a username as soon as all its checks are done"""
+        elapsed = time.time() - investigator.started_at
+        investigator.found_profiles.sort(key=lambda x: x['platform'])
+        
+        results_file.write(json.dumps({
+            'username': investigator.username,
+            'total_platforms': len(investigator.platforms),
+            'total_unique_profiles': len(investigator.found_profiles),
+            'failed_checks': len(investigator.failed_checks),
+            'skipped_checks': len(investigator.skipped_checks),
+            'elapsed_seconds': round(elapsed, 2),
+            'profiles': investigator.found_profiles
+        }) + "\n")
+        results_file.flush()
+        
+        self.completed += 1
+        self.context.metrics.inc('whoisuser_usernames_completed')
+        self.total_profiles += len(investigator.found_profiles)
+        self.total_failed += len(investigator.failed_checks)
+        for key, value in investigator.body_stats.items():
+            self.body_stats[key] += value
+        for key, value in investigator.probe_stats.items():
+            self.probe_stats[key] += value
+        for key, value in investigator.cache_stats.items():
+            self.cache_stats[key] += value
+        for key, value in investigator.retry_stats.items():
+            self.retry_stats[key] += value
+        print(f"{Fore.GREEN}[✓] {Fore.WHITE}[{self.completed}/{len(self.usernames)}] {investigator.username:<25} "
+              f"{Fore.CYAN}{len(investigator.found_profiles)} profiles{Style.RESET_ALL}")
+
+    def handle_done(self, investigator, result, results_file):
+        """Collect a finished check and close out its username when it was the last one"""
+        if result:
+            investigator.add_profile(result)
+        
+        investigator.pending_checks -= 1
+        if investigator.pending_checks == 0:
+            self.finish_username(investigator, results_file)
+
+    def run(self):
+        """Stream checks for every username through one worker pool"""
+        print(f"\n{Fore.CYAN}[*] Batch investigation: {len(self.usernames)} usernames, {self.max_workers} workers{Style.RESET_ALL}")
+        print(f"{Fore.CYAN}[*] Results stream: {self.results_path}{Style.RESET_ALL}\n")
+        
+        start_time = time.time()
+        
+        # One scheduler for the whole batch, so every username shares each domain's budget
+        scheduler = self.context.make_scheduler(self.context.request_delay)
+        results = queue.Queue()
+        outstanding = 0
+        
+        try:
+            with open(self.results_path, 'w', encoding='utf-8') as results_file, \
+                    concurrent.futures.ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+                for _ in range(self.max_workers):
+                    executor.submit(scheduled_worker, scheduler, results)
+                
+                try:
+                    for investigators in self.iter_windows():
+                        window_checks = 0
+                        for investigator in investigators:
+                            for platform, data in investigator.platforms.items():
+                                hit, result = investigator.cached_result(platform, data)
+                                if hit:
+                                    self.handle_done(investigator, result, results_file)
+                                    continue
+                                scheduler.submit(rate_group(data['url'], data), (investigator, platform, data, None))
+                                window_checks += 1
+                        outstanding += window_checks
+                        self.total_checks += window_checks
+                        
+                        # Keep at most about two windows queued so 10k+ usernames never sit in memory at once
+                        while outstanding > window_checks:
+                            self.handle_done(*results.get(), results_file)
+                            outstanding -= 1
+                finally:
+                    scheduler.close()
+                
+                while outstanding:
+                    self.handle_done(*results.get(), results_file)
+                    outstanding -= 1
+        finally:
+            # Pools are discarded on close, so read their counters first
+            self.connection_stats = self.context.connection_stats()
+            self.context.close()
+        
+        elapsed_time = time.time() - start_time
+        self.write_summary(elapsed_time)
+
+    def write_summary(self, elapsed_time):
+        """Write and print the aggregate summary for the whole batch"""
+        throughput = self.total_checks / elapsed_time if elapsed_time > 0 else 0
+        summary = {
+            'timestamp': self.timestamp,
+            'usernames': len(self.usernames),
+            'completed_usernames': self.completed,
+            'total_checks': self.total_checks,
+            'total_unique_profiles': self.total_profiles,
+            'failed_checks': self.total_failed,
+            'elapsed_seconds': round(elapsed_time, 2),
+            'checks_per_second': round(throughput, 2),
+            'workers': self.max_workers,
+            'body_stats': self.body_stats,
+            'probe_stats': self.probe_stats,
+            'cache_stats': self.cache_stats,
+            'connection_stats': self.connection_stats,
+            'concurrency': self.context.controller.summary() if self.context.controller else None,
+            'retries': dict(self.retry_stats, retry_wait=round(self.retry_stats['retry_wait'], 2),
+                            **self.context.breakers.summary())
+        }
+        
+        with open(self.summary_path, 'w', encoding='utf-8') as f:
+            json.dump(summary, f, indent=4)
+        
+        print(f"\n{Fore.CYAN}{'='*80}{Style.RESET_ALL}")
+        print(f"{Fore.GREEN}BATCH COMPLETE!{Style.RESET_ALL}")
+        print(f"{Fore.CYAN}{'='*80}{Style.RESET_ALL}\n")
+        print(f"  • Usernames: {Fore.WHITE}{self.completed}/{len(self.usernames)}{Style.RESET_ALL}")
+        print(f"  • Checks Issued: {Fore.WHITE}{self.total_checks}{Style.RESET_ALL}")
+        print(f"  • Profiles Found: {Fore.CYAN}{self.total_profiles}{Style.RESET_ALL}")
+        print(f"  • Failed Checks: {Fore.RED}{self.total_failed}{Style.RESET_ALL}")
+        print(f"  • Throughput: {Fore.CYAN}{throughput:.1f} checks/second{Style.RESET_ALL}")
+        print(f"  • Body Bytes Read/Saved: {Fore.WHITE}{format_bytes(self.body_stats['bytes_read'])} / "
+              f"{format_bytes(self.body_stats['bytes_saved'])}{Style.RESET_ALL}")
+        print(f"  • Full Downloads Avoided: {Fore.WHITE}{self.probe_stats['decided']} of "
+              f"{self.probe_stats['probes']} probes{Style.RESET_ALL}")
+        print(f"  • Cache Hits/Misses: {Fore.WHITE}{self.cache_stats['hits']} / {self.cache_stats['misses']} "
+              f"({self.cache_stats['revalidated']} revalidated){Style.RESET_ALL}")
+        print(f"  • Known Absences Skipped: {Fore.WHITE}{self.cache_stats['negative_hits']} "
+              f"({self.cache_stats['negatives_recorded']} newly recorded){Style.RESET_ALL}")
+        print(f"  • Connections: {Fore.WHITE}{self.connection_stats['connections']} opened for "
+              f"{self.connection_stats['requests']} requests{Style.RESET_ALL} "
+              f"({self.connection_stats['reuse_rate'] * 100:.0f}% reused, {self.connection_stats['tls_handshakes']} TLS handshakes)")
+        if summary['concurrency']:
+            print(f"  • Concurrency: {Fore.WHITE}{summary['concurrency']['start']} → {summary['concurrency']['final']}{Style.RESET_ALL} "
+                  f"(range {summary['concurrency']['low']}-{summary['concurrency']['high']}, "
+                  f"{summary['concurrency']['backoffs']} backoffs)")
+        retries = summary['retries']
+        print(f"  • Retries: {Fore.WHITE}{retries['retries']} spent{Style.RESET_ALL} "
+              f"({retries['recovered']} recovered, {retries['gave_up']} gave up)")
+        if retries['open_groups']:
+            print(f"  • Circuit Breakers: {Fore.YELLOW}{len(retries['open_groups'])} open{Style.RESET_ALL} "
+                  f"({retries['skipped_checks']} checks skipped, ~{retries['seconds_saved']:.0f}s saved)")
+        print(f"  • Results: {Fore.WHITE}{self.results_path}{Style.RESET_ALL}")
+        print(f"  • Summary: {Fore.WHITE}{self.summary_path}{Style.RESET_ALL}")
+        print(f"{Fore.CYAN}[*] Total execution time: {elapsed_time:.2f} seconds{Style.RESET_ALL}\n")
+
+def get_cli_option(flag, default, cast=str):
+    """Read the value following a command-line flag, falling back to a default"""
+    if flag not in sys.argv:
+        return default
+    
+    try:
+        flag_index = sys.argv.index(flag)
+        return cast(sys.argv[flag_index + 1])
+    except (IndexError, ValueError):
+        print(f"{Fore.YELLOW}[!] Invalid {flag} value, using default: {default}{Style.RESET_ALL}")
+        return default
+
+def get_cli_options(flag):
+    """Collect the values of a flag that may be given several times"""
+    return [sys.argv[i + 1] for i, arg in enumerate(sys.argv[:-1]) if arg == flag]
+
 def main():
     if len(sys.argv) < 2:
         print(f"{Fore.RED}Usage: whoisuser <username> [options]{Style.RESET_ALL}")
@@ -1553,17 +4333,59 @@ def main():
         print(f"  --no-screenshots    Skip screenshot capture (faster)")
         print(f"  --no-osint-tools    Skip external OSINT tools (Sherlock, Maigret, etc.)")
         print(f"  --workers N         Number of concurrent threads (default: 15)")
+        print(f"  --engine NAME       Scan engine: threads or async (default: threads)")
+        print(f"  --per-host N        Async engine connections per host (default: 8)")
+        print(f"  --proxy URL         Route platform checks through an HTTP proxy")
+        print(f"  --no-stream         Download full page bodies instead of stopping at the verdict")
+        print(f"  --max-body-kb N     Max KB of a page body to read when streaming (default: 512)")
+        print(f"  --platforms FILE    Platform registry to use instead of platforms.json")
+        print(f"  --site-pack FILE    Extra platform definitions to merge (repeatable)")
+        print(f"  --batch FILE        Scan every username in FILE ('-' for stdin), one per line")
+        print(f"  --batch-window N    Usernames interleaved at a time in batch mode (default: 25)")
+        print(f"  --domain-rate R     Requests per second allowed per domain (default: 3.3)")
+        print(f"  --domain-burst N    Requests a quiet domain may fire back-to-back (default: 1)")
+        print(f"  --domain-concurrency N  Checks in flight per domain (default: 4)")
+        print(f"  --adaptive          Tune checks in flight from latency and errors (starts at --workers)")
+        print(f"  --min-workers N     Lower bound for --adaptive (default: 2)")
+        print(f"  --max-workers N     Upper bound for --adaptive (default: 100)")
+        print(f"  --retries N         Retries of a timeout, connection error or 429/5xx (default: {RETRIES})")
+        print(f"  --breaker-threshold N  Failures in a row before a domain is skipped (default: {BREAKER_THRESHOLD}, 0 disables)")
+        print(f"  --metrics-port N    Serve OpenMetrics at http://127.0.0.1:N/metrics while scanning")
+        print(f"  --metrics-file PATH Rewrite a Prometheus textfile every {METRICS_INTERVAL}s while scanning")
+        print(f"  --profile           Write cProfile/tracemalloc results per phase to the output directory")
+        print(f"  --profile-stacks    Also sample every thread's stack each {PROFILE_SAMPLE_MS} ms (with --profile)")
+        print(f"  --session-per-thread  Give every worker thread its own HTTP session")
+        print(f"  --http2             Multiplex HTTPS checks over HTTP/2 (needs httpx[http2])")
+        print(f"  --no-cache          Always fetch; skip the response cache")
+        print(f"  --cache-ttl SECS    Reuse cached responses younger than SECS (default: 86400)")
+        print(f"  --cache-size-mb N   Max size of the response cache (default: 256)")
+        print(f"  --negative-ttl SECS Skip platforms confirmed missing within SECS (default: 604800, 0 disables)")
+        print(f"  --tool-workers N    External tools run at once alongside the scan (default: 4)")
+        print(f"  --tool-timeout SECS Wall-time limit per external tool (default: 300)")
+        print(f"  --screenshot-workers N  Headless browsers capturing in parallel (default: 3)")
+        print(f"  --screenshot-memory-mb N  JS heap cap per screenshot browser (default: 512)")
+        print(f"  --no-pipeline       Take screenshots after the scan instead of as profiles are found")
+        print(f"  --screenshot-format F  Stored image format: webp, jpeg or png (default: webp)")
+        print(f"  --screenshot-quality N  Quality for lossy formats (default: 80)")
+        print(f"  --email             Also ask services whether the username's email addresses have accounts")
+        print(f"                      (opt-in: sends signup/login lookups, some as POSTs, to third-party sites)")
+        print(f"  --email-domain D    Provider domain to try (repeatable, replaces the registry list; implies --email)")
+        print(f"  --email-variant P   Local-part pattern such as {{username}}.dev (repeatable; implies --email)")
         print(f"\n{Fore.YELLOW}Examples:{Style.RESET_ALL}")
         print(f"  whoisuser johndoe")
         print(f"  whoisuser johndoe --no-screenshots")
         print(f"  whoisuser johndoe --no-osint-tools")
         print(f"  whoisuser johndoe --workers 20")
+        print(f"  whoisuser johndoe --engine async --workers 200")
+        print(f"  whoisuser --batch usernames.txt --workers 30")
         print(f"  whoisuser johndoe --no-screenshots --no-osint-tools")
+        print(f"  whoisuser johndoe --email --email-domain proton.me")
         print(f"\n{Fore.CYAN}Features:{Style.RESET_ALL}")
         print(f"  • Scans 100+ platforms (social media, developer sites, gaming, etc.)")
-        print(f"  • Integrates Sherlock, Maigret, Holehe, Blackbird")
+        print(f"  • Optionally checks email accounts across providers in parallel with the scan")
+        print(f"  • Integrates Sherlock, Maigret, Blackbird")
         print(f"  • Merges all results with automatic deduplication")
-        print(f"  • Automated screenshot capture with ChromeDriver reuse")
+        print(f"  • Parallel screenshot capture on a pool of headless browsers")
         print(f"  • Comprehensive TXT and JSON reports")
         print(f"  • Enhanced platform-specific validation (reduced false positives)")
         print(f"  • Configurable thread count for performance tuning")
@@ -1572,26 +4394,111 @@ def main():
         print(f"  pip3 install -r requirements.txt")
         print(f"  sudo apt install chromium-browser  # For screenshots")
         print(f"\n{Fore.YELLOW}OSINT Tools (Optional):{Style.RESET_ALL}")
-        print(f"  pip3 install sherlock-project maigret holehe")
+        print(f"  pip3 install sherlock-project maigret")
         print(f"\n{Fore.RED}Legal Notice:{Style.RESET_ALL}")
         print(f"  For educational and authorized testing only!")
         print(f"  Always obtain proper authorization before investigation.\n")
         sys.exit(1)
     
+    # Parse platform registry arguments
+    platform_file = get_cli_option('--platforms', None)
+    site_packs = get_cli_options('--site-pack')
+    for path in [platform_file] + site_packs:
+        if path and not os.path.exists(path):
+            print(f"{Fore.RED}[✗] Platform file not found: {path}{Style.RESET_ALL}")
+            sys.exit(1)
+    if not platform_file and not any(path and os.path.exists(path) for path in default_platform_files()):
+        print(f"{Fore.RED}[✗] platforms.json not found (reinstall with install.sh or pass --platforms FILE){Style.RESET_ALL}")
+        sys.exit(1)
+    
+    # Parse per-domain rate limiting and connection arguments
+    domain_rate = get_cli_option('--domain-rate', 1 / 0.3, float)
+    context_options = {
+        'request_delay': 1 / domain_rate if domain_rate > 0 else 0,
+        'domain_burst': get_cli_option('--domain-burst', 1, int),
+        'domain_concurrency': get_cli_option('--domain-concurrency', 4, int),
+        'session_per_thread': '--session-per-thread' in sys.argv,
+        'http2': '--http2' in sys.argv,
+        'cache': '--no-cache' not in sys.argv,
+        'cache_ttl': get_cli_option('--cache-ttl', CACHE_TTL, int),
+        'cache_max_bytes': get_cli_option('--cache-size-mb', CACHE_MAX_BYTES // (1024 * 1024), int) * 1024 * 1024,
+        'negative_ttl': get_cli_option('--negative-ttl', NEGATIVE_TTL, int),
+        'adaptive': '--adaptive' in sys.argv,
+        'min_workers': get_cli_option('--min-workers', 2, int),
+        'max_workers': get_cli_option('--max-workers', 100, int),
+        'initial_workers': get_cli_option('--workers', 15, int),
+        'retries': get_cli_option('--retries', RETRIES, int),
+        'breaker_threshold': get_cli_option('--breaker-threshold', BREAKER_THRESHOLD, int),
+        'metrics_port': get_cli_option('--metrics-port', None, int),
+        'metrics_file': get_cli_option('--metrics-file', None),
+    }
+    
+    # Adaptive mode sizes the worker pool for the upper bound; the controller decides how many run
+    max_workers = context_options['initial_workers']
+    if context_options['adaptive']:
+        max_workers = max(context_options['max_workers'], max_workers)
+    
+    if '--batch' in sys.argv:
+        source = get_cli_option('--batch', None)
+        if not source or (source != '-' and not os.path.exists(source)):
+            print(f"{Fore.RED}[✗] Batch input not found: {source}{Style.RESET_ALL}")
+            sys.exit(1)
+        
+        usernames = BatchInvestigation.load_usernames(source)
+        if '--profile' in sys.argv:
+            print(f"{Fore.YELLOW}[!] --profile covers single-username runs only; ignoring it in batch mode{Style.RESET_ALL}")
+        batch = BatchInvestigation(usernames, max_workers=max_workers,
+                                   proxy=get_cli_option('--proxy', None),
+                                   window=get_cli_option('--batch-window', 25, int),
+                                   stream_bodies='--no-stream' not in sys.argv,
+                                   max_body_bytes=get_cli_option('--max-body-kb', 512, int) * 1024,
+                                   platform_file=platform_file, site_packs=site_packs,
+                                   context_options=context_options)
+        batch.run()
+        return
+    
     username = sys.argv[1]
     capture_screenshots = '--no-screenshots' not in sys.argv
     use_osint_tools = '--no-osint-tools' not in sys.argv
     
-    # Parse workers argument
-    max_workers = 15  # default
-    if '--workers' in sys.argv:
-        try:
-            workers_index = sys.argv.index('--workers')
-            max_workers = int(sys.argv[workers_index + 1])
-        except (IndexError, ValueError):
-            print(f"{Fore.YELLOW}[!] Invalid --workers value, using default: 15{Style.RESET_ALL}")
+    # Parse engine arguments
+    engine = get_cli_option('--engine', 'threads')
+    if engine not in SCAN_ENGINES:
+        print(f"{Fore.YELLOW}[!] Unknown --engine value, using default: threads{Style.RESET_ALL}")
+        engine = 'threads'
+    max_per_host = get_cli_option('--per-host', 8, int)
+    proxy = get_cli_option('--proxy', None)
+    
+    # Parse screenshot storage arguments
+    screenshot_format = get_cli_option('--screenshot-format', 'webp').lower()
+    if screenshot_format not in SCREENSHOT_FORMATS:
+        print(f"{Fore.YELLOW}[!] Unknown --screenshot-format value, using default: webp{Style.RESET_ALL}")
+        screenshot_format = 'webp'
+    
+    # Email checks probe third-party signup endpoints, so they only run when asked for
+    email_domains = get_cli_options('--email-domain')
+    email_variants = get_cli_options('--email-variant')
+    check_emails = '--email' in sys.argv or bool(email_domains or email_variants)
+    
+    # Parse streaming arguments
+    stream_bodies = '--no-stream' not in sys.argv
+    max_body_bytes = get_cli_option('--max-body-kb', 512, int) * 1024
     
-    investigator = WhoisUser(username, max_workers=max_workers)
+    investigator = WhoisUser(username, max_workers=max_workers, engine=engine,
+                             max_per_host=max_per_host, proxy=proxy,
+                             tool_workers=get_cli_option('--tool-workers', 4, int),
+                             tool_timeout=get_cli_option('--tool-timeout', 300, int),
+                             stream_bodies=stream_bodies, max_body_bytes=max_body_bytes,
+                             platform_file=platform_file, site_packs=site_packs,
+                             context_options=context_options,
+                             screenshot_workers=get_cli_option('--screenshot-workers', 3, int),
+                             screenshot_memory_mb=get_cli_option('--screenshot-memory-mb', 512, int),
+                             pipeline_screenshots='--no-pipeline' not in sys.argv,
+                             screenshot_format=screenshot_format,
+                             screenshot_quality=get_cli_option('--screenshot-quality', 80, int),
+                             check_emails=check_emails, email_domains=email_domains, email_variants=email_variants,
+                             profile='--profile' in sys.argv,
+                             profile_sample_ms=PROFILE_SAMPLE_MS if '--profile-stacks' in sys.argv else 0)
     investigator.run(capture_screenshots=capture_screenshots, use_osint_tools=use_osint_tools)
 
 if __name__ == "__main__":